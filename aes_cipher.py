@@ -0,0 +1,457 @@
+"""
+AES-128/192/256 (FIPS-197) with ECB, CBC and CTR modes over bytes.
+
+The fast paths are T-table based:
+- SubBytes, ShiftRows and MixColumns of one round collapse into four
+  table lookups per state column (Te0..Te3, 256 32-bit words each, built
+  once at import).
+- Decryption uses the equivalent inverse cipher (Td0..Td3), whose round
+  keys have InvMixColumns pre-applied.
+- Key expansion is cached per key (KEY_CACHE_SIZE).
+
+Blocks are four big-endian 32-bit column words. When NumPy is installed,
+independent blocks (ECB, CTR, CBC decryption) are processed as (n x 4)
+arrays once there are at least VECTOR_BLOCKS of them, so each round is a
+handful of vectorized gathers instead of a Python loop per block. Results are identical either way.
+
+The individual stages (sub_bytes, shift_rows, mix_columns,
+add_round_key) also exist in their textbook byte-wise form for the step
+visualization (encrypt_steps). They are not used by the fast paths.
+"""
+import secrets
+import struct
+from functools import lru_cache
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; the T-table loop covers everything
+    np = None
+
+BLOCK_SIZE = 16
+KEY_SIZES = (16, 24, 32)
+KEY_CACHE_SIZE = 64
+MODES = ("ECB", "CBC", "CTR")
+KEY_HINT = "Key: 16, 24 or 32 characters, or 32, 48 or 64 hex digits"
+
+# Batches of at least this many independent blocks go through NumPy, in
+# chunks of VECTOR_CHUNK blocks so the temporaries stay in cache
+VECTOR_BLOCKS = 64
+VECTOR_CHUNK = 1 << 14
+
+_MASK128 = (1 << 128) - 1
+
+
+# ----------------- GF(2^8) and the S-box -----------------
+def _xtime(a):
+    a <<= 1
+    return a ^ 0x11B if a & 0x100 else a
+
+
+def _mul(a, b):
+    out = 0
+    while b:
+        if b & 1:
+            out ^= a
+        a = _xtime(a)
+        b >>= 1
+    return out
+
+
+def _build_sbox():
+    # Multiplicative inverse from log/antilog tables with generator 3,
+    # followed by the FIPS-197 affine transform
+    exp, log = [0] * 255, [0] * 256
+    x = 1
+    for i in range(255):
+        exp[i] = x
+        log[x] = i
+        x ^= _xtime(x)
+    sbox = [0] * 256
+    for a in range(256):
+        inv = exp[(255 - log[a]) % 255] if a else 0
+        s = inv
+        for shift in range(1, 5):
+            s ^= ((inv << shift) | (inv >> (8 - shift))) & 0xFF
+        sbox[a] = s ^ 0x63
+    return sbox
+
+
+SBOX = _build_sbox()
+INV_SBOX = [0] * 256
+for _i, _s in enumerate(SBOX):
+    INV_SBOX[_s] = _i
+
+
+def _rotations(word):
+    return [word, (word >> 8) | ((word & 0xFF) << 24),
+            (word >> 16) | ((word & 0xFFFF) << 16), (word >> 24) | ((word & 0xFFFFFF) << 8)]
+
+
+def _t_tables(box, coefficients):
+    # Table k is table 0 rotated right by k bytes
+    tables = [[], [], [], []]
+    for x in range(256):
+        s = box[x]
+        word = 0
+        for c in coefficients:
+            word = (word << 8) | _mul(s, c)
+        for table, rotated in zip(tables, _rotations(word)):
+            table.append(rotated)
+    return tables
+
+
+TE = _t_tables(SBOX, (2, 1, 1, 3))
+TD = _t_tables(INV_SBOX, (14, 9, 13, 11))
+
+
+# ----------------- Key expansion -----------------
+def _validate_key(key):
+    if not isinstance(key, (bytes, bytearray)):
+        raise ValueError("Key must be bytes.")
+    if len(key) not in KEY_SIZES:
+        raise ValueError("Key must be 16, 24 or 32 bytes (AES-128/192/256).")
+
+
+def _sub_word(w):
+    return (SBOX[w >> 24] << 24) | (SBOX[(w >> 16) & 255] << 16) | (SBOX[(w >> 8) & 255] << 8) | SBOX[w & 255]
+
+
+def expand_key(key):
+    """FIPS-197 key expansion: 4 * (rounds + 1) words."""
+    _validate_key(key)
+    nk = len(key) // 4
+    words = list(struct.unpack(f'>{nk}I', key))
+    rcon = 1
+    for i in range(nk, 4 * (nk + 7)):
+        w = words[-1]
+        if i % nk == 0:
+            w = _sub_word(((w << 8) | (w >> 24)) & 0xFFFFFFFF) ^ (rcon << 24)
+            rcon = _xtime(rcon)
+        elif nk > 6 and i % nk == 4:
+            w = _sub_word(w)
+        words.append(words[-nk] ^ w)
+    return words
+
+
+def _inv_mix_word(w):
+    # InvMixColumns of one column word, via Td(S(x)) = InvMixColumns(x)
+    return (TD[0][SBOX[w >> 24]] ^ TD[1][SBOX[(w >> 16) & 255]]
+            ^ TD[2][SBOX[(w >> 8) & 255]] ^ TD[3][SBOX[w & 255]])
+
+
+@lru_cache(maxsize=KEY_CACHE_SIZE)
+def key_schedule(key):
+    """(encryption, decryption) round-key words, cached per key."""
+    enc = expand_key(bytes(key))
+    rounds = len(enc) // 4 - 1
+    dec = []
+    for r in range(rounds, -1, -1):
+        words = enc[4 * r:4 * r + 4]
+        dec.extend(words if r in (0, rounds) else [_inv_mix_word(w) for w in words])
+    return tuple(enc), tuple(dec)
+
+
+# ----------------- Block functions (pure Python) -----------------
+def _encrypt_words(s0, s1, s2, s3, rk):
+    te0, te1, te2, te3 = TE
+    s0 ^= rk[0]
+    s1 ^= rk[1]
+    s2 ^= rk[2]
+    s3 ^= rk[3]
+    for i in range(4, len(rk) - 4, 4):
+        s0, s1, s2, s3 = (
+            te0[s0 >> 24] ^ te1[(s1 >> 16) & 255] ^ te2[(s2 >> 8) & 255] ^ te3[s3 & 255] ^ rk[i],
+            te0[s1 >> 24] ^ te1[(s2 >> 16) & 255] ^ te2[(s3 >> 8) & 255] ^ te3[s0 & 255] ^ rk[i + 1],
+            te0[s2 >> 24] ^ te1[(s3 >> 16) & 255] ^ te2[(s0 >> 8) & 255] ^ te3[s1 & 255] ^ rk[i + 2],
+            te0[s3 >> 24] ^ te1[(s0 >> 16) & 255] ^ te2[(s1 >> 8) & 255] ^ te3[s2 & 255] ^ rk[i + 3],
+        )
+    sb = SBOX
+    return (
+        ((sb[s0 >> 24] << 24) | (sb[(s1 >> 16) & 255] << 16) | (sb[(s2 >> 8) & 255] << 8) | sb[s3 & 255]) ^ rk[-4],
+        ((sb[s1 >> 24] << 24) | (sb[(s2 >> 16) & 255] << 16) | (sb[(s3 >> 8) & 255] << 8) | sb[s0 & 255]) ^ rk[-3],
+        ((sb[s2 >> 24] << 24) | (sb[(s3 >> 16) & 255] << 16) | (sb[(s0 >> 8) & 255] << 8) | sb[s1 & 255]) ^ rk[-2],
+        ((sb[s3 >> 24] << 24) | (sb[(s0 >> 16) & 255] << 16) | (sb[(s1 >> 8) & 255] << 8) | sb[s2 & 255]) ^ rk[-1],
+    )
+
+
+def _decrypt_words(s0, s1, s2, s3, rk):
+    td0, td1, td2, td3 = TD
+    s0 ^= rk[0]
+    s1 ^= rk[1]
+    s2 ^= rk[2]
+    s3 ^= rk[3]
+    for i in range(4, len(rk) - 4, 4):
+        s0, s1, s2, s3 = (
+            td0[s0 >> 24] ^ td1[(s3 >> 16) & 255] ^ td2[(s2 >> 8) & 255] ^ td3[s1 & 255] ^ rk[i],
+            td0[s1 >> 24] ^ td1[(s0 >> 16) & 255] ^ td2[(s3 >> 8) & 255] ^ td3[s2 & 255] ^ rk[i + 1],
+            td0[s2 >> 24] ^ td1[(s1 >> 16) & 255] ^ td2[(s0 >> 8) & 255] ^ td3[s3 & 255] ^ rk[i + 2],
+            td0[s3 >> 24] ^ td1[(s2 >> 16) & 255] ^ td2[(s1 >> 8) & 255] ^ td3[s0 & 255] ^ rk[i + 3],
+        )
+    sb = INV_SBOX
+    return (
+        ((sb[s0 >> 24] << 24) | (sb[(s3 >> 16) & 255] << 16) | (sb[(s2 >> 8) & 255] << 8) | sb[s1 & 255]) ^ rk[-4],
+        ((sb[s1 >> 24] << 24) | (sb[(s0 >> 16) & 255] << 16) | (sb[(s3 >> 8) & 255] << 8) | sb[s2 & 255]) ^ rk[-3],
+        ((sb[s2 >> 24] << 24) | (sb[(s1 >> 16) & 255] << 16) | (sb[(s0 >> 8) & 255] << 8) | sb[s3 & 255]) ^ rk[-2],
+        ((sb[s3 >> 24] << 24) | (sb[(s2 >> 16) & 255] << 16) | (sb[(s1 >> 8) & 255] << 8) | sb[s0 & 255]) ^ rk[-1],
+    )
+
+
+# ----------------- Batched blocks (NumPy) -----------------
+@lru_cache(maxsize=None)
+def _np_tables():
+    return ([np.array(t, dtype=np.uint32) for t in TE], np.array(SBOX, dtype=np.uint32),
+            [np.array(t, dtype=np.uint32) for t in TD], np.array(INV_SBOX, dtype=np.uint32))
+
+
+def _vector_rounds(words, rk, tables, box, order):
+    # words: (n, 4) uint32. `order` gives, for output column c, the input
+    # columns feeding its four bytes (ShiftRows or its inverse).
+    rk = np.array(rk, dtype=np.uint32)
+    t0, t1, t2, t3 = tables
+    cols = [words[:, c] ^ rk[c] for c in range(4)]
+    for i in range(4, len(rk) - 4, 4):
+        cols = [t0[cols[a] >> 24] ^ t1[(cols[b] >> 16) & 255] ^ t2[(cols[c] >> 8) & 255]
+                ^ t3[cols[d] & 255] ^ rk[i + k]
+                for k, (a, b, c, d) in enumerate(order)]
+    out = np.empty_like(words)
+    for k, (a, b, c, d) in enumerate(order):
+        out[:, k] = ((box[cols[a] >> 24] << 24) | (box[(cols[b] >> 16) & 255] << 16)
+                     | (box[(cols[c] >> 8) & 255] << 8) | box[cols[d] & 255]) ^ rk[-4 + k]
+    return out
+
+
+_ENCRYPT_ORDER = tuple((c, (c + 1) % 4, (c + 2) % 4, (c + 3) % 4) for c in range(4))
+_DECRYPT_ORDER = tuple((c, (c + 3) % 4, (c + 2) % 4, (c + 1) % 4) for c in range(4))
+
+
+def _crypt_blocks(data, key, decrypt=False):
+    """ECB over whole blocks: NumPy for large batches, the T-table loop otherwise."""
+    if len(data) % BLOCK_SIZE:
+        raise ValueError("Data length must be a multiple of 16 bytes.")
+    enc, dec = key_schedule(bytes(key))
+    rk = dec if decrypt else enc
+    count = len(data) // BLOCK_SIZE
+    if np is not None and count >= VECTOR_BLOCKS:
+        te, sbox, td, inv_sbox = _np_tables()
+        tables, box, order = (td, inv_sbox, _DECRYPT_ORDER) if decrypt else (te, sbox, _ENCRYPT_ORDER)
+        words = np.frombuffer(data, dtype='>u4').astype(np.uint32).reshape(count, 4)
+        out = np.empty((count, 4), dtype='>u4')
+        for start in range(0, count, VECTOR_CHUNK):
+            chunk = words[start:start + VECTOR_CHUNK]
+            out[start:start + len(chunk)] = _vector_rounds(chunk, rk, tables, box, order)
+        return out.tobytes()
+
+    fn = _decrypt_words if decrypt else _encrypt_words
+    words = struct.unpack(f'>{4 * count}I', data)
+    out = []
+    for i in range(0, len(words), 4):
+        out.extend(fn(words[i], words[i + 1], words[i + 2], words[i + 3], rk))
+    return struct.pack(f'>{len(out)}I', *out)
+
+
+def encrypt_block(block, key):
+    """One 16-byte block, no mode or padding."""
+    return _crypt_blocks(bytes(block), key)
+
+
+def decrypt_block(block, key):
+    return _crypt_blocks(bytes(block), key, decrypt=True)
+
+
+# ----------------- Padding and modes -----------------
+def pad(data):
+    """PKCS#7 padding to a whole number of blocks."""
+    n = BLOCK_SIZE - len(data) % BLOCK_SIZE
+    return bytes(data) + bytes([n]) * n
+
+
+def unpad(data):
+    n = data[-1] if data else 0
+    if not 1 <= n <= BLOCK_SIZE or data[-n:] != bytes([n]) * n:
+        raise ValueError("Invalid padding (wrong key or corrupted data).")
+    return data[:-n]
+
+
+def _validate_iv(iv):
+    if len(iv) != BLOCK_SIZE:
+        raise ValueError("IV / nonce must be 16 bytes.")
+
+
+def _xor(a, b):
+    return (int.from_bytes(a, 'big') ^ int.from_bytes(b, 'big')).to_bytes(len(a), 'big')
+
+
+def ecb_encrypt(data, key, padding=True):
+    return _crypt_blocks(pad(data) if padding else bytes(data), key)
+
+
+def _check_body(data, padding):
+    # A padded message always has at least one block
+    if padding and not data:
+        raise ValueError("Ciphertext too short: it holds no blocks.")
+
+
+def ecb_decrypt(data, key, padding=True):
+    _check_body(data, padding)
+    plain = _crypt_blocks(bytes(data), key, decrypt=True)
+    return unpad(plain) if padding else plain
+
+
+def cbc_encrypt(data, key, iv, padding=True):
+    # Chaining makes encryption sequential, so it always runs block by block
+    _validate_iv(iv)
+    rk = key_schedule(bytes(key))[0]
+    data = pad(data) if padding else bytes(data)
+    if len(data) % BLOCK_SIZE:
+        raise ValueError("Data length must be a multiple of 16 bytes.")
+    words = struct.unpack(f'>{len(data) // 4}I', data)
+    p0, p1, p2, p3 = struct.unpack('>4I', iv)
+    out = []
+    for i in range(0, len(words), 4):
+        p0, p1, p2, p3 = _encrypt_words(words[i] ^ p0, words[i + 1] ^ p1,
+                                        words[i + 2] ^ p2, words[i + 3] ^ p3, rk)
+        out.extend((p0, p1, p2, p3))
+    return struct.pack(f'>{len(out)}I', *out)
+
+
+def cbc_decrypt(data, key, iv, padding=True):
+    # Every block decrypts independently; the chaining is one buffer XOR
+    _validate_iv(iv)
+    _check_body(data, padding)
+    if not data:
+        return b""
+    data = bytes(data)
+    plain = _xor(_crypt_blocks(data, key, decrypt=True), bytes(iv) + data[:-BLOCK_SIZE])
+    return unpad(plain) if padding else plain
+
+
+def _counter_blocks(nonce, count):
+    start = int.from_bytes(nonce, 'big')
+    if np is not None and count >= VECTOR_BLOCKS:
+        # 128-bit counter as two 64-bit halves with an explicit carry
+        hi, lo = start >> 64, start & 0xFFFFFFFFFFFFFFFF
+        steps = np.arange(count, dtype=np.uint64)
+        low = steps + np.uint64(lo)
+        high = np.uint64(hi) + (low < steps).astype(np.uint64)
+        return np.stack([high, low], axis=1).astype('>u8').tobytes()
+    return b"".join(((start + i) & _MASK128).to_bytes(16, 'big') for i in range(count))
+
+
+def ctr_keystream(key, nonce, length):
+    """Encrypted counter blocks nonce, nonce+1, ... (mod 2**128), cut to `length` bytes."""
+    _validate_iv(nonce)
+    count = -(-length // BLOCK_SIZE)
+    return _crypt_blocks(_counter_blocks(nonce, count), key)[:length]
+
+
+def ctr_crypt(data, key, nonce):
+    """CTR mode; the same call encrypts and decrypts. No padding."""
+    return _xor(bytes(data), ctr_keystream(key, nonce, len(data))) if data else b""
+
+
+def encrypt(data, key, mode="CBC"):
+    """
+    Encrypts bytes in `mode`. CBC and CTR use a fresh random IV / nonce,
+    which is prepended to the result.
+    """
+    if mode == "ECB":
+        return ecb_encrypt(data, key)
+    iv = secrets.token_bytes(BLOCK_SIZE)
+    if mode == "CBC":
+        return iv + cbc_encrypt(data, key, iv)
+    if mode == "CTR":
+        return iv + ctr_crypt(data, key, iv)
+    raise ValueError(f"Unknown mode '{mode}'. Choose from: {', '.join(MODES)}")
+
+
+def decrypt(blob, key, mode="CBC"):
+    if mode == "ECB":
+        return ecb_decrypt(blob, key)
+    if mode not in MODES:
+        raise ValueError(f"Unknown mode '{mode}'. Choose from: {', '.join(MODES)}")
+    if len(blob) < BLOCK_SIZE:
+        raise ValueError("Ciphertext is too short to hold the IV.")
+    iv, body = blob[:BLOCK_SIZE], blob[BLOCK_SIZE:]
+    if mode == "CBC":
+        return cbc_decrypt(body, key, iv)
+    return ctr_crypt(body, key, iv)
+
+
+def parse_key(text):
+    """
+    Key from user input: 32, 48 or 64 hex digits, or else 16, 24 or 32
+    characters taken as UTF-8 bytes.
+    """
+    text = text.strip()
+    if len(text) in (32, 48, 64):
+        try:
+            return bytes.fromhex(text)
+        except ValueError:
+            pass
+    key = text.encode('utf-8')
+    if len(key) not in KEY_SIZES:
+        raise ValueError("Key must be 16, 24 or 32 characters, or 32, 48 or 64 hex digits.")
+    return key
+
+
+# ----------------- Stages for visualization -----------------
+# The state is a list of 16 bytes in FIPS-197 order: byte r + 4c is row r
+# of column c.
+def sub_bytes(state):
+    return [SBOX[b] for b in state]
+
+
+def shift_rows(state):
+    # Row r moves r columns to the left
+    return [state[r + 4 * ((c + r) % 4)] for c in range(4) for r in range(4)]
+
+
+def mix_columns(state):
+    out = []
+    for c in range(4):
+        a = state[4 * c:4 * c + 4]
+        for r in range(4):
+            out.append(_mul(a[r], 2) ^ _mul(a[(r + 1) % 4], 3) ^ a[(r + 2) % 4] ^ a[(r + 3) % 4])
+    return out
+
+
+def add_round_key(state, round_key):
+    return [s ^ k for s, k in zip(state, round_key)]
+
+
+def encrypt_steps(block, key):
+    """
+    Encrypts one block stage by stage. Returns (ciphertext, steps), where
+    steps lists (round, stage, state hex) after every stage.
+    """
+    if len(block) != BLOCK_SIZE:
+        raise ValueError("Block must be 16 bytes.")
+    words = key_schedule(bytes(key))[0]
+    round_keys = [list(struct.pack('>4I', *words[i:i + 4])) for i in range(0, len(words), 4)]
+    rounds = len(round_keys) - 1
+
+    state = add_round_key(list(block), round_keys[0])
+    steps = [(0, "AddRoundKey", bytes(state).hex())]
+    for r in range(1, rounds + 1):
+        stages = [("SubBytes", sub_bytes), ("ShiftRows", shift_rows)]
+        if r < rounds:
+            stages.append(("MixColumns", mix_columns))
+        for name, stage in stages:
+            state = stage(state)
+            steps.append((r, name, bytes(state).hex()))
+        state = add_round_key(state, round_keys[r])
+        steps.append((r, "AddRoundKey", bytes(state).hex()))
+    return bytes(state), steps
+
+
+def format_steps(steps):
+    return "\n".join(f"Round {r:>2}  {name:<12} {state}" for r, name, state in steps)
+
+
+if __name__ == "__main__":
+    sample = "AES example".encode('utf-8')
+    key = bytes.fromhex("000102030405060708090a0b0c0d0e0f")
+    for mode in MODES:
+        blob = encrypt(sample, key, mode)
+        print(f"{mode}: {blob.hex().upper()} -> {decrypt(blob, key, mode).decode('utf-8')}")
+    print(format_steps(encrypt_steps(pad(sample)[:BLOCK_SIZE], key)[1]))
@@ -0,0 +1,866 @@
+"""
+Micro-benchmarks for the cipher engines, and a regression suite.
+
+Run every section with ``python benchmarks.py`` or only some of them, e.g.
+``python benchmarks.py rsa``. Each section prints one line per measurement.
+
+``python benchmarks.py --suite`` measures every cipher and backend on
+generated English, Arabic and mixed corpora (``--sizes 1K,1M,1G``). It
+records median throughput, peak traced memory, peak RSS and import times,
+writes them with ``--json results.json``, and with ``--baseline old.json``
+exits with status 1 when a metric is worse than the baseline by more than
+its tolerance (``--tolerance throughput=0.1``).
+"""
+import argparse
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+import secrets
+import statistics
+import tempfile
+import tracemalloc
+
+import aes_cipher
+import cipher_pipeline
+import des_cipher
+import multiplicative_cipher
+import otp_bytes
+import otp_logic
+import otp_parallel
+import otp_pads
+import otp_seeded
+import otp_stream
+import rail_fence_cipher
+import rail_fence_stream
+import railfence
+import rsa_logic
+import sample_texts
+from otp_logic import OTPLogic
+
+
+def _time_per_call(fn, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn()
+    return (time.perf_counter() - start) / repeat
+
+
+# ----------------- RSA -----------------
+def bench_rsa_multi_prime(sizes=(2048, 4096), prime_counts=(2, 3, 4), repeat=20):
+    print("RSA decryption: plain pow vs. multi-prime CRT")
+    for bits in sizes:
+        baseline = None
+        for k in prime_counts:
+            primes = tuple(rsa_logic.generate_prime(bits // k) for _ in range(k))
+            key = rsa_logic.complete_multi_prime_keys(primes)
+            c = secrets.randbelow(key.n)
+            expected = pow(c, key.d, key.n)
+            if rsa_logic.crt_pow(c, key.d, key.primes) != expected:
+                raise AssertionError(f"CRT mismatch for {k} primes at {bits} bits")
+
+            if k == prime_counts[0]:
+                plain = _time_per_call(lambda: pow(c, key.d, key.n), repeat)
+                print(f"  {bits:>5} bits  plain pow        {plain * 1000:9.2f} ms/op")
+
+            crt = _time_per_call(lambda: rsa_logic.crt_pow(c, key.d, key.primes), repeat)
+            if baseline is None:
+                baseline = crt
+            print(f"  {bits:>5} bits  CRT, {k} primes    {crt * 1000:9.2f} ms/op"
+                  f"  ({baseline / crt:.2f}x vs 2-prime CRT)")
+
+
+def _key_with_exponent(bits, e):
+    while True:
+        primes = (rsa_logic.generate_prime(bits // 2), rsa_logic.generate_prime(bits // 2))
+        try:
+            return rsa_logic.complete_multi_prime_keys(primes, e)
+        except ValueError:
+            continue
+
+
+def bench_rsa_signatures(bits=2048, exponents=(3, 65537), total=1000):
+    print(f"RSA signatures ({bits} bits, {total} distinct verifications)")
+    for e in exponents:
+        key = _key_with_exponent(bits, e)
+        messages = [secrets.token_bytes(64) for _ in range(total)]
+
+        start = time.perf_counter()
+        signatures = [rsa_logic.rsa_sign(m, key.d, key.n, key.primes) for m in messages]
+        sign_rate = total / (time.perf_counter() - start)
+
+        start = time.perf_counter()
+        single = [rsa_logic.rsa_verify(m, s, key.e, key.n) for m, s in zip(messages, signatures)]
+        single_rate = total / (time.perf_counter() - start)
+
+        start = time.perf_counter()
+        batch = rsa_logic.rsa_batch_verify(messages, signatures, key.e, key.n)
+        batch_rate = total / (time.perf_counter() - start)
+
+        start = time.perf_counter()
+        screen = rsa_logic.rsa_batch_screen(messages, signatures, key.e, key.n)
+        screen_rate = total / (time.perf_counter() - start)
+
+        if not all(single) or not all(batch) or not screen:
+            raise AssertionError("valid signature rejected")
+        print(f"  e={e:<6} sign (CRT) {sign_rate:8.0f} sig/s   verify {single_rate:8.0f} sig/s"
+              f"   batch verify {batch_rate:8.0f} sig/s   batch screen {screen_rate:8.0f} sig/s")
+
+
+def bench_rsa_hybrid(size=16 << 20):
+    print(f"RSA per-character vs. hybrid mode ({size >> 20} MB payload)")
+    e, n, d = rsa_logic.complete_keys(61, 53)
+    text = "x" * 100000
+    per_char = _time_per_call(lambda: rsa_logic.rsa_encrypt_with_steps(text, e, n), 1)
+    print(f"  rsa_encrypt_with_steps   {len(text) / per_char / 1e6:9.3f} MB/s")
+
+    # Hybrid mode wraps the session key with OAEP, which needs a real-sized modulus
+    e, n, d = rsa_logic.complete_keys(rsa_logic.generate_prime(512), rsa_logic.generate_prime(512))
+    data = secrets.token_bytes(size)
+    enc = _time_per_call(lambda: rsa_logic.hybrid_encrypt_bytes(data, e, n), 1)
+    blob = rsa_logic.hybrid_encrypt_bytes(data, e, n)
+    dec = _time_per_call(lambda: rsa_logic.hybrid_decrypt_bytes(blob, d, n), 1)
+    if rsa_logic.hybrid_decrypt_bytes(blob, d, n) != data:
+        raise AssertionError("hybrid round trip failed")
+    print(f"  hybrid encrypt           {size / enc / 1e6:9.1f} MB/s")
+    print(f"  hybrid decrypt           {size / dec / 1e6:9.1f} MB/s")
+
+
+# ----------------- OTP -----------------
+SAMPLE_TEXTS = {
+    "english": "The quick brown fox jumps over the lazy dog 1234. ",
+    "arabic": "مرحبا بالعالم، أهلا وسهلا في مدينة القاهرة ١٢٣٤. ",
+    "mixed": "Hello مرحبا world عالم 2024. ",
+}
+
+
+def _sample_text(kind, size):
+    chunk = SAMPLE_TEXTS[kind]
+    return (chunk * (size // len(chunk) + 1))[:size]
+
+
+def bench_otp(size=1 << 20):
+    print(f"OTP encrypt/decrypt ({size >> 20} M chars)")
+    for kind in SAMPLE_TEXTS:
+        text = _sample_text(kind, size)
+        key = OTPLogic.generate_key(len(text), text)
+        mb = len(text.encode('utf-8')) / 1e6
+        enc = _time_per_call(lambda: OTPLogic.encrypt(text, key), 1)
+        cipher = OTPLogic.encrypt(text, key)[0]
+        dec = _time_per_call(lambda: OTPLogic.decrypt(cipher, key), 1)
+        print(f"  {kind:<8} encrypt {mb / enc:8.2f} MB/s   decrypt {mb / dec:8.2f} MB/s")
+
+
+def bench_otp_backends(size=4 << 20):
+    print(f"OTP transform backends ({size >> 20} M chars)")
+    if otp_logic.np is None:
+        print("  NumPy not installed; vectorized backend skipped")
+    for kind in SAMPLE_TEXTS:
+        text = _sample_text(kind, size)
+        key = OTPLogic.generate_key(len(text), text)
+        alphabet, _ = OTPLogic._get_alphabet(text)
+        mb = len(text.encode('utf-8')) / 1e6
+        scalar = _time_per_call(lambda: OTPLogic._transform_scalar(text, key, alphabet, '+'), 1)
+        line = f"  {kind:<8} scalar {mb / scalar:8.2f} MB/s"
+        if otp_logic.np is not None:
+            expected = OTPLogic._transform_scalar(text, key, alphabet, '+')[0]
+            if OTPLogic._transform_vectorized(text, key, alphabet, '+')[0] != expected:
+                raise AssertionError("vectorized OTP output differs from scalar")
+            vector = _time_per_call(lambda: OTPLogic._transform_vectorized(text, key, alphabet, '+'), 1)
+            line += f"   vectorized {mb / vector:8.2f} MB/s ({scalar / vector:.1f}x)"
+        print(line)
+
+
+def _traced_peak(fn):
+    tracemalloc.start()
+    result = fn()
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return result, peak
+
+
+def bench_otp_steps(size=1 << 20):
+    print(f"OTP step records ({size >> 20} M chars, peak traced memory)")
+    text = _sample_text("mixed", size)
+    key = OTPLogic.generate_key(len(text), text)
+    _, untraced = _traced_peak(lambda: OTPLogic.encrypt(text, key, trace=False))
+    (_, steps, _), columnar = _traced_peak(lambda: OTPLogic.encrypt(text, key))
+    _, tuples = _traced_peak(lambda: list(steps))
+    print(f"  trace=False          {untraced / 1e6:8.1f} MB")
+    print(f"  columnar steps       {columnar / 1e6:8.1f} MB")
+    print(f"  materialized tuples  {tuples / 1e6:8.1f} MB (what a per-char list costs)")
+
+
+def bench_otp_stream(size=32 << 20):
+    print(f"OTP file streaming ({size >> 20} M chars)")
+    with tempfile.TemporaryDirectory() as tmp:
+        src = os.path.join(tmp, "plain.txt")
+        pad = os.path.join(tmp, "pad.txt")
+        dst = os.path.join(tmp, "cipher.txt")
+        text = _sample_text("english", size)
+        with open(src, 'w', encoding='utf-8') as f:
+            f.write(text)
+        with open(pad, 'w', encoding='utf-8') as f:
+            f.write(OTPLogic.generate_key(len(text), text))
+        del text
+
+        tracemalloc.start()
+        start = time.perf_counter()
+        otp_stream.stream_encrypt_file(src, dst, pad)
+        elapsed = time.perf_counter() - start
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        print(f"  stream encrypt {size / elapsed / 1e6:8.2f} MB/s   peak traced memory {peak / 1e6:6.2f} MB")
+
+
+def bench_otp_bytes(size=256 << 20):
+    print(f"OTP byte XOR over mmap'd files ({size >> 20} MB)")
+    with tempfile.TemporaryDirectory() as tmp:
+        src = os.path.join(tmp, "data.bin")
+        pad = os.path.join(tmp, "data.pad")
+        dst = os.path.join(tmp, "data.enc")
+        otp_bytes.generate_pad_file(src, size)
+        otp_bytes.generate_pad_file(pad, size)
+        copy = _time_per_call(lambda: otp_bytes.xor_file(src, pad, dst, position=0), 1)
+        in_place = _time_per_call(lambda: otp_bytes.xor_file(dst, pad, position=0), 1)
+        with open(src, 'rb') as a, open(dst, 'rb') as b:
+            if a.read() != b.read():
+                raise AssertionError("byte XOR round trip failed")
+    print(f"  to new file  {size / copy / 1e6:9.1f} MB/s")
+    print(f"  in place     {size / in_place / 1e6:9.1f} MB/s")
+
+
+def bench_otp_parallel(size=16 << 20):
+    workers = os.cpu_count() or 1
+    print(f"OTP multi-core text mode ({size >> 20} M chars, {workers} workers)")
+    text = _sample_text("mixed", size)
+    key = OTPLogic.generate_key(len(text), text)
+    single = _time_per_call(lambda: OTPLogic.encrypt(text, key, trace=False), 1)
+    parallel = _time_per_call(lambda: otp_parallel.parallel_encrypt(text, key, workers), 1)
+    if otp_parallel.parallel_encrypt(text, key, workers) != OTPLogic.encrypt(text, key, trace=False):
+        raise AssertionError("parallel OTP output differs")
+    mb = len(text.encode('utf-8')) / 1e6
+    print(f"  single process {mb / single:8.2f} MB/s   parallel {mb / parallel:8.2f} MB/s"
+          f" ({single / parallel:.1f}x)")
+
+
+def bench_otp_seeded(size=4 << 20):
+    print(f"OTP seeded-pad expansion vs. vectorized encrypt ({size >> 20} M chars)")
+    text = _sample_text("mixed", size)
+    alphabet, _ = OTPLogic._get_alphabet(text)
+    key = OTPLogic.generate_key(len(text), text)
+    expand = _time_per_call(lambda: otp_seeded.SeededPad("seed", bytes(16), alphabet).key(size), 1)
+    encrypt = _time_per_call(lambda: OTPLogic.encrypt(text, key, trace=False), 1)
+    seeded = _time_per_call(lambda: otp_seeded.seeded_encrypt(text, "seed"), 1)
+    print(f"  keystream expansion  {size / expand / 1e6:8.2f} Mchar/s")
+    print(f"  encrypt (given key)  {size / encrypt / 1e6:8.2f} Mchar/s")
+    print(f"  seeded encrypt       {size / seeded / 1e6:8.2f} Mchar/s")
+
+
+def bench_otp_analysis(messages=200, size=1 << 18):
+    import otp_analysis
+    print(f"Many-time-pad analysis ({messages} messages x {size >> 10} K chars, one key)")
+    rng = random.Random(0)
+    words = SAMPLE_TEXTS["english"].lower().split()
+    texts = [" ".join(rng.choice(words) for _ in range(size // 3))[:size] for _ in range(messages)]
+    key = OTPLogic.random_key(size, OTPLogic.ENGLISH_ALPHABET)
+    ciphers = [OTPLogic.encrypt(text, key, trace=False)[0] for text in texts]
+
+    start = time.perf_counter()
+    analysis = otp_analysis.ManyTimePad(ciphers, lang='ENGLISH')
+    load = time.perf_counter() - start
+    solve = _time_per_call(analysis.solve_key, 1)
+    recovered = sum(map(str.__eq__, analysis.key_text(), key)) / size
+    crib = _time_per_call(lambda: analysis.crib_drag("quick"), 1)
+    print(f"  load {load:6.2f} s   solve key {solve:6.2f} s ({recovered:.1%} of key)   crib drag {crib:6.2f} s")
+
+
+def bench_otp_keygen(size=4 << 20):
+    print(f"OTP key generation ({size >> 20} M chars)")
+    alphabet = OTPLogic.MIXED_ALPHABET
+    sample = 100000
+    legacy = _time_per_call(lambda: "".join(random.choice(alphabet) for _ in range(sample)), 1)
+    print(f"  random.choice loop   {sample / legacy / 1e6:8.2f} Mchar/s")
+    bulk = _time_per_call(lambda: OTPLogic.random_key(size, alphabet), 1)
+    print(f"  bulk CSPRNG          {size / bulk / 1e6:8.2f} Mchar/s")
+    with tempfile.TemporaryDirectory() as tmp:
+        pool = otp_pads.PadPool(alphabet, os.path.join(tmp, "pool.bin"), capacity=size).start()
+        while pool.available() < size:
+            time.sleep(0.01)
+        pooled = _time_per_call(lambda: pool.take(size), 1)
+        pool.close()
+    print(f"  pad pool slice       {size / pooled / 1e6:8.2f} Mchar/s")
+
+
+# ----------------- Rail Fence -----------------
+def bench_rail_fence(size=1 << 10, messages=2000, keys=(3, 50, 1000)):
+    print(f"Rail fence, {messages} messages of {size >> 10} K chars (permutation cache)")
+    texts = [_sample_text("english", size + i)[i:] for i in range(messages)]
+    for key in keys:
+        rail_fence_cipher.clear_permutation_cache()
+        cold = _time_per_call(lambda: [rail_fence_cipher.rail_fence_encrypt(t, key) for t in texts], 1)
+        warm = _time_per_call(lambda: [rail_fence_cipher.rail_fence_encrypt(t, key) for t in texts], 3)
+        ciphers = [rail_fence_cipher.rail_fence_encrypt(t, key) for t in texts]
+        dec = _time_per_call(lambda: [rail_fence_cipher.rail_fence_decrypt(c, key) for c in ciphers], 3)
+        if [rail_fence_cipher.rail_fence_decrypt(c, key) for c in ciphers] != texts:
+            raise AssertionError("rail fence round trip failed")
+        total = size * messages
+        print(f"  key={key:<5} encrypt {total / cold / 1e6:7.2f} MB/s (cold)  {total / warm / 1e6:7.2f} MB/s (cached)"
+              f"   decrypt {total / dec / 1e6:7.2f} MB/s (cached)")
+
+
+def bench_rail_fence_bulk(size=64 << 20, keys=(3, 50, 1000)):
+    print(f"Rail fence bulk paths ({size >> 20} M chars / MB)")
+    if rail_fence_cipher.np is None:
+        print("  NumPy not installed; bulk paths use the index-tuple engine")
+    text = _sample_text("english", size)
+    data = secrets.token_bytes(size)
+    for key in keys:
+        text_enc = _time_per_call(lambda: rail_fence_cipher.rail_fence_encrypt(text, key), 1)
+        bytes_enc = _time_per_call(lambda: rail_fence_cipher.rail_fence_encrypt_bytes(data, key), 1)
+        cipher = rail_fence_cipher.rail_fence_encrypt_bytes(data, key)
+        bytes_dec = _time_per_call(lambda: rail_fence_cipher.rail_fence_decrypt_bytes(cipher, key), 1)
+        if rail_fence_cipher.rail_fence_decrypt_bytes(cipher, key) != data:
+            raise AssertionError("rail fence bytes round trip failed")
+        print(f"  key={key:<5} text encrypt {size / text_enc / 1e6:7.1f} MB/s"
+              f"   bytes encrypt {size / bytes_enc / 1e6:7.1f} MB/s   bytes decrypt {size / bytes_dec / 1e6:7.1f} MB/s")
+
+
+def bench_rail_fence_blocks(size=32 << 20, key=50):
+    workers = os.cpu_count() or 1
+    print(f"Block rail fence files ({size >> 20} M chars, key={key}, {workers} workers)")
+    with tempfile.TemporaryDirectory() as tmp:
+        src = os.path.join(tmp, "plain.txt")
+        dst = os.path.join(tmp, "cipher.txt")
+        with open(src, 'w', encoding='utf-8') as f:
+            f.write(_sample_text("english", size))
+        for label, pool in (("single process", None), ("process pool", workers)):
+            start = time.perf_counter()
+            tracemalloc.start()
+            rail_fence_stream.block_encrypt_file(src, dst, key, workers=pool)
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+            elapsed = time.perf_counter() - start
+            print(f"  {label:<15} {size / elapsed / 1e6:8.2f} MB/s   peak traced memory {peak / 1e6:6.2f} MB")
+
+
+# The two Rail Fence implementations that railfence.py and
+# rail_fence_cipher.py shipped before they shared one engine, kept as the
+# speedup baseline. tests/test_rail_fence.py fuzzes the engine against
+# verbatim copies of them.
+def _zigzag_rows(length, key):
+    row, direction = 0, 1
+    for _ in range(length):
+        yield row
+        if row == 0:
+            direction = 1
+        elif row == key - 1:
+            direction = -1
+        row += direction
+
+
+def _original_concat_encrypt(text, key):
+    rail = [""] * key
+    for char, row in zip(text, _zigzag_rows(len(text), key)):
+        rail[row] += char
+    steps = "\n".join([f"Rail {i+1}: {rail[i]}" for i in range(key)])
+    return "".join(rail), steps
+
+
+def _original_concat_decrypt(cipher, key):
+    rail_len = [0] * key
+    for row in _zigzag_rows(len(cipher), key):
+        rail_len[row] += 1
+    rails, index = [], 0
+    for l in rail_len:
+        rails.append(cipher[index:index + l])
+        index += l
+    result = ""
+    pointers = [0] * key
+    for row in _zigzag_rows(len(cipher), key):
+        result += rails[row][pointers[row]]
+        pointers[row] += 1
+    return result
+
+
+def _original_matrix_decrypt(ciphertext, key):
+    length = len(ciphertext)
+    pattern = [["" for _ in range(length)] for _ in range(key)]
+    for col, row in enumerate(_zigzag_rows(length, key)):
+        pattern[row][col] = "*"
+    idx = 0
+    for r in range(key):
+        for c in range(length):
+            if pattern[r][c] == "*":
+                pattern[r][c] = ciphertext[idx]
+                idx += 1
+    return "".join(pattern[row][col] for col, row in enumerate(_zigzag_rows(length, key)))
+
+
+def bench_rail_fence_engines(size=1 << 16, keys=(3, 50)):
+    print(f"Rail fence engine vs the originals ({size >> 10} K chars)")
+    text = _sample_text("english", size)
+    for key in keys:
+        cipher = rail_fence_cipher.rail_fence_encrypt(text, key)
+        rail_fence_cipher.clear_permutation_cache()
+        rows = [
+            ("railfence encrypt", lambda: _original_concat_encrypt(text, key),
+             lambda: railfence.encrypt_railfence(text, key)),
+            ("railfence decrypt", lambda: _original_concat_decrypt(cipher, key),
+             lambda: railfence.decrypt_railfence(cipher, key)),
+            ("rail_fence_cipher decrypt", lambda: _original_matrix_decrypt(cipher, key),
+             lambda: rail_fence_cipher.rail_fence_decrypt(cipher, key)),
+        ]
+        for name, original, engine in rows:
+            before = _time_per_call(original, 1)
+            after = _time_per_call(engine, 3)
+            print(f"  key={key:<3} {name:<26} original {before * 1e3:8.2f} ms   engine {after * 1e3:7.2f} ms"
+                  f"   x{before / after:6.1f}")
+
+
+def bench_rail_fence_crack(size=1 << 20, keys=(7, 1000, 50000)):
+    import rail_fence_crack
+    print(f"Rail fence cracking ({size >> 20} M chars, keys 2..len-1)")
+    rng = random.Random(0)
+    words = sample_texts.ENGLISH_SAMPLE.split()
+    text = " ".join(rng.choice(words) for _ in range(size // 4))[:size]
+    for key in keys:
+        cipher = rail_fence_cipher.rail_fence_encrypt(text, key)
+        start = time.perf_counter()
+        best = rail_fence_crack.crack(cipher, top=1)[0]
+        elapsed = time.perf_counter() - start
+        print(f"  key={key:<6} found key={best.key:<6} correct={best.plaintext == text}   {elapsed:6.2f} s")
+
+
+def bench_des(size=256 << 10):
+    print(f"DES / 3DES throughput ({size >> 10} KB, pure Python)")
+    data = secrets.token_bytes(size)
+    iv = bytes(des_cipher.BLOCK_SIZE)
+    for name, key in (("DES", secrets.token_bytes(8)), ("3DES", secrets.token_bytes(24))):
+        des_cipher.key_schedule.cache_clear()
+        schedule = _time_per_call(lambda: des_cipher.key_schedule(key), 1)
+        cipher = des_cipher.cbc_encrypt(data, key, iv)
+        rows = (
+            ("ECB", lambda: des_cipher.ecb_encrypt(data, key)),
+            ("CBC enc", lambda: des_cipher.cbc_encrypt(data, key, iv)),
+            ("CBC dec", lambda: des_cipher.cbc_decrypt(cipher, key, iv)),
+            ("CTR", lambda: des_cipher.ctr_crypt(data, key, iv)),
+        )
+        line = "   ".join(f"{label} {size / _time_per_call(fn, 1) / 1e3:6.0f} KB/s" for label, fn in rows)
+        print(f"  {name:<5} key schedule {schedule * 1e3:5.2f} ms   {line}")
+
+
+def bench_aes(size=16 << 20, serial_size=256 << 10):
+    print(f"AES throughput ({size >> 20} MB batched, {serial_size >> 10} KB block by block)")
+    if aes_cipher.np is None:
+        print("  NumPy not installed; every mode runs the T-table loop")
+    data = secrets.token_bytes(size)
+    serial = data[:serial_size]
+    iv = bytes(aes_cipher.BLOCK_SIZE)
+    for bits in (128, 192, 256):
+        key = secrets.token_bytes(bits // 8)
+        rows = (
+            ("ECB", size, lambda: aes_cipher.ecb_encrypt(data, key, padding=False)),
+            ("CTR", size, lambda: aes_cipher.ctr_crypt(data, key, iv)),
+            ("CBC dec", size, lambda: aes_cipher.cbc_decrypt(data, key, iv, padding=False)),
+            ("CBC enc", serial_size, lambda: aes_cipher.cbc_encrypt(serial, key, iv, padding=False)),
+        )
+        line = "   ".join(f"{label} {n / _time_per_call(fn, 1) / 1e6:6.2f} MB/s" for label, n, fn in rows)
+        print(f"  AES-{bits}  {line}")
+
+
+def bench_multiplicative(size=4 << 20):
+    print(f"Multiplicative cipher ({size >> 20} M chars, str.translate tables)")
+    for kind, lang in (("english", "ENGLISH"), ("arabic", "ARABIC")):
+        text = _sample_text(kind, size)
+        key = multiplicative_cipher.valid_keys(lang)[-1]
+        multiplicative_cipher.translation_tables.cache_clear()
+        enc = _time_per_call(lambda: multiplicative_cipher.encrypt(text, key, lang), 3)
+        cipher, _ = multiplicative_cipher.encrypt(text, key, lang)
+        dec = _time_per_call(lambda: multiplicative_cipher.decrypt(cipher, key, lang), 3)
+        brute = _time_per_call(lambda: multiplicative_cipher.brute_force(cipher, lang, top=1), 1)
+        found = multiplicative_cipher.brute_force(cipher, lang, top=1)[0].key
+        keys = len(multiplicative_cipher.valid_keys(lang))
+        print(f"  {lang:<8} encrypt {size / enc / 1e6:7.1f} Mchar/s   decrypt {size / dec / 1e6:7.1f} Mchar/s"
+              f"   brute force ({keys} keys) {brute * 1e3:7.1f} ms, key {key} -> {found}")
+
+
+def bench_pipeline(size=32 << 20):
+    print(f"Cipher pipeline, file to file ({size >> 20} M chars)")
+    e, n, d = rsa_logic.complete_keys(rsa_logic.generate_prime(512), rsa_logic.generate_prime(512))
+    specs = (
+        "railfence:key=9,block=65536 | seeded:seed=bench",
+        f"railfence:key=9,block=65536 | seeded:seed=bench | rsa:e={e},n={n}",
+        "railfence:key=9 | seeded:seed=bench",  # whole-message rail fence buffers
+    )
+    with tempfile.TemporaryDirectory() as tmp:
+        src = os.path.join(tmp, "plain.txt")
+        mid = os.path.join(tmp, "cipher")
+        dst = os.path.join(tmp, "plain.out")
+        with open(src, 'w', encoding='utf-8') as f:
+            f.write(_sample_text("english", size))
+        for spec in specs:
+            start = time.perf_counter()
+            pipeline, peak = _traced_peak(lambda: cipher_pipeline.run_specs_file(spec, src, mid))
+            enc = time.perf_counter() - start
+            start = time.perf_counter()
+            cipher_pipeline.run_specs_file(spec.replace(f"e={e}", f"d={d}"), mid, dst, decrypt=True)
+            dec = time.perf_counter() - start
+            with open(src, 'rb') as a, open(dst, 'rb') as b:
+                if a.read() != b.read():
+                    raise AssertionError("pipeline round trip failed")
+            label = " | ".join(part.split(':')[0].strip() for part in spec.split('|'))
+            print(f"  {label:<30} encrypt {size / enc / 1e6:6.1f} Mchar/s   decrypt {size / dec / 1e6:6.1f} Mchar/s"
+                  f"   peak {peak / 1e6:7.1f} MB")
+
+
+SECTIONS = {
+    "rsa": [bench_rsa_multi_prime, bench_rsa_signatures, bench_rsa_hybrid],
+    "des": [bench_des],
+    "aes": [bench_aes],
+    "multiplicative": [bench_multiplicative],
+    "pipeline": [bench_pipeline],
+    "otp": [bench_otp, bench_otp_backends, bench_otp_steps, bench_otp_stream, bench_otp_bytes,
+            bench_otp_parallel, bench_otp_seeded, bench_otp_analysis,
+            bench_otp_keygen],
+    "railfence": [bench_rail_fence_engines, bench_rail_fence,
+                  bench_rail_fence_bulk, bench_rail_fence_blocks, bench_rail_fence_crack],
+}
+
+
+# ----------------- Regression suite -----------------
+# One record per (cipher, backend, corpus, size). Each record is measured in a
+# fresh interpreter, so one case never inherits another's heap. A record holds
+# the median throughput of SUITE_ROUNDS timing rounds, their relative median
+# absolute deviation (noise), the peak traced allocation and the peak RSS
+# growth of one call. Import times are the median of several fresh
+# interpreters. Results go to JSON and can be compared with a baseline file
+# under per-metric tolerances; the noise of both runs widens the throughput one.
+SUITE_SIZES = ("1K", "64K", "1M", "16M")
+SUITE_LANGS = ("english", "arabic", "mixed")
+SUITE_MIN_TIME = 0.2
+SUITE_ROUNDS = 5
+SUITE_TRACE_LIMIT = 64 << 20
+SUITE_TOLERANCES = {"throughput": 0.25, "traced_peak": 0.25, "rss_peak": 0.5, "import_time": 1.0}
+# Differences below these floors are noise, whatever the ratio. Throughput
+# is compared through the time per call.
+SUITE_FLOORS = {"throughput": 50e-6, "traced_peak": 1 << 20, "rss_peak": 4 << 20, "import_time": 0.005}
+SUITE_MODULES = ("otp_logic", "rail_fence_cipher", "railfence", "rsa_logic", "des_cipher",
+                 "aes_cipher", "multiplicative_cipher", "cipher_pipeline")
+CORPUS_BLOCK = 1 << 20
+_SIZE_UNITS = {"K": 1 << 10, "M": 1 << 20, "G": 1 << 30}
+
+
+def parse_size(text):
+    """'1K', '64M', '1G' or a plain number of characters."""
+    text = text.strip().upper()
+    if text[-1:] in _SIZE_UNITS:
+        return int(text[:-1]) * _SIZE_UNITS[text[-1]]
+    return int(text)
+
+
+def _corpus_block(lang, seed=0):
+    # CORPUS_BLOCK characters of shuffled words from the built-in samples
+    # (mixed alternates English and Arabic sentences), plus digits, so
+    # language detection and the alphabets see realistic text
+    rng = random.Random(seed)
+    vocab = {"english": sample_texts.ENGLISH_SAMPLE.split(), "arabic": sample_texts.ARABIC_SAMPLE.split()}
+    parts, length = [], 0
+    while length < CORPUS_BLOCK:
+        source = lang if lang != "mixed" else rng.choice(list(vocab))
+        sentence = " ".join(rng.choice(vocab[source]) for _ in range(rng.randint(6, 16)))
+        sentence += f" {rng.randint(0, 9999)}. "
+        parts.append(sentence)
+        length += len(sentence)
+    return "".join(parts)[:CORPUS_BLOCK]
+
+
+def make_corpus(lang, size):
+    """Deterministic `size`-character corpus: one generated block, repeated."""
+    block = _corpus_block(lang)
+    return (block * (size // len(block) + 1))[:size]
+
+
+def _suite_cases():
+    """(cipher, backend) -> (setup(text) -> callable, size cap or None)."""
+    def otp(vectorized):
+        def setup(text):
+            alphabet, _ = OTPLogic._get_alphabet(text)
+            key = OTPLogic.random_key(len(text), alphabet)
+            if vectorized:
+                return lambda: OTPLogic._transform_vectorized(text, key, alphabet, '+', trace=False)
+            return lambda: OTPLogic._transform_scalar(text, key, alphabet, '+', trace=False)
+        return setup
+
+    def rail_engine(vector):
+        def setup(text):
+            if not vector:
+                rail_fence_cipher.VECTOR_THRESHOLD = float('inf')
+            return lambda: rail_fence_cipher.rail_fence_encrypt(text, 7)
+        return setup
+
+    def rsa_per_char(text):
+        e, n, _ = rsa_logic.complete_keys(61, 53)
+        return lambda: rsa_logic.rsa_encrypt_with_steps(text, e, n)
+
+    def rsa_hybrid(text):
+        e, n, _ = rsa_logic.complete_keys(rsa_logic.generate_prime(512), rsa_logic.generate_prime(512))
+        data = text.encode('utf-8')
+        return lambda: rsa_logic.hybrid_encrypt_bytes(data, e, n)
+
+    def multiplicative(text):
+        lang = OTPLogic.detect_language(text)
+        key = multiplicative_cipher.valid_keys(lang)[-1]
+        return lambda: multiplicative_cipher.encrypt(text, key, lang)
+
+    def block_cipher(module, key_size, vector=True):
+        def setup(text):
+            if not vector:
+                module.VECTOR_BLOCKS = float('inf')
+            data, key = text.encode('utf-8'), secrets.token_bytes(key_size)
+            return lambda: module.encrypt(data, key, "CTR")
+        return setup
+
+    cases = {
+        ("otp", "scalar"): (otp(False), 256 << 20),
+        ("railfence", "railfence.py"): (lambda text: lambda: railfence.encrypt_railfence(text, 7, steps=False), None),
+        ("railfence", "engine-tuple"): (rail_engine(False), 16 << 20),
+        ("railfence", "original-loop"): (lambda text: lambda: _original_concat_encrypt(text, 7), 1 << 20),
+        ("rsa", "per-char"): (rsa_per_char, 1 << 20),
+        ("rsa", "hybrid"): (rsa_hybrid, None),
+        ("multiplicative", "translate"): (multiplicative, None),
+        ("des", "sp-tables"): (block_cipher(des_cipher, 8), 1 << 20),
+        ("aes", "t-table"): (block_cipher(aes_cipher, 16, vector=False), 1 << 20),
+    }
+    if otp_logic.np is not None:
+        cases[("otp", "vectorized")] = (otp(True), None)
+        cases[("railfence", "engine-numpy")] = (rail_engine(True), None)
+        cases[("aes", "numpy")] = (block_cipher(aes_cipher, 16), 64 << 20)
+    return cases
+
+
+def _rss_now():
+    # Current resident set size in bytes (Linux); 0 where /proc is missing
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError):
+        return 0
+
+
+def _reset_rss_peak():
+    # Writing 5 to clear_refs resets VmHWM to the current RSS (Linux 4.0+).
+    # ru_maxrss cannot be reset, so without this there is no per-call peak.
+    try:
+        with open('/proc/self/clear_refs', 'w') as f:
+            f.write('5')
+        return True
+    except OSError:
+        return False
+
+
+def _rss_hwm():
+    # Peak resident set size since the last reset, in bytes
+    with open('/proc/self/status') as f:
+        for line in f:
+            if line.startswith('VmHWM:'):
+                return int(line.split()[1]) * 1024
+    return 0
+
+
+def _rss_peak(fn):
+    """RSS growth over one call of fn, or None where the peak cannot be reset."""
+    if not _reset_rss_peak():
+        return None
+    before = _rss_now()
+    fn()
+    return max(_rss_hwm() - before, 0)
+
+
+def _time_rounds(fn, rounds=SUITE_ROUNDS, min_time=SUITE_MIN_TIME):
+    # Seconds per call of each round; a round repeats fn for at least min_time
+    times = []
+    for _ in range(rounds):
+        calls, start = 0, time.perf_counter()
+        while True:
+            fn()
+            calls += 1
+            elapsed = time.perf_counter() - start
+            if elapsed >= min_time:
+                break
+        times.append(elapsed / calls)
+    return times
+
+
+def run_suite_case(cipher, backend, lang, size):
+    """Measures one case in this process; returns its record."""
+    setup, _ = _suite_cases()[(cipher, backend)]
+    text = make_corpus(lang, size)
+    fn = setup(text)
+
+    fn()  # warm-up; also fills the per-key and per-length caches
+    rss_peak = _rss_peak(fn)
+    times = _time_rounds(fn)
+    seconds = statistics.median(times)
+
+    traced_peak = None
+    if size <= SUITE_TRACE_LIMIT:
+        traced_peak = _traced_peak(fn)[1]
+
+    utf8 = len(text.encode('utf-8'))
+    return {
+        "cipher": cipher, "backend": backend, "lang": lang, "size": size,
+        "seconds": seconds, "throughput": utf8 / seconds, "chars_per_s": size / seconds,
+        "noise": statistics.median(abs(t - seconds) for t in times) / seconds,
+        "traced_peak": traced_peak, "rss_peak": rss_peak,
+    }
+
+
+def _child(args):
+    # Runs `python *args` next to this file; returns the JSON on its last line
+    result = subprocess.run([sys.executable] + args, capture_output=True, text=True,
+                            cwd=os.path.dirname(os.path.abspath(__file__)))
+    if result.returncode != 0:
+        raise RuntimeError(f"{' '.join(args)} failed:\n{result.stderr.strip()}")
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def measure_imports(modules=SUITE_MODULES, repeat=7):
+    """Median import time of each module over `repeat` fresh interpreters, plus bare startup."""
+    times = {}
+    for name in ("(startup)",) + tuple(modules):
+        statement = "pass" if name == "(startup)" else f"import {name}"
+        code = (f"import time, json; t = time.perf_counter(); {statement}; "
+                f"print(json.dumps(time.perf_counter() - t))")
+        values = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            inner = _child(["-c", code])
+            total = time.perf_counter() - start
+            values.append(total if name == "(startup)" else inner)
+        times[name] = statistics.median(values)
+    return times
+
+
+def _record_key(record):
+    return f"{record['cipher']}/{record['backend']}/{record['lang']}/{record['size']}"
+
+
+def compare(results, baseline, tolerances=None):
+    """Returns one message per metric that regressed past its tolerance."""
+    tolerances = dict(SUITE_TOLERANCES, **(tolerances or {}))
+    old_cases = {_record_key(r): r for r in baseline.get("cases", [])}
+    regressions = []
+
+    def check(label, metric, old, new, higher_is_better=False, noise=0.0, floor_delta=None):
+        if old is None or new is None:
+            return
+        if abs(new - old if floor_delta is None else floor_delta) < SUITE_FLOORS.get(metric, 0):
+            return
+        # The spread both runs saw between their own rounds widens the tolerance
+        limit = tolerances[metric] + noise
+        worse = new < old * (1 - limit) if higher_is_better else new > old * (1 + limit)
+        if worse:
+            regressions.append(f"{label} {metric}: {old:.4g} -> {new:.4g} (tolerance {limit:.0%})")
+
+    for record in results["cases"]:
+        old = old_cases.get(_record_key(record))
+        if old is None:
+            continue
+        label = _record_key(record)
+        check(label, "throughput", old["throughput"], record["throughput"], higher_is_better=True,
+              noise=old.get("noise", 0.0) + record.get("noise", 0.0),
+              floor_delta=record["seconds"] - old["seconds"])
+        check(label, "traced_peak", old.get("traced_peak"), record["traced_peak"])
+        check(label, "rss_peak", old.get("rss_peak"), record["rss_peak"])
+    for name, seconds in results["imports"].items():
+        check(f"import {name}", "import_time", baseline.get("imports", {}).get(name), seconds)
+    return regressions
+
+
+def run_suite(sizes=SUITE_SIZES, langs=SUITE_LANGS, ciphers=None):
+    """Runs every case in its own interpreter; returns the results dict."""
+    results = {
+        "meta": {"python": sys.version.split()[0], "platform": sys.platform,
+                 "numpy": getattr(otp_logic.np, "__version__", None),
+                 "time": time.strftime("%Y-%m-%dT%H:%M:%S")},
+        "cases": [],
+        "imports": {},
+    }
+    sizes = [parse_size(s) if isinstance(s, str) else s for s in sizes]
+    for (cipher, backend), (_, cap) in _suite_cases().items():
+        if ciphers and cipher not in ciphers:
+            continue
+        for lang in langs:
+            for size in sizes:
+                if cap is not None and size > cap:
+                    continue
+                record = _child([os.path.abspath(__file__), "--suite-case", cipher, backend, lang, str(size)])
+                results["cases"].append(record)
+                traced = "-" if record["traced_peak"] is None else f"{record['traced_peak'] / 1e6:8.1f} MB"
+                rss = "-" if record["rss_peak"] is None else f"{record['rss_peak'] / 1e6:8.1f} MB"
+                print(f"  {cipher:<14} {backend:<14} {lang:<8} {size:>11,}  {record['throughput'] / 1e6:9.2f} MB/s"
+                      f" ±{record['noise']:4.0%}   traced {traced:>11}   rss +{rss:>11}", flush=True)
+    results["imports"] = measure_imports()
+    for name, seconds in results["imports"].items():
+        print(f"  import {name:<24} {seconds * 1e3:8.1f} ms")
+    return results
+
+
+def _tolerance(text):
+    metric, _, value = text.partition('=')
+    if metric not in SUITE_TOLERANCES or not value:
+        raise argparse.ArgumentTypeError(f"expected METRIC=FRACTION with METRIC in {', '.join(SUITE_TOLERANCES)}")
+    return metric, float(value)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Cipher micro-benchmarks and the regression suite.")
+    parser.add_argument("sections", nargs="*", help=f"micro-benchmark sections: {', '.join(SECTIONS)}")
+    parser.add_argument("--suite", action="store_true", help="run the cross-cipher regression suite")
+    parser.add_argument("--sizes", default=",".join(SUITE_SIZES), help="corpus sizes, e.g. 1K,1M,1G")
+    parser.add_argument("--langs", default=",".join(SUITE_LANGS))
+    parser.add_argument("--ciphers", default="", help="only these ciphers (comma separated)")
+    parser.add_argument("--json", help="write the suite results to this file")
+    parser.add_argument("--baseline", help="fail when a metric regressed against this results file")
+    parser.add_argument("--tolerance", action="append", type=_tolerance, default=[],
+                        help="METRIC=FRACTION, e.g. throughput=0.1 (repeatable)")
+    parser.add_argument("--suite-case", nargs=4, metavar=("CIPHER", "BACKEND", "LANG", "SIZE"),
+                        help=argparse.SUPPRESS)
+    args = parser.parse_args(argv)
+
+    if args.suite_case:
+        cipher, backend, lang, size = args.suite_case
+        print(json.dumps(run_suite_case(cipher, backend, lang, int(size))))
+        return 0
+    if not args.suite:
+        for name in args.sections or list(SECTIONS):
+            if name not in SECTIONS:
+                sys.exit(f"Unknown section '{name}'. Choose from: {', '.join(SECTIONS)}")
+            for bench in SECTIONS[name]:
+                bench()
+                print()
+        return 0
+
+    print("Regression suite (throughput of UTF-8 input; each case in a fresh interpreter)")
+    results = run_suite(args.sizes.split(','), args.langs.split(','),
+                        [c for c in args.ciphers.split(',') if c])
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+    if args.baseline:
+        with open(args.baseline, 'r', encoding='utf-8') as f:
+            regressions = compare(results, json.load(f), dict(args.tolerance))
+        if regressions:
+            print(f"{len(regressions)} regression(s) against {args.baseline}:")
+            for line in regressions:
+                print(f"  {line}")
+            return 1
+        print(f"No regressions against {args.baseline}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,79 @@
+from PySide6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel,
+                               QLineEdit, QPushButton, QTextEdit, QComboBox, QCheckBox)
+from PySide6.QtCore import Qt
+from PySide6.QtGui import QFont
+
+
+class BlockCipherPanel(QWidget):
+    """
+    Encrypt/decrypt form for a byte-oriented block cipher module that
+    provides MODES, KEY_HINT, encrypt, decrypt and parse_key
+    (des_cipher, aes_cipher).
+    Plaintext is UTF-8 text; ciphertext is shown and entered as hex, with
+    the IV / nonce in front for CBC and CTR. Engines with encrypt_steps and
+    format_steps also get a trace of the first block's rounds.
+    """
+
+    def __init__(self, title, engine):
+        super().__init__()
+        self.engine = engine
+        self.init_ui(title)
+
+    def init_ui(self, title):
+        layout = QVBoxLayout()
+        self.setLayout(layout)
+
+        header = QLabel(title)
+        header.setFont(QFont("Segoe UI", 30, QFont.Bold))
+        header.setAlignment(Qt.AlignCenter)
+        layout.addWidget(header)
+
+        row = QHBoxLayout()
+        self.direction = QComboBox()
+        self.direction.addItems(["Encrypt", "Decrypt"])
+        self.block_mode = QComboBox()
+        self.block_mode.addItems(list(self.engine.MODES))
+        self.block_mode.setCurrentText("CBC")
+        row.addWidget(self.direction)
+        row.addWidget(QLabel("Mode:"))
+        row.addWidget(self.block_mode)
+        self.show_steps = None
+        if hasattr(self.engine, "encrypt_steps"):
+            self.show_steps = QCheckBox("Show round steps (first block)")
+            row.addWidget(self.show_steps)
+        layout.addLayout(row)
+
+        self.input_text = QTextEdit()
+        self.input_text.setPlaceholderText("Enter plain text (to Encrypt) OR hex cipher text (to Decrypt)...")
+        layout.addWidget(self.input_text)
+
+        self.key_input = QLineEdit()
+        self.key_input.setPlaceholderText(self.engine.KEY_HINT)
+        layout.addWidget(self.key_input)
+
+        run_btn = QPushButton("Run")
+        run_btn.clicked.connect(self.run)
+        layout.addWidget(run_btn)
+
+        self.output = QTextEdit()
+        self.output.setReadOnly(True)
+        layout.addWidget(self.output)
+
+    def run(self):
+        try:
+            key = self.engine.parse_key(self.key_input.text())
+            mode = self.block_mode.currentText()
+            data = self.input_text.toPlainText()
+            if self.direction.currentText() == "Encrypt":
+                plain = data.encode('utf-8')
+                result = self.engine.encrypt(plain, key, mode).hex().upper()
+                if self.show_steps is not None and self.show_steps.isChecked():
+                    block = self.engine.pad(plain)[:self.engine.BLOCK_SIZE]
+                    _, steps = self.engine.encrypt_steps(block, key)
+                    result += f"\n\nRounds of the first block (ECB view):\n{self.engine.format_steps(steps)}"
+            else:
+                blob = bytes.fromhex("".join(data.split()))
+                result = self.engine.decrypt(blob, key, mode).decode('utf-8')
+            self.output.setPlainText(result)
+        except (ValueError, UnicodeDecodeError) as err:
+            self.output.setPlainText(f"Error: {err}")
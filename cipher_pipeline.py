@@ -0,0 +1,555 @@
+"""
+Composable cipher pipelines built from generator stages.
+
+Each stage is a generator over chunks: it pulls chunks from upstream and
+yields chunks downstream. A pipeline of streaming stages therefore holds
+about one chunk per stage in memory, whatever the input size. Each stage
+declares whether it streams:
+- streaming stages hold only the current chunk and a small carry;
+- whole-message stages (classic rail fence, whose zigzag depends on the
+  total length) buffer their whole input and re-split their output into
+  CHUNK_CHARS pieces, so later stages stay bounded.
+
+Stages consume and produce either text (str chunks) or bytes. The
+pipeline inserts a UTF-8 encoder or an incremental decoder where
+neighbouring stages disagree.
+
+Stages whose alphabet depends on the language (otp, seeded,
+multiplicative) judge it from the first CHUNK_CHARS characters they
+receive, so a short header from an upstream stage cannot decide it, and
+record it in a header of their own; decryption reads it back instead of
+guessing from ciphertext. The otp stage also records the pad offset it
+started at, taken from the pad's ledger (otp_stream.PadLedger), so every
+message uses fresh pad and decrypts without the ledger.
+
+Pipelines are described by stage specs such as
+``railfence:key=5 | otp:pad=pad.txt | rsa:e=65537,n=...``. The same specs,
+run with decrypt=True, build the inverse pipeline: the stages in reverse
+order, each in its decrypt direction. Run one from the command line with
+
+    python cipher_pipeline.py SRC DST "railfence:key=5 | seeded:seed=..." [--decrypt]
+
+or from the Pipeline panel of the GUI.
+"""
+import argparse
+import codecs
+import hashlib
+import hmac
+import io
+import os
+import secrets
+import sys
+
+import keystream
+import multiplicative_cipher
+import otp_seeded
+import rail_fence_stream
+import rsa_logic
+from otp_logic import OTPLogic
+from otp_stream import PadLedger, PadPosition
+from rail_fence_cipher import rail_fence_decrypt, rail_fence_encrypt
+
+TEXT = "text"
+BYTES = "bytes"
+
+# Chunk size handed between stages (characters or bytes); a multiple of
+# the keystream block so hybrid RSA chunks never regenerate a block twice
+CHUNK_CHARS = 1 << 16
+LANG_MAGIC = "PIPELINE-LANG-1"
+
+
+def _empty(kind):
+    return "" if kind == TEXT else b""
+
+
+def _pieces(data, size=CHUNK_CHARS):
+    for start in range(0, len(data), size):
+        yield data[start:start + size]
+
+
+def _rechunk(chunks, size, kind):
+    """Regroups chunks into pieces of exactly `size` (the last may be shorter)."""
+    buffer = _empty(kind)
+    for chunk in chunks:
+        buffer += chunk
+        while len(buffer) >= size:
+            yield buffer[:size]
+            buffer = buffer[size:]
+    if buffer:
+        yield buffer
+
+
+def _read_header(chunks, lines, kind):
+    """
+    Splits the first `lines` lines off a chunk stream. Returns (lines without
+    their newlines, iterator over the rest of the stream).
+    """
+    newline = "\n" if kind == TEXT else b"\n"
+    chunks = iter(chunks)
+    buffer = _empty(kind)
+    while buffer.count(newline) < lines:
+        chunk = next(chunks, None)
+        if chunk is None:
+            raise ValueError("Input ended inside the header.")
+        buffer += chunk
+    parts = buffer.split(newline, lines)
+
+    def rest():
+        if parts[lines]:
+            yield parts[lines]
+        yield from chunks
+    return parts[:lines], rest()
+
+
+# ----------------- Stages -----------------
+class Stage:
+    """
+    Base class. Streaming stages override stream(chunks); whole-message
+    stages set streams = False and override whole(data).
+    """
+    name = "stage"
+    streams = True
+    input = TEXT
+    output = TEXT
+
+    def __call__(self, chunks):
+        if self.streams:
+            return self.stream(chunks)
+        return self._buffered(chunks)
+
+    def _buffered(self, chunks):
+        data = _empty(self.input).join(chunks)
+        yield from _pieces(self.whole(data))
+
+    def stream(self, chunks):
+        raise NotImplementedError
+
+    def whole(self, data):
+        raise NotImplementedError
+
+    def __repr__(self):
+        return f"{self.name} ({'streams' if self.streams else 'buffers the whole message'})"
+
+
+class EncodeStage(Stage):
+    name = "utf8-encode"
+    input, output = TEXT, BYTES
+
+    def stream(self, chunks):
+        for chunk in chunks:
+            yield chunk.encode('utf-8', 'surrogatepass')
+
+
+class DecodeStage(Stage):
+    name = "utf8-decode"
+    input, output = BYTES, TEXT
+
+    def stream(self, chunks):
+        # Incremental, so a character split across two chunks is kept whole
+        decoder = codecs.getincrementaldecoder('utf-8')('surrogatepass')
+        for chunk in chunks:
+            text = decoder.decode(chunk)
+            if text:
+                yield text
+        tail = decoder.decode(b"", final=True)
+        if tail:
+            yield tail
+
+
+class RailFenceStage(Stage):
+    """Classic rail fence (whole message), or block rail fence when block_size is set."""
+    name = "railfence"
+
+    def __init__(self, key, decrypt=False, block_size=None):
+        self.key = key
+        self.decrypt = decrypt
+        self.block_size = block_size
+        self.streams = block_size is not None
+
+    def whole(self, data):
+        return rail_fence_decrypt(data, self.key) if self.decrypt else rail_fence_encrypt(data, self.key)
+
+    def stream(self, chunks):
+        if self.decrypt:
+            (header,), chunks = _read_header(chunks, 1, TEXT)
+            block_size = rail_fence_stream._parse_header(header)
+            for block in _rechunk(chunks, block_size, TEXT):
+                yield rail_fence_decrypt(block, self.key)
+            return
+        yield rail_fence_stream._header(self.block_size)
+        for block in _rechunk(chunks, self.block_size, TEXT):
+            yield rail_fence_encrypt(block, self.key)
+
+
+def _detect_language(chunks, lang):
+    """
+    Returns (lang, chunks). Unless given, the language is judged from the
+    first CHUNK_CHARS characters of the stream, which are put back in front.
+    """
+    chunks = iter(chunks)
+    if lang is not None:
+        if lang not in OTPLogic.ALPHABETS:
+            raise ValueError(f"Unknown language '{lang}'.")
+        return lang, chunks
+    sample = []
+    have = 0
+    for chunk in chunks:
+        sample.append(chunk)
+        have += len(chunk)
+        if have >= CHUNK_CHARS:
+            break
+    sample = "".join(sample)
+    return OTPLogic.detect_language(sample), _chain(sample, chunks)
+
+
+def _lang_header(name, lang, *fields):
+    return " ".join((LANG_MAGIC, name, lang) + fields) + "\n"
+
+
+def _read_lang_header(chunks, name, fields=0):
+    """
+    Returns (lang, the `fields` extra header fields, rest of the stream) for
+    a stream that starts with _lang_header(name, ...).
+    """
+    (line,), chunks = _read_header(chunks, 1, TEXT)
+    parts = line.split()
+    if len(parts) != 3 + fields or parts[0] != LANG_MAGIC or parts[1] != name:
+        raise ValueError(f"Not {name} stage output (missing {LANG_MAGIC} header).")
+    if parts[2] not in OTPLogic.ALPHABETS:
+        raise ValueError(f"Unknown language '{parts[2]}' in {name} stage header.")
+    return parts[2], parts[3:], chunks
+
+
+def _position_fields(position):
+    return f"chars={position.chars}", f"bytes={position.bytes}"
+
+
+def _parse_position(fields, name):
+    try:
+        chars, key_bytes = (int(field.split('=', 1)[1]) for field in fields)
+    except (IndexError, ValueError):
+        raise ValueError(f"Bad pad offset in {name} stage header.")
+    return PadPosition(chars, key_bytes)
+
+
+class OTPStage(Stage):
+    """
+    One-Time Pad with key characters taken, chunk by chunk, from `pad` (the
+    key as a string) or from the pad file at `pad_path`. A pad file is used
+    from where its PadLedger left off, and the ledger is advanced once the
+    whole stream has been encrypted, so no two messages share key material.
+    The starting offset goes into the stage header; decryption seeks to it
+    and leaves the ledger alone.
+    """
+    name = "otp"
+
+    def __init__(self, pad=None, decrypt=False, lang=None, pad_path=None, ledger=None):
+        if (pad is None) == (pad_path is None):
+            raise ValueError("OTP stage needs either a pad string or a pad file.")
+        self.pad = pad
+        self.pad_path = pad_path
+        self.ledger = ledger
+        self.op = '-' if decrypt else '+'
+        self.lang = lang
+
+    def _open_pad(self, position):
+        if self.pad is not None:
+            return io.StringIO(self.pad[position.chars:])
+        pad_raw = open(self.pad_path, 'rb')
+        pad_raw.seek(position.bytes)
+        return io.TextIOWrapper(pad_raw, encoding='utf-8', newline='')
+
+    def stream(self, chunks):
+        ledger = None
+        if self.op == '-':
+            self.lang, fields, chunks = _read_lang_header(chunks, self.name, 2)
+            position = _parse_position(fields, self.name)
+        else:
+            self.lang, chunks = _detect_language(chunks, self.lang)
+            if self.pad_path is not None:
+                ledger = self.ledger or PadLedger(self.pad_path)
+                position = ledger.position
+            else:
+                position = PadPosition(0, 0)
+            yield _lang_header(self.name, self.lang, *_position_fields(position))
+        alphabet = OTPLogic.ALPHABETS[self.lang]
+        used = key_bytes = 0
+        with self._open_pad(position) as pad:
+            for chunk in chunks:
+                key = pad.read(len(chunk))
+                if len(key) < len(chunk):
+                    raise ValueError(f"Pad exhausted after {position.chars + used + len(key)} characters.")
+                used += len(key)
+                key_bytes += len(key.encode('utf-8', 'surrogatepass'))
+                yield OTPLogic._transform(chunk, key, alphabet, self.op, trace=False)[0]
+        if ledger is not None:
+            ledger.commit(PadPosition(position.chars + used, position.bytes + key_bytes))
+
+
+class SeededStage(Stage):
+    """Seeded-pad stream cipher (otp_seeded), header included."""
+    name = "seeded"
+
+    def __init__(self, seed, decrypt=False, lang=None):
+        self.seed = seed
+        self.decrypt = decrypt
+        self.lang = lang
+
+    def stream(self, chunks):
+        if self.decrypt:
+            header, chunks = _read_header(chunks, 2, TEXT)
+            self.lang, nonce = otp_seeded._parse_header(*header)
+            alphabet, op = OTPLogic.ALPHABETS[self.lang], '-'
+        else:
+            self.lang, chunks = _detect_language(chunks, self.lang)
+            alphabet, op = OTPLogic.ALPHABETS[self.lang], '+'
+            nonce = secrets.token_bytes(otp_seeded.NONCE_SIZE)
+            yield otp_seeded._header(self.lang, nonce)
+        pad = otp_seeded.SeededPad(self.seed, nonce, alphabet)
+        for chunk in chunks:
+            yield OTPLogic._transform(chunk, pad.key(len(chunk)), alphabet, op, trace=False)[0]
+
+
+class MultiplicativeStage(Stage):
+    name = "multiplicative"
+
+    def __init__(self, key, decrypt=False, lang=None):
+        self.key = key
+        self.decrypt = decrypt
+        self.lang = lang
+
+    def stream(self, chunks):
+        if self.decrypt:
+            self.lang, _, chunks = _read_lang_header(chunks, self.name)
+        else:
+            self.lang, chunks = _detect_language(chunks, self.lang)
+            yield _lang_header(self.name, self.lang)
+        table = multiplicative_cipher.translation_tables(self.lang, self.key)[int(self.decrypt)]
+        for chunk in chunks:
+            yield chunk.translate(table)
+
+
+class HybridRSAStage(Stage):
+    """
+    Hybrid RSA over bytes (rsa_logic.hybrid_*): the header carries the
+    OAEP-wrapped session key, the body is XORed with its keystream and an
+    HMAC tag follows it. Decryption holds back the last TAG_SIZE bytes and
+    raises once the stream ends if the tag does not match; run_file only
+    replaces the destination after that check.
+    """
+    name = "rsa"
+    input, output = BYTES, BYTES
+
+    def __init__(self, n, e=None, d=None, decrypt=False, primes=None):
+        if (d if decrypt else e) is None:
+            raise ValueError("Hybrid RSA needs 'd' to decrypt and 'e' to encrypt.")
+        self.n, self.e, self.d = n, e, d
+        self.decrypt = decrypt
+        self.primes = primes
+
+    def stream(self, chunks):
+        if self.decrypt:
+            (magic, line), chunks = _read_header(chunks, 2, BYTES)
+            if magic + b"\n" != rsa_logic.HYBRID_MAGIC:
+                raise ValueError("Not a hybrid RSA stream.")
+            wrapped = rsa_logic._parse_wrapped(line.decode('ascii'))
+            session_key = rsa_logic.unwrap_session_key(wrapped, self.d, self.n, self.primes)
+            header = magic + b"\n" + line + b"\n"
+        else:
+            session_key = secrets.token_bytes(rsa_logic.SESSION_KEY_SIZE)
+            header = rsa_logic._hybrid_header(session_key, self.e, self.n)
+            yield header
+        enc_key, mac_key = rsa_logic._session_keys(session_key)
+        mac = hmac.new(mac_key, header, hashlib.sha256)
+        offset = 0
+        held = b""
+        for chunk in chunks:
+            if self.decrypt:
+                chunk = held + chunk
+                chunk, held = chunk[:-rsa_logic.TAG_SIZE], chunk[-rsa_logic.TAG_SIZE:]
+                mac.update(chunk)
+            out = keystream.xor_bytes(chunk, keystream.keystream(enc_key, len(chunk), offset))
+            if not self.decrypt:
+                mac.update(out)
+            offset += len(chunk)
+            if out:
+                yield out
+        if not self.decrypt:
+            yield mac.digest()
+        elif len(held) < rsa_logic.TAG_SIZE:
+            raise ValueError("Hybrid stream is truncated: the authentication tag is missing.")
+        else:
+            rsa_logic._check_tag(mac, held)
+
+
+def _chain(first, rest):
+    if first:
+        yield first
+    yield from rest
+
+
+# ----------------- Pipelines -----------------
+def _open(path, mode, kind):
+    if kind == TEXT:
+        return open(path, mode, encoding='utf-8', newline='')
+    return open(path, mode + 'b')
+
+
+class Pipeline:
+    def __init__(self, stages):
+        """
+        Stages run in order. A UTF-8 encoder or decoder is inserted wherever
+        one stage's output kind differs from the next one's input kind.
+        """
+        if not stages:
+            raise ValueError("A pipeline needs at least one stage.")
+        self.input = stages[0].input
+        self.stages = []
+        kind = self.input
+        for stage in stages:
+            if stage.input != kind:
+                self.stages.append(EncodeStage() if kind == TEXT else DecodeStage())
+            self.stages.append(stage)
+            kind = stage.output
+        self.output = kind
+
+    @property
+    def streams(self):
+        return all(stage.streams for stage in self.stages)
+
+    def run(self, chunks):
+        """Generator over the output chunks for an iterable of input chunks."""
+        for stage in self.stages:
+            chunks = stage(chunks)
+        return chunks
+
+    def run_all(self, data):
+        """Whole input in, whole output out."""
+        return _empty(self.output).join(self.run(_pieces(data)))
+
+    def run_file(self, src_path, dst_path, chunk_size=CHUNK_CHARS):
+        """
+        Streams src_path through the pipeline into dst_path; returns the
+        output size. The output goes to a temporary file that only replaces
+        dst_path once the whole pipeline succeeded.
+        """
+        written = 0
+        tmp_path = dst_path + ".tmp"
+        try:
+            with _open(src_path, 'r', self.input) as src, _open(tmp_path, 'w', self.output) as dst:
+                chunks = iter(lambda: src.read(chunk_size), _empty(self.input))
+                for chunk in self.run(chunks):
+                    dst.write(chunk)
+                    written += len(chunk)
+            os.replace(tmp_path, dst_path)
+        except Exception:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+            raise
+        return written
+
+    def describe(self):
+        return " -> ".join(repr(stage) for stage in self.stages)
+
+
+# ----------------- Stage specs -----------------
+def _parse_spec(spec):
+    name, _, params = spec.strip().partition(':')
+    options = {}
+    for item in filter(None, (p.strip() for p in params.split(','))):
+        key, sep, value = item.partition('=')
+        if not sep:
+            raise ValueError(f"Stage option '{item}' must look like name=value.")
+        options[key.strip()] = value.strip()
+    return name.strip().lower(), options
+
+
+def _int(options, key, default=None):
+    if key not in options:
+        if default is not None:
+            return default
+        raise ValueError(f"Missing '{key}=' option.")
+    return int(options[key])
+
+
+def _build_stage(name, options, decrypt, opened):
+    lang = options.get('lang')
+    if name == 'railfence':
+        block = _int(options, 'block', 0) or None
+        return RailFenceStage(_int(options, 'key'), decrypt, block)
+    if name == 'otp':
+        if 'pad' not in options:
+            raise ValueError("Missing 'pad=' option (path of the pad text file).")
+        return OTPStage(decrypt=decrypt, lang=lang, pad_path=options['pad'])
+    if name == 'seeded':
+        if 'seed' not in options:
+            raise ValueError("Missing 'seed=' option.")
+        return SeededStage(options['seed'], decrypt, lang)
+    if name == 'multiplicative':
+        return MultiplicativeStage(_int(options, 'key'), decrypt, lang)
+    if name == 'rsa':
+        e = int(options['e']) if 'e' in options else None
+        d = int(options['d']) if 'd' in options else None
+        # CRT decryption: primes=p/q[/r...]
+        primes = tuple(int(r) for r in options['primes'].split('/')) if 'primes' in options else None
+        return HybridRSAStage(_int(options, 'n'), e, d, decrypt, primes)
+    if name in ('utf8', 'encode'):
+        return DecodeStage() if decrypt else EncodeStage()
+    raise ValueError(f"Unknown stage '{name}'. Choose from: {', '.join(STAGE_NAMES)}")
+
+
+STAGE_NAMES = ('railfence', 'otp', 'seeded', 'multiplicative', 'rsa', 'utf8')
+
+
+def from_specs(specs, decrypt=False):
+    """
+    Builds a pipeline from 'name:key=value,...' specs (a list, or one string
+    joined with '|'), listed in encryption order. With decrypt=True the
+    stages run in reverse order, each decrypting. Returns (pipeline, files
+    opened for the stages), and the caller closes the files.
+    """
+    if isinstance(specs, str):
+        specs = specs.split('|')
+    parsed = [_parse_spec(spec) for spec in specs if spec.strip()]
+    if decrypt:
+        parsed.reverse()
+    opened = []
+    try:
+        stages = [_build_stage(name, options, decrypt, opened) for name, options in parsed]
+        return Pipeline(stages), opened
+    except Exception:
+        for f in opened:
+            f.close()
+        raise
+
+
+def run_specs_file(specs, src_path, dst_path, decrypt=False):
+    pipeline, opened = from_specs(specs, decrypt)
+    try:
+        return pipeline, pipeline.run_file(src_path, dst_path)
+    finally:
+        for f in opened:
+            f.close()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Run a file through a chain of ciphers, chunk by chunk.",
+        epilog="Stages: railfence:key=K[,block=N]  otp:pad=PATH[,lang=L]  seeded:seed=S[,lang=L]  "
+               "multiplicative:key=K[,lang=L]  rsa:n=N,e=E (d=D[,primes=P/Q] to decrypt)  utf8")
+    parser.add_argument("src")
+    parser.add_argument("dst")
+    parser.add_argument("stages", help="stage specs in encryption order, separated by '|'")
+    parser.add_argument("--decrypt", action="store_true", help="run the inverse pipeline")
+    args = parser.parse_args(argv)
+    try:
+        pipeline, written = run_specs_file(args.stages, args.src, args.dst, args.decrypt)
+    except (ValueError, OSError) as err:
+        print(f"Error: {err}", file=sys.stderr)
+        return 1
+    print(f"{pipeline.describe()}\n{written} {'characters' if pipeline.output == TEXT else 'bytes'} written to {args.dst}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,371 @@
+"""
+DES and Triple DES (EDE) in pure Python, with ECB, CBC and CTR modes over
+bytes.
+
+The round function never touches single bits:
+- S-boxes and the P permutation are folded into combined SP tables, built
+  once at import. Each table covers two S-boxes, so a round costs four
+  lookups on a 12-bit index.
+- The expansion E is replaced by two rotations of the right half. Each
+  rotation lines four non-overlapping 6-bit groups up with the byte lanes
+  of one 32-bit subkey word.
+- The initial and final permutations are eight byte-indexed table lookups
+  each. In Triple DES the inner FP/IP pairs cancel and are skipped.
+
+Key schedules are cached per key (KEY_CACHE_SIZE). Blocks are packed into
+ints with struct, so a whole buffer goes through a local-bound block
+function in one list comprehension. CTR keystreams and CBC decryption XOR
+the entire buffer as one big integer.
+
+Keys are 8 bytes (DES), 16 bytes (two-key 3DES: K1 K2 K1) or 24 bytes
+(three-key 3DES). Parity bits are ignored, as in every DES implementation.
+"""
+import secrets
+import struct
+from functools import lru_cache
+
+BLOCK_SIZE = 8
+KEY_SIZES = (8, 16, 24)
+KEY_CACHE_SIZE = 64
+MODES = ("ECB", "CBC", "CTR")
+KEY_HINT = "Key: 8, 16 or 24 characters, or 16, 32 or 48 hex digits"
+
+_MASK32 = 0xFFFFFFFF
+_MASK64 = (1 << 64) - 1
+
+# ----------------- FIPS 46-3 tables -----------------
+_IP = (
+    58, 50, 42, 34, 26, 18, 10, 2, 60, 52, 44, 36, 28, 20, 12, 4,
+    62, 54, 46, 38, 30, 22, 14, 6, 64, 56, 48, 40, 32, 24, 16, 8,
+    57, 49, 41, 33, 25, 17, 9, 1, 59, 51, 43, 35, 27, 19, 11, 3,
+    61, 53, 45, 37, 29, 21, 13, 5, 63, 55, 47, 39, 31, 23, 15, 7,
+)
+_FP = tuple(_IP.index(i) + 1 for i in range(1, 65))
+
+_P = (
+    16, 7, 20, 21, 29, 12, 28, 17, 1, 15, 23, 26, 5, 18, 31, 10,
+    2, 8, 24, 14, 32, 27, 3, 9, 19, 13, 30, 6, 22, 11, 4, 25,
+)
+
+_PC1 = (
+    57, 49, 41, 33, 25, 17, 9, 1, 58, 50, 42, 34, 26, 18,
+    10, 2, 59, 51, 43, 35, 27, 19, 11, 3, 60, 52, 44, 36,
+    63, 55, 47, 39, 31, 23, 15, 7, 62, 54, 46, 38, 30, 22,
+    14, 6, 61, 53, 45, 37, 29, 21, 13, 5, 28, 20, 12, 4,
+)
+_PC2 = (
+    14, 17, 11, 24, 1, 5, 3, 28, 15, 6, 21, 10,
+    23, 19, 12, 4, 26, 8, 16, 7, 27, 20, 13, 2,
+    41, 52, 31, 37, 47, 55, 30, 40, 51, 45, 33, 48,
+    44, 49, 39, 56, 34, 53, 46, 42, 50, 36, 29, 32,
+)
+_SHIFTS = (1, 1, 2, 2, 2, 2, 2, 2, 1, 2, 2, 2, 2, 2, 2, 1)
+
+_SBOXES = (
+    (14, 4, 13, 1, 2, 15, 11, 8, 3, 10, 6, 12, 5, 9, 0, 7,
+     0, 15, 7, 4, 14, 2, 13, 1, 10, 6, 12, 11, 9, 5, 3, 8,
+     4, 1, 14, 8, 13, 6, 2, 11, 15, 12, 9, 7, 3, 10, 5, 0,
+     15, 12, 8, 2, 4, 9, 1, 7, 5, 11, 3, 14, 10, 0, 6, 13),
+    (15, 1, 8, 14, 6, 11, 3, 4, 9, 7, 2, 13, 12, 0, 5, 10,
+     3, 13, 4, 7, 15, 2, 8, 14, 12, 0, 1, 10, 6, 9, 11, 5,
+     0, 14, 7, 11, 10, 4, 13, 1, 5, 8, 12, 6, 9, 3, 2, 15,
+     13, 8, 10, 1, 3, 15, 4, 2, 11, 6, 7, 12, 0, 5, 14, 9),
+    (10, 0, 9, 14, 6, 3, 15, 5, 1, 13, 12, 7, 11, 4, 2, 8,
+     13, 7, 0, 9, 3, 4, 6, 10, 2, 8, 5, 14, 12, 11, 15, 1,
+     13, 6, 4, 9, 8, 15, 3, 0, 11, 1, 2, 12, 5, 10, 14, 7,
+     1, 10, 13, 0, 6, 9, 8, 7, 4, 15, 14, 3, 11, 5, 2, 12),
+    (7, 13, 14, 3, 0, 6, 9, 10, 1, 2, 8, 5, 11, 12, 4, 15,
+     13, 8, 11, 5, 6, 15, 0, 3, 4, 7, 2, 12, 1, 10, 14, 9,
+     10, 6, 9, 0, 12, 11, 7, 13, 15, 1, 3, 14, 5, 2, 8, 4,
+     3, 15, 0, 6, 10, 1, 13, 8, 9, 4, 5, 11, 12, 7, 2, 14),
+    (2, 12, 4, 1, 7, 10, 11, 6, 8, 5, 3, 15, 13, 0, 14, 9,
+     14, 11, 2, 12, 4, 7, 13, 1, 5, 0, 15, 10, 3, 9, 8, 6,
+     4, 2, 1, 11, 10, 13, 7, 8, 15, 9, 12, 5, 6, 3, 0, 14,
+     11, 8, 12, 7, 1, 14, 2, 13, 6, 15, 0, 9, 10, 4, 5, 3),
+    (12, 1, 10, 15, 9, 2, 6, 8, 0, 13, 3, 4, 14, 7, 5, 11,
+     10, 15, 4, 2, 7, 12, 9, 5, 6, 1, 13, 14, 0, 11, 3, 8,
+     9, 14, 15, 5, 2, 8, 12, 3, 7, 0, 4, 10, 1, 13, 11, 6,
+     4, 3, 2, 12, 9, 5, 15, 10, 11, 14, 1, 7, 6, 0, 8, 13),
+    (4, 11, 2, 14, 15, 0, 8, 13, 3, 12, 9, 7, 5, 10, 6, 1,
+     13, 0, 11, 7, 4, 9, 1, 10, 14, 3, 5, 12, 2, 15, 8, 6,
+     1, 4, 11, 13, 12, 3, 7, 14, 10, 15, 6, 8, 0, 5, 9, 2,
+     6, 11, 13, 8, 1, 4, 10, 7, 9, 5, 0, 15, 14, 2, 3, 12),
+    (13, 2, 8, 4, 6, 15, 11, 1, 10, 9, 3, 14, 5, 0, 12, 7,
+     1, 15, 13, 8, 10, 3, 7, 4, 12, 5, 6, 11, 0, 14, 9, 2,
+     7, 11, 4, 1, 9, 12, 14, 2, 0, 6, 10, 13, 15, 3, 5, 8,
+     2, 1, 14, 7, 4, 10, 8, 13, 15, 12, 9, 0, 3, 5, 6, 11),
+)
+
+
+def _permute(value, table, width):
+    """Bit permutation in FIPS numbering: output bit j is input bit table[j] (1 = MSB)."""
+    out = 0
+    for position in table:
+        out = (out << 1) | ((value >> (width - position)) & 1)
+    return out
+
+
+# ----------------- Precomputed tables -----------------
+def _sp_table(box):
+    """P(S_box(x)) for every 6-bit input x, as 32-bit words."""
+    table = []
+    for x in range(64):
+        row = ((x >> 4) & 2) | (x & 1)
+        col = (x >> 1) & 0xF
+        table.append(_permute(_SBOXES[box][row * 16 + col] << (28 - 4 * box), _P, 32))
+    return table
+
+
+def _pair_table(high, low):
+    # Indexed by (x_high << 8) | x_low, matching two byte lanes of a word
+    sp_high, sp_low = _sp_table(high), _sp_table(low)
+    table = [0] * 0x3F40
+    for a in range(64):
+        for b in range(64):
+            table[(a << 8) | b] = sp_high[a] | sp_low[b]
+    return table
+
+
+def _byte_tables(table):
+    # A 64-bit permutation as eight 256-entry tables, one per input byte
+    return [[_permute(v << (56 - 8 * i), table, 64) for v in range(256)] for i in range(8)]
+
+
+# The rotation (R >>> 3) puts S-box inputs 1, 3, 5, 7 in its byte lanes,
+# and (R <<< 1) puts S-box inputs 2, 4, 6, 8 there (1-based, as in FIPS).
+_SP_EVEN_HI, _SP_EVEN_LO = _pair_table(0, 2), _pair_table(4, 6)
+_SP_ODD_HI, _SP_ODD_LO = _pair_table(1, 3), _pair_table(5, 7)
+_IP_TABLES = _byte_tables(_IP)
+_FP_TABLES = _byte_tables(_FP)
+
+
+def _ip(x, t=_IP_TABLES):
+    return (t[0][x >> 56] | t[1][(x >> 48) & 255] | t[2][(x >> 40) & 255] | t[3][(x >> 32) & 255]
+            | t[4][(x >> 24) & 255] | t[5][(x >> 16) & 255] | t[6][(x >> 8) & 255] | t[7][x & 255])
+
+
+def _fp(x, t=_FP_TABLES):
+    return (t[0][x >> 56] | t[1][(x >> 48) & 255] | t[2][(x >> 40) & 255] | t[3][(x >> 32) & 255]
+            | t[4][(x >> 24) & 255] | t[5][(x >> 16) & 255] | t[6][(x >> 8) & 255] | t[7][x & 255])
+
+
+# ----------------- Key schedule -----------------
+def _round_keys(key8):
+    """The 16 round keys of one DES key, each as (even word, odd word)."""
+    cd = _permute(int.from_bytes(key8, 'big'), _PC1, 64)
+    c, d = cd >> 28, cd & 0xFFFFFFF
+    keys = []
+    for shift in _SHIFTS:
+        c = ((c << shift) | (c >> (28 - shift))) & 0xFFFFFFF
+        d = ((d << shift) | (d >> (28 - shift))) & 0xFFFFFFF
+        k = _permute((c << 28) | d, _PC2, 56)
+        groups = [(k >> (42 - 6 * i)) & 63 for i in range(8)]
+        even = (groups[0] << 24) | (groups[2] << 16) | (groups[4] << 8) | groups[6]
+        odd = (groups[1] << 24) | (groups[3] << 16) | (groups[5] << 8) | groups[7]
+        keys.append((even, odd))
+    return keys
+
+
+def _validate_key(key):
+    if not isinstance(key, (bytes, bytearray)):
+        raise ValueError("Key must be bytes.")
+    if len(key) not in KEY_SIZES:
+        raise ValueError("Key must be 8 bytes (DES), 16 or 24 bytes (3DES).")
+
+
+def _block_function(stages):
+    """
+    Returns crypt(block) for a sequence of 16-round stages (1 for DES, 3 for
+    3DES). Halves are swapped after every stage, which is what FP followed
+    by IP amounts to between the stages of 3DES.
+    """
+    # Rounds go in pairs, so the halves are updated in place and never
+    # swapped inside a stage. The rotated words are not masked to 32 bits:
+    # the lookups only read bits 0-29.
+    stages = [[(a[0], a[1], b[0], b[1]) for a, b in zip(stage[::2], stage[1::2])] for stage in stages]
+    eh, el, oh, ol = _SP_EVEN_HI, _SP_EVEN_LO, _SP_ODD_HI, _SP_ODD_LO
+    ip, fp = _ip, _fp
+
+    def crypt(block):
+        x = ip(block)
+        left, right = x >> 32, x & _MASK32
+        for pairs in stages:
+            for e1, o1, e2, o2 in pairs:
+                u = ((right >> 3) | (right << 29)) ^ e1
+                t = ((right << 1) | (right >> 31)) ^ o1
+                left ^= eh[(u >> 16) & 0x3F3F] | el[u & 0x3F3F] | oh[(t >> 16) & 0x3F3F] | ol[t & 0x3F3F]
+                u = ((left >> 3) | (left << 29)) ^ e2
+                t = ((left << 1) | (left >> 31)) ^ o2
+                right ^= eh[(u >> 16) & 0x3F3F] | el[u & 0x3F3F] | oh[(t >> 16) & 0x3F3F] | ol[t & 0x3F3F]
+            left, right = right, left
+        return fp((left << 32) | right)
+    return crypt
+
+
+@lru_cache(maxsize=KEY_CACHE_SIZE)
+def key_schedule(key):
+    """(encrypt, decrypt) block functions on 64-bit ints, cached per key."""
+    _validate_key(key)
+    key = bytes(key)
+    if len(key) == 16:
+        key += key[:8]
+    schedules = [_round_keys(key[i:i + 8]) for i in range(0, len(key), 8)]
+    if len(schedules) == 1:
+        encrypt = schedules
+        decrypt = [schedules[0][::-1]]
+    else:
+        k1, k2, k3 = schedules
+        encrypt = [k1, k2[::-1], k3]
+        decrypt = [k3[::-1], k2, k1[::-1]]
+    return _block_function(encrypt), _block_function(decrypt)
+
+
+# ----------------- Blocks and padding -----------------
+def _to_blocks(data):
+    if len(data) % BLOCK_SIZE:
+        raise ValueError("Data length must be a multiple of 8 bytes.")
+    return struct.unpack(f'>{len(data) // BLOCK_SIZE}Q', data)
+
+
+def _from_blocks(blocks):
+    return struct.pack(f'>{len(blocks)}Q', *blocks)
+
+
+def _xor(a, b):
+    return (int.from_bytes(a, 'big') ^ int.from_bytes(b, 'big')).to_bytes(len(a), 'big')
+
+
+def pad(data):
+    """PKCS#7 padding to a whole number of blocks."""
+    n = BLOCK_SIZE - len(data) % BLOCK_SIZE
+    return bytes(data) + bytes([n]) * n
+
+
+def unpad(data):
+    n = data[-1] if data else 0
+    if not 1 <= n <= BLOCK_SIZE or data[-n:] != bytes([n]) * n:
+        raise ValueError("Invalid padding (wrong key or corrupted data).")
+    return data[:-n]
+
+
+def _validate_iv(iv):
+    if len(iv) != BLOCK_SIZE:
+        raise ValueError("IV / nonce must be 8 bytes.")
+
+
+# ----------------- Modes -----------------
+def encrypt_block(block, key):
+    """One 8-byte block, no mode or padding."""
+    return key_schedule(bytes(key))[0](int.from_bytes(block, 'big')).to_bytes(8, 'big')
+
+
+def decrypt_block(block, key):
+    return key_schedule(bytes(key))[1](int.from_bytes(block, 'big')).to_bytes(8, 'big')
+
+
+def ecb_encrypt(data, key, padding=True):
+    crypt = key_schedule(bytes(key))[0]
+    return _from_blocks([crypt(b) for b in _to_blocks(pad(data) if padding else data)])
+
+
+def ecb_decrypt(data, key, padding=True):
+    _check_body(data, padding)
+    crypt = key_schedule(bytes(key))[1]
+    plain = _from_blocks([crypt(b) for b in _to_blocks(data)])
+    return unpad(plain) if padding else plain
+
+
+def cbc_encrypt(data, key, iv, padding=True):
+    _validate_iv(iv)
+    crypt = key_schedule(bytes(key))[0]
+    prev = int.from_bytes(iv, 'big')
+    out = []
+    for block in _to_blocks(pad(data) if padding else data):
+        prev = crypt(block ^ prev)
+        out.append(prev)
+    return _from_blocks(out)
+
+
+def _check_body(data, padding):
+    # A padded message always has at least one block
+    if padding and not data:
+        raise ValueError("Ciphertext too short: it holds no blocks.")
+
+
+def cbc_decrypt(data, key, iv, padding=True):
+    # Every block decrypts independently; the chaining is one buffer XOR
+    _validate_iv(iv)
+    _check_body(data, padding)
+    if not data:
+        return b""
+    crypt = key_schedule(bytes(key))[1]
+    decrypted = _from_blocks([crypt(b) for b in _to_blocks(data)])
+    plain = _xor(decrypted, bytes(iv) + bytes(data[:-BLOCK_SIZE]))
+    return unpad(plain) if padding else plain
+
+
+def ctr_keystream(key, nonce, length):
+    """Encrypted counter blocks nonce, nonce+1, ... (mod 2**64), cut to `length` bytes."""
+    _validate_iv(nonce)
+    crypt = key_schedule(bytes(key))[0]
+    start = int.from_bytes(nonce, 'big')
+    count = -(-length // BLOCK_SIZE)
+    return _from_blocks([crypt((start + i) & _MASK64) for i in range(count)])[:length]
+
+
+def ctr_crypt(data, key, nonce):
+    """CTR mode; the same call encrypts and decrypts. No padding."""
+    return _xor(bytes(data), ctr_keystream(key, nonce, len(data))) if data else b""
+
+
+def encrypt(data, key, mode="CBC"):
+    """
+    Encrypts bytes in `mode`. CBC and CTR use a fresh random IV / nonce,
+    which is prepended to the result.
+    """
+    if mode == "ECB":
+        return ecb_encrypt(data, key)
+    iv = secrets.token_bytes(BLOCK_SIZE)
+    if mode == "CBC":
+        return iv + cbc_encrypt(data, key, iv)
+    if mode == "CTR":
+        return iv + ctr_crypt(data, key, iv)
+    raise ValueError(f"Unknown mode '{mode}'. Choose from: {', '.join(MODES)}")
+
+
+def decrypt(blob, key, mode="CBC"):
+    if mode == "ECB":
+        return ecb_decrypt(blob, key)
+    if mode not in MODES:
+        raise ValueError(f"Unknown mode '{mode}'. Choose from: {', '.join(MODES)}")
+    if len(blob) < BLOCK_SIZE:
+        raise ValueError("Ciphertext is too short to hold the IV.")
+    iv, body = blob[:BLOCK_SIZE], blob[BLOCK_SIZE:]
+    if mode == "CBC":
+        return cbc_decrypt(body, key, iv)
+    return ctr_crypt(body, key, iv)
+
+
+def parse_key(text):
+    """
+    Key from user input: 16, 32 or 48 hex digits, or else 8, 16 or 24
+    characters taken as UTF-8 bytes.
+    """
+    text = text.strip()
+    if len(text) in (16, 32, 48):
+        try:
+            return bytes.fromhex(text)
+        except ValueError:
+            pass
+    key = text.encode('utf-8')
+    if len(key) not in KEY_SIZES:
+        raise ValueError("Key must be 8, 16 or 24 characters, or 16, 32 or 48 hex digits.")
+    return key
+
+
+if __name__ == "__main__":
+    sample = "Triple DES example".encode('utf-8')
+    key = bytes.fromhex("0123456789ABCDEF23456789ABCDEF01456789ABCDEF0123")
+    for mode in MODES:
+        blob = encrypt(sample, key, mode)
+        print(f"{mode}: {blob.hex().upper()} -> {decrypt(blob, key, mode).decode('utf-8')}")
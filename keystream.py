@@ -0,0 +1,35 @@
+"""
+Seeded keystream generator (a hash-based DRBG) and fast byte XOR.
+
+The stream is cut into fixed-size blocks and block i is
+SHAKE-256(seed || i), so any byte range can be produced directly without
+generating the bytes in front of it. This is what lets the bulk ciphers work
+chunk by chunk on large files.
+"""
+import hashlib
+
+BLOCK_SIZE = 1 << 16
+
+
+def _block(seed, index):
+    return hashlib.shake_256(seed + index.to_bytes(8, 'big')).digest(BLOCK_SIZE)
+
+
+def keystream(seed, length, offset=0):
+    """Returns `length` keystream bytes starting at byte `offset`."""
+    if length <= 0:
+        return b""
+    first = offset // BLOCK_SIZE
+    last = (offset + length - 1) // BLOCK_SIZE
+    data = b"".join(_block(seed, i) for i in range(first, last + 1))
+    start = offset - first * BLOCK_SIZE
+    return data[start:start + length]
+
+
+def xor_bytes(data, key):
+    """XORs `data` with the first len(data) bytes of `key`."""
+    size = len(data)
+    if len(key) < size:
+        raise ValueError("Key is shorter than the data.")
+    mixed = int.from_bytes(data, 'little') ^ int.from_bytes(key[:size], 'little')
+    return mixed.to_bytes(size, 'little')
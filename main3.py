@@ -6,6 +6,11 @@ from PySide6.QtGui import QFont, QIcon
 from PySide6.QtCore import Qt, QSize
 from rsa_widget import RSAPanel
 from railfence import encrypt_railfence, decrypt_railfence
+from block_cipher_widget import BlockCipherPanel
+from pipeline_widget import PipelinePanel
+import aes_cipher
+import des_cipher
+import multiplicative_cipher
 
 
 
@@ -30,7 +35,7 @@ class CryptoApp(QWidget):
 
         # ----------------- Buttons Algorithms -----------------
         self.buttons = {}
-        algos = ["Multiplicative", "OTP", "Rail Fence", "RSA", "DES", "AES ShiftRows"]
+        algos = ["Multiplicative", "OTP", "Rail Fence", "RSA", "DES", "AES ShiftRows", "Pipeline"]
         for name in algos:
             btn = QPushButton(name)
             btn.setFixedHeight(60)
@@ -220,6 +225,15 @@ class CryptoApp(QWidget):
             rsa_panel = RSAPanel()
             self.content_layout.addWidget(rsa_panel)
             return
+        if algo == "Pipeline":
+            self.content_layout.addWidget(PipelinePanel())
+            return
+        if algo == "DES":
+            self.content_layout.addWidget(BlockCipherPanel("DES / 3DES", des_cipher))
+            return
+        if algo == "AES ShiftRows":
+            self.content_layout.addWidget(BlockCipherPanel("AES", aes_cipher))
+            return
         header = QLabel(algo)
         header.setFont(QFont("Segoe UI", 30, QFont.Bold))
         header.setAlignment(Qt.AlignCenter)
@@ -245,6 +259,37 @@ class CryptoApp(QWidget):
         self.content_layout.addWidget(btn)
         self.content_layout.addWidget(output)
 
+        if algo == "Multiplicative":
+            mode.addItem("Brute force")
+            lang = QComboBox()
+            lang.addItems(["Auto", "ENGLISH", "ARABIC", "MIXED"])
+            self.content_layout.insertWidget(self.content_layout.indexOf(mode) + 1, lang)
+            btn.clicked.connect(lambda: self.run_multiplicative(mode, lang, input_text, key_text, output))
+
+    # ----------------- Multiplicative -----------------
+    def run_multiplicative(self, mode, lang, input_text, key_text, output):
+        text = input_text.toPlainText()
+        lang = None if lang.currentText() == "Auto" else lang.currentText()
+        try:
+            if mode.currentText() == "Brute force":
+                candidates = multiplicative_cipher.brute_force(text, lang)
+                output.setPlainText("\n\n".join(
+                    f"Key {c.key} (score {c.score:.2f}):\n{c.plaintext}" for c in candidates))
+                return
+            key = int(key_text.toPlainText().strip())
+            if mode.currentText() == "Encrypt":
+                result, used = multiplicative_cipher.encrypt(text, key, lang)
+            elif lang is None:
+                output.setPlainText("Error: choose the alphabet shown when the text was encrypted; "
+                                    "it cannot be detected from the ciphertext.")
+                return
+            else:
+                result, used = multiplicative_cipher.decrypt(text, key, lang)
+            inverse = multiplicative_cipher.inverse_key(key, used)
+            output.setPlainText(f"{result}\n\nAlphabet: {used}, key {key}, inverse key {inverse}")
+        except ValueError as err:
+            output.setPlainText(f"Error: {err}")
+
         
     def show_team_info(self):
         self.clear_layout()  # مسح المحتوى الحالي
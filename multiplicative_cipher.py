@@ -0,0 +1,148 @@
+"""
+Multiplicative cipher over the OTPLogic alphabets: the character at
+alphabet index i becomes the one at (i * key) % n.
+
+Each (alphabet, key) is turned into str.translate tables once (cached), so
+encrypting or decrypting a whole text is a single translate call. The
+decryption table uses the inverse key from rsa_logic.mod_inverse; a key is
+valid when it is coprime to the alphabet size. Characters outside the
+alphabet pass through unchanged, and Arabic letter variants are folded the
+same way OTPLogic folds them. encrypt detects the language unless one is
+given and returns it with the ciphertext; decrypt needs that language back.
+
+The OTPLogic alphabets repeat a few characters (Arabic alef, the digits in
+the mixed alphabet). A substitution must be one-to-one, so only the first
+occurrence of each character is kept here.
+
+brute_force tries every valid key without decrypting the text for each.
+A key only permutes the character counts, so each key is scored from the
+ciphertext histogram against unigram log-frequencies. Only the best keys
+are decrypted.
+"""
+from collections import Counter, namedtuple
+from functools import lru_cache
+from math import log
+
+from otp_logic import OTPLogic
+from rsa_logic import gcd, mod_inverse
+from sample_texts import ARABIC_SAMPLE, ENGLISH_SAMPLE
+
+TABLE_CACHE_SIZE = 256
+
+KeyCandidate = namedtuple("KeyCandidate", "key score plaintext")
+
+
+@lru_cache(maxsize=None)
+def cipher_alphabet(lang):
+    """The OTPLogic alphabet for `lang` without repeated characters."""
+    return "".join(dict.fromkeys(OTPLogic.ALPHABETS[lang]))
+
+
+def valid_keys(lang):
+    """Every key in 1..n-1 that has an inverse modulo the alphabet size."""
+    n = len(cipher_alphabet(lang))
+    return [k for k in range(1, n) if gcd(k, n) == 1]
+
+
+def _validate_key(key, n):
+    if not isinstance(key, int):
+        raise ValueError("Key must be an integer.")
+    if gcd(key % n, n) != 1:
+        raise ValueError(f"Key {key} has no inverse modulo {n}; it must be coprime to {n}.")
+
+
+@lru_cache(maxsize=TABLE_CACHE_SIZE)
+def translation_tables(lang, key):
+    """(encrypt, decrypt) str.translate tables for one language and key."""
+    alphabet = cipher_alphabet(lang)
+    n = len(alphabet)
+    _validate_key(key, n)
+    inverse = mod_inverse(key % n, n)
+    encrypt = {ord(ch): alphabet[(i * key) % n] for i, ch in enumerate(alphabet)}
+    decrypt = {ord(ch): alphabet[(i * inverse) % n] for i, ch in enumerate(alphabet)}
+    if lang == 'ARABIC':
+        for src, dst in OTPLogic.ARABIC_NORMALIZATION.items():
+            encrypt[src] = encrypt[ord(dst)]
+    return encrypt, decrypt
+
+
+def _language(text, lang):
+    if lang is None:
+        return OTPLogic.detect_language(text)
+    if lang not in OTPLogic.ALPHABETS:
+        raise ValueError(f"Unknown language '{lang}'.")
+    return lang
+
+
+def encrypt(text, key, lang=None):
+    """Returns (ciphertext, lang); the language is detected unless given."""
+    lang = _language(text, lang)
+    return text.translate(translation_tables(lang, key)[0]), lang
+
+
+def decrypt(cipher, key, lang):
+    """
+    Returns (plaintext, lang). `lang` must be the alphabet encrypt reported:
+    the ciphertext of mixed text can look like another language, so it is
+    not detected here.
+    """
+    if lang is None:
+        raise ValueError("Decrypting needs the alphabet used to encrypt (ENGLISH, ARABIC or MIXED).")
+    lang = _language(cipher, lang)
+    return cipher.translate(translation_tables(lang, key)[1]), lang
+
+
+def inverse_key(key, lang):
+    n = len(cipher_alphabet(lang))
+    _validate_key(key, n)
+    return mod_inverse(key % n, n)
+
+
+# ----------------- Brute force -----------------
+@lru_cache(maxsize=None)
+def _log_frequencies(lang):
+    # Unigram log-probabilities from the built-in sample texts; capitals are
+    # counted as a twentieth of their lower-case letter
+    counts = Counter(ENGLISH_SAMPLE + ARABIC_SAMPLE)
+    for ch in ENGLISH_SAMPLE:
+        counts[ch.upper()] += 0.05
+    alphabet = cipher_alphabet(lang)
+    weights = {ch: counts[ch] + 0.5 for ch in alphabet}
+    total = sum(weights.values())
+    return {ch: log(w / total) for ch, w in weights.items()}
+
+
+def brute_force(cipher, lang=None, top=5):
+    """
+    Tries every valid key. Returns the `top` candidates (all when top is
+    None) as (key, score, plaintext), best first, where the score is the
+    mean unigram log-probability of the alphabet characters.
+    """
+    lang = _language(cipher, lang)
+    alphabet = cipher_alphabet(lang)
+    n = len(alphabet)
+    index = {ch: i for i, ch in enumerate(alphabet)}
+    freqs = _log_frequencies(lang)
+
+    # Histogram of the ciphertext over alphabet indices, computed once
+    counts = [(index[ch], c) for ch, c in Counter(cipher).items() if ch in index]
+    total = sum(c for _, c in counts) or 1
+    scored = []
+    for key in valid_keys(lang):
+        inverse = mod_inverse(key, n)
+        score = sum(c * freqs[alphabet[(i * inverse) % n]] for i, c in counts) / total
+        scored.append((score, key))
+    scored.sort(key=lambda item: -item[0])
+
+    if top is not None:
+        scored = scored[:top]
+    return [KeyCandidate(key, score, decrypt(cipher, key, lang)[0]) for score, key in scored]
+
+
+if __name__ == "__main__":
+    sample = "Multiplicative Cipher Example"
+    cipher, lang = encrypt(sample, 7)
+    print(f"Plaintext : {sample}")
+    print(f"Encrypted : {cipher} ({lang}, key 7, inverse {inverse_key(7, lang)})")
+    print(f"Decrypted : {decrypt(cipher, 7, lang)[0]}")
+    print(f"Best guess: {brute_force(cipher, lang, top=1)[0]}")
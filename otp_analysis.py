@@ -0,0 +1,303 @@
+"""
+Many-time-pad analysis: recovering plaintext and key when one OTP key was
+used for several messages.
+
+For ciphertexts c_i = (p_i + k) mod n produced by OTPLogic.encrypt with the
+same key, every column (position) shares one key index, and the pairwise
+differences (c_i - c_j) mod n = (p_i - p_j) mod n do not depend on the key
+at all. ManyTimePad loads N ciphertexts into an N x L matrix of alphabet
+indices and works on it with NumPy:
+
+- column_scores gives, for every position and key guess, the summed
+  log-frequency of what that guess decrypts all N messages to. Scoring a
+  guess against every message at once covers all N^2 pairwise differences
+  in O(N) per column; it is computed from per-column histograms with one
+  matrix product per block of positions;
+- solve_key picks the best key index per column (frequency analysis);
+- crib_drag slides a known word along every message and ranks placements
+  by how plausible the key they imply makes all the other messages;
+- drag_pair is the classic two-message crib drag on a single difference;
+- apply_crib / plaintexts / key_text turn findings into partial plaintext
+  and key, with unknown positions marked.
+
+Characters outside the alphabet pass through OTPLogic unencrypted, so they
+show up as-is in the ciphertext and are known plaintext for free.
+
+NumPy is required for this module.
+"""
+from collections import Counter, namedtuple
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+from otp_logic import OTPLogic, _code_points
+
+BLOCK = 1 << 16
+CRIB_CELLS = 1 << 22
+UNKNOWN = '_'
+
+CribHit = namedtuple("CribHit", "message offset score")
+PairHit = namedtuple("PairHit", "offset score fragment")
+
+# Approximate letter frequencies in percent, used when no corpus is given
+ENGLISH_FREQUENCIES = {
+    'e': 12.70, 't': 9.06, 'a': 8.17, 'o': 7.51, 'i': 6.97, 'n': 6.75, 's': 6.33,
+    'h': 6.09, 'r': 5.99, 'd': 4.25, 'l': 4.03, 'c': 2.78, 'u': 2.76, 'm': 2.41,
+    'w': 2.36, 'f': 2.23, 'g': 2.02, 'y': 1.97, 'p': 1.93, 'b': 1.29, 'v': 0.98,
+    'k': 0.77, 'j': 0.15, 'x': 0.15, 'q': 0.10, 'z': 0.07,
+}
+ARABIC_FREQUENCIES = {
+    'ا': 12.4, 'ل': 11.0, 'ي': 6.7, 'م': 6.2, 'و': 5.8, 'ن': 5.7, 'ه': 5.0,
+    'ر': 4.7, 'ب': 4.2, 'ع': 3.8, 'ت': 3.6, 'ف': 3.0, 'د': 3.0, 'س': 2.7,
+    'ك': 2.6, 'ق': 2.4, 'ح': 2.1, 'ج': 1.4, 'ش': 1.0, 'ص': 1.0, 'ط': 0.9,
+    'خ': 0.8, 'ذ': 0.8, 'ث': 0.6, 'ض': 0.6, 'ز': 0.5, 'غ': 0.4, 'ظ': 0.2,
+}
+UPPERCASE_WEIGHT = 0.08
+DIGIT_FREQUENCY = 0.1
+
+
+def frequency_model(alphabet, corpus=None):
+    """
+    Log-probability of each plaintext index of `alphabet`, either counted
+    from `corpus` or from the built-in tables. Indices that OTPLogic never
+    produces for plaintext (repeated alphabet characters) get a tiny weight.
+    """
+    table = OTPLogic.INDEX_TABLES[alphabet]
+    n = len(alphabet)
+    weights = np.full(n, 1e-3)
+    if corpus is not None:
+        for ch, count in Counter(corpus).items():
+            i = table.get(ch)
+            if i is not None:
+                weights[i] += count
+    else:
+        for i, ch in enumerate(alphabet):
+            if table[ch] != i:
+                continue
+            if ch.isdigit():
+                weights[i] = DIGIT_FREQUENCY
+            elif ch in ENGLISH_FREQUENCIES:
+                weights[i] = ENGLISH_FREQUENCIES[ch]
+            elif ch.lower() in ENGLISH_FREQUENCIES:
+                weights[i] = ENGLISH_FREQUENCIES[ch.lower()] * UPPERCASE_WEIGHT
+            elif ch in ARABIC_FREQUENCIES:
+                weights[i] = ARABIC_FREQUENCIES[ch]
+    return np.log(weights / weights.sum()).astype(np.float32)
+
+
+class ManyTimePad:
+    def __init__(self, ciphers, lang=None, model=None):
+        if lang is None:
+            # Same detection decrypt() would use, over a sample of every message
+            lang = OTPLogic.detect_language("".join(c[:OTPLogic.DETECT_SAMPLE_SIZE] for c in ciphers))
+        self.lang = lang
+        self.alphabet = OTPLogic.ALPHABETS[lang]
+        self.n = n = len(self.alphabet)
+        self.ciphers = list(ciphers)
+        self.length = max(map(len, self.ciphers), default=0)
+        self.model = frequency_model(self.alphabet) if model is None else model
+
+        # N x L alphabet indices; n marks pass-through characters and padding
+        lut, _ = OTPLogic._vector_tables(self.alphabet)
+        last = len(lut) - 1
+        self.matrix = np.full((len(self.ciphers), self.length), n, dtype=np.uint8)
+        for row, cipher in zip(self.matrix, self.ciphers):
+            row[:len(cipher)] = lut[np.minimum(_code_points(cipher), last)]
+
+        # Key index per position, -1 while unknown
+        self.key = np.full(self.length, -1, dtype=np.int16)
+
+        # score_matrix[c, k]: log-frequency of decrypting index c with key k
+        c = np.arange(n)[:, None]
+        k = np.arange(n)[None, :]
+        self._score_matrix = np.zeros((n + 1, n), dtype=np.float32)
+        self._score_matrix[:n] = self.model[(c - k) % n]
+
+    # ----------------- Column statistics -----------------
+    def column_counts(self, start, end):
+        """Histogram of cipher indices per position, shape (end-start, n+1)."""
+        width = self.n + 1
+        block = self.matrix[:, start:end].astype(np.int64)
+        flat = (np.arange(end - start) * width)[None, :] + block
+        counts = np.bincount(flat.ravel(), minlength=(end - start) * width)
+        return counts.reshape(end - start, width).astype(np.float32)
+
+    def column_scores(self, start, end):
+        """
+        (scores, messages): scores[pos, k] is the total log-frequency of
+        the plaintexts that key index k gives at that position, over all
+        messages; messages[pos] is how many messages take part.
+        """
+        counts = self.column_counts(start, end)
+        return counts @ self._score_matrix, counts[:, :self.n].sum(axis=1)
+
+    def solve_key(self, min_messages=2, overwrite=False):
+        """
+        Sets every position seen in at least `min_messages` messages to its
+        best-scoring key index. Returns the number of positions set.
+        """
+        solved = 0
+        for start in range(0, self.length, BLOCK):
+            end = min(start + BLOCK, self.length)
+            scores, messages = self.column_scores(start, end)
+            best = scores.argmax(axis=1).astype(np.int16)
+            update = messages >= min_messages
+            if not overwrite:
+                update &= self.key[start:end] < 0
+            self.key[start:end][update] = best[update]
+            solved += int(update.sum())
+        return solved
+
+    # ----------------- Crib dragging -----------------
+    def _crib(self, crib):
+        table = OTPLogic.INDEX_TABLES[self.alphabet]
+        return np.array([table.get(ch, self.n) for ch in crib], dtype=np.int16)
+
+    def crib_drag(self, crib, messages=None, top=20):
+        """
+        Tries `crib` at every offset of every message (or the given message
+        numbers). A placement fixes the key under it; it is scored by the
+        average log-frequency that key gives all messages there. Returns the
+        `top` placements, best first.
+        """
+        m = len(crib)
+        if m == 0 or m > self.length:
+            return []
+        rows = np.arange(len(self.ciphers)) if messages is None else np.asarray(messages)
+        crib_idx = self._crib(crib)
+        in_alphabet = crib_idx < self.n
+        hits = []
+
+        # Column lookup per crib char: entry c is the score of the key that
+        # cipher index c implies, -inf where no key fits (c == n for an
+        # alphabet char, anything but a pass-through for the others)
+        n = self.n
+        c = np.arange(n + 1)
+        lookups = [(c - crib_idx[t]) % n if in_alphabet[t] else None for t in range(m)]
+
+        step = max(256, min(BLOCK, CRIB_CELLS // len(rows)))
+        threshold = -np.inf
+        for start in range(0, self.length - m + 1, step):
+            end = min(start + step, self.length - m + 1)
+            width = end - start
+            scores, counts = self.column_scores(start, end + m - 1)
+            scores /= np.maximum(counts, 1)[:, None]
+            block = self.matrix[rows, start:end + m - 1].astype(np.intp)
+
+            total = np.zeros((len(rows), width), dtype=np.float32)
+            for t in range(m):
+                table = np.full((width, n + 1), -np.inf, dtype=np.float32)
+                if in_alphabet[t]:
+                    table[:, :n] = scores[t:t + width, lookups[t][:n]]
+                else:
+                    table[:, n] = 0
+                cells = block[:, t:t + width] + np.arange(width) * (n + 1)
+                total += table.ravel().take(cells)
+            if not in_alphabet.all():
+                total[~self._verbatim_matches(crib, rows, start, end)] = -np.inf
+
+            # Only placements that can still make the top list are ranked
+            r, o = np.nonzero(total > threshold)
+            if len(r) > top:
+                keep = np.argpartition(total[r, o], -top)[-top:]
+                r, o = r[keep], o[keep]
+            hits.extend(CribHit(int(rows[i]), start + int(j), float(total[i, j]) / m)
+                        for i, j in zip(r, o) if np.isfinite(total[i, j]))
+            hits = sorted(hits, key=lambda hit: -hit.score)[:top]
+            if len(hits) == top:
+                threshold = hits[-1].score * m
+
+        return hits
+
+    def _verbatim_matches(self, crib, rows, start, end):
+        # Pass-through crib chars compared by code point, one block at a time
+        m = len(crib)
+        crib_cp = np.array([ord(ch) for ch in crib], dtype='<u4')
+        fixed = np.array([ch not in OTPLogic.INDEX_TABLES[self.alphabet] for ch in crib])
+        result = np.zeros((len(rows), end - start), dtype=bool)
+        for r, row in enumerate(rows):
+            segment = self.ciphers[row][start:end + m - 1]
+            if len(segment) < m:
+                continue
+            windows = sliding_window_view(_code_points(segment), m)
+            result[r, :len(windows)] = (windows[:, fixed] == crib_cp[fixed]).all(axis=1)
+        return result
+
+    def differences(self, i, j):
+        """(c_i - c_j) mod n = (p_i - p_j) mod n; n where either char is not encrypted."""
+        a = self.matrix[i].astype(np.int16)
+        b = self.matrix[j].astype(np.int16)
+        diff = (a - b) % self.n
+        diff[(a == self.n) | (b == self.n)] = self.n
+        return diff
+
+    def drag_pair(self, i, j, crib, top=20):
+        """
+        Classic crib drag on one pair: assuming message i reads `crib` at an
+        offset gives message j's text there, without touching the key.
+        Fragment positions that cannot be worked out are UNKNOWN.
+        """
+        m = len(crib)
+        if m == 0 or m > self.length:
+            return []
+        crib_idx = self._crib(crib)
+        in_alphabet = crib_idx < self.n
+        if not in_alphabet.any():
+            return []
+
+        windows = sliding_window_view(self.differences(i, j), m)
+        other = (crib_idx - windows) % self.n
+        scores = self.model[other][:, in_alphabet].mean(axis=1)
+        # Where the crib is encrypted both messages must be too; elsewhere
+        # message i must show the crib char verbatim
+        own = sliding_window_view(self.matrix[i], m)
+        valid = ((own < self.n) == in_alphabet).all(axis=1)
+        valid &= (windows[:, in_alphabet] < self.n).all(axis=1)
+        if not in_alphabet.all():
+            valid &= self._verbatim_matches(crib, [i], 0, self.length - m + 1)[0]
+        scores[~valid] = -np.inf
+
+        count = min(top, len(scores))
+        best = np.argpartition(scores, -count)[-count:]
+        best = best[np.argsort(-scores[best])]
+        cipher = self.ciphers[j]
+        hits = []
+        for o in best:
+            if not np.isfinite(scores[o]):
+                continue
+            fragment = []
+            for t in range(m):
+                if in_alphabet[t]:
+                    fragment.append(self.alphabet[other[o, t]])
+                elif o + t < len(cipher) and self.matrix[j, o + t] == self.n:
+                    fragment.append(cipher[o + t])
+                else:
+                    fragment.append(UNKNOWN)
+            hits.append(PairHit(int(o), float(scores[o]), "".join(fragment)))
+        return hits
+
+    # ----------------- Recovery -----------------
+    def apply_crib(self, message, offset, crib):
+        """Fixes the key under `crib` placed in `message` at `offset`."""
+        crib_idx = self._crib(crib)
+        cipher = self.matrix[message, offset:offset + len(crib)].astype(np.int16)
+        known = (crib_idx < self.n) & (cipher < self.n)
+        self.key[offset:offset + len(crib)][known] = ((cipher - crib_idx) % self.n)[known]
+
+    def plaintexts(self, unknown=UNKNOWN):
+        """Every message decrypted with the key known so far."""
+        alphabet_cp = np.array([ord(ch) for ch in self.alphabet] + [ord(unknown)], dtype='<u4')
+        key = self.key.astype(np.int16)
+        results = []
+        for row, cipher in zip(self.matrix, self.ciphers):
+            size = len(cipher)
+            idx = row[:size].astype(np.int16)
+            plain = np.where(key[:size] < 0, self.n, (idx - key[:size]) % self.n)
+            out = alphabet_cp[plain]
+            passthrough = idx == self.n
+            out[passthrough] = _code_points(cipher)[passthrough]
+            results.append(out.tobytes().decode('utf-32-le', 'surrogatepass'))
+        return results
+
+    def key_text(self, unknown=UNKNOWN):
+        return "".join(unknown if k < 0 else self.alphabet[k] for k in self.key.tolist())
@@ -0,0 +1,183 @@
+"""
+Byte-level One-Time Pad: data XOR pad bytes, for arbitrary binary files.
+
+Unlike OTPLogic, which only maps characters of a fixed alphabet, every byte
+is encrypted here. Files are mmap'd and XORed chunk by chunk straight
+between the mapped buffers (NumPy when available, otherwise big-int XOR
+over memoryviews), so nothing is decoded or copied through Python objects.
+Pad consumption is tracked with the same PadLedger as the text stream
+mode; for byte pads its chars and bytes counts are equal.
+
+encrypt_file writes a small binary header (BYTE_MAGIC and the pad offset
+the body was XORed at) in front of the body, and decrypt_file XORs with the
+pad bytes at that offset without touching the ledger. xor_file is the raw,
+headerless operation underneath, for callers that track offsets themselves.
+"""
+import mmap
+import os
+import secrets
+import struct
+from collections import namedtuple
+
+import keystream
+from otp_stream import PadLedger, PadPosition
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; keystream.xor_bytes covers everything
+    np = None
+
+CHUNK_SIZE = 1 << 24
+BYTE_MAGIC = b"OTP-XOR1"
+HEADER = struct.Struct("<8sQ")  # magic, pad offset of the first body byte
+
+XorResult = namedtuple("XorResult", "start end size")
+
+
+def xor_into(out, data, key):
+    """
+    XORs `data` with `key` into the writable buffer `out`, which may be
+    `data` itself for in-place operation. `out` has the length of `data`;
+    `key` may be longer.
+    """
+    if not len(data) <= len(key):
+        raise ValueError("Key is shorter than the data.")
+    if np is not None:
+        np.bitwise_xor(np.frombuffer(data, dtype=np.uint8),
+                       np.frombuffer(key, dtype=np.uint8, count=len(data)),
+                       out=np.frombuffer(out, dtype=np.uint8))
+    else:
+        out[:] = keystream.xor_bytes(data, key)
+
+
+def xor_bytes(data, key):
+    """Returns data XOR key as a new bytearray."""
+    out = bytearray(len(data))
+    xor_into(out, data, key)
+    return out
+
+
+def generate_pad_file(path, size, chunk_size=CHUNK_SIZE):
+    """Writes `size` bytes from the OS CSPRNG to `path`."""
+    with open(path, 'wb') as f:
+        written = 0
+        while written < size:
+            part = min(chunk_size, size - written)
+            f.write(secrets.token_bytes(part))
+            written += part
+
+
+def _map(f, access):
+    size = os.fstat(f.fileno()).st_size
+    # mmap cannot map empty files; an empty buffer behaves the same here
+    return mmap.mmap(f.fileno(), 0, access=access) if size else bytearray()
+
+
+def _xor_mapped(src_path, pad_path, dst_path, position, skip=0, prefix=b"",
+                chunk_size=CHUNK_SIZE):
+    """
+    XORs src_path from byte `skip` on with pad_path from byte `position` on.
+    The result goes after `prefix` into a temporary file that replaces
+    dst_path on success (dst_path may be src_path), or in place when
+    dst_path is None. Returns the number of bytes XORed.
+    """
+    size = os.path.getsize(src_path) - skip
+    if position + size > os.path.getsize(pad_path):
+        raise ValueError(f"Pad exhausted: {size} bytes needed at offset {position}, "
+                         f"pad has {os.path.getsize(pad_path)}.")
+
+    in_place = dst_path is None
+    tmp_path = None if in_place else dst_path + ".tmp"
+    try:
+        with open(pad_path, 'rb') as pad_file, \
+                open(src_path, 'r+b' if in_place else 'rb') as src_file:
+            pad = _map(pad_file, mmap.ACCESS_READ)
+            src = _map(src_file, mmap.ACCESS_WRITE if in_place else mmap.ACCESS_READ)
+            maps = [pad, src]
+            if in_place:
+                dst = src
+            else:
+                dst_file = open(tmp_path, 'w+b')
+                dst_file.truncate(len(prefix) + size)
+                dst = _map(dst_file, mmap.ACCESS_WRITE)
+                dst[:len(prefix)] = prefix
+                maps.append(dst)
+            try:
+                src_view = memoryview(src)[skip:]
+                dst_view = memoryview(dst)[len(prefix):]
+                pad_view = memoryview(pad)
+                for start in range(0, size, chunk_size):
+                    end = min(start + chunk_size, size)
+                    xor_into(dst_view[start:end], src_view[start:end],
+                             pad_view[position + start:position + end])
+                # The maps cannot be closed while views into them exist
+                src_view.release()
+                dst_view.release()
+                pad_view.release()
+            finally:
+                for buf in maps:
+                    if isinstance(buf, mmap.mmap):
+                        buf.close()
+                if not in_place:
+                    dst_file.close()
+        if not in_place:
+            os.replace(tmp_path, dst_path)
+    except Exception:
+        if tmp_path is not None and os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return size
+
+
+def _ledger_position(pad_path, ledger, position):
+    if position is None:
+        if ledger is None:
+            ledger = PadLedger(pad_path)
+        position = ledger.position.bytes
+    return ledger, position
+
+
+def xor_file(src_path, pad_path, dst_path=None, ledger=None, position=None,
+             chunk_size=CHUNK_SIZE):
+    """
+    XORs src_path with bytes of pad_path into dst_path, or in place when
+    dst_path is None (an interrupted in-place run leaves the file partly
+    transformed). Encryption and decryption are the same operation, so to
+    undo a run pass the `position` it started at.
+
+    By default the pad is consumed from where its ledger left off and the
+    ledger is advanced; pass `position` (a byte offset) to bypass it.
+    """
+    ledger, position = _ledger_position(pad_path, ledger, position)
+    size = _xor_mapped(src_path, pad_path, dst_path, position, chunk_size=chunk_size)
+    end = position + size
+    if ledger is not None:
+        ledger.commit(PadPosition(end, end))
+    return XorResult(position, end, size)
+
+
+def encrypt_file(src_path, dst_path, pad_path, ledger=None, position=None,
+                 chunk_size=CHUNK_SIZE):
+    """
+    Like xor_file into dst_path, with a header recording the pad offset so
+    that decrypt_file needs nothing but the pad.
+    """
+    ledger, position = _ledger_position(pad_path, ledger, position)
+    size = _xor_mapped(src_path, pad_path, dst_path, position,
+                       prefix=HEADER.pack(BYTE_MAGIC, position), chunk_size=chunk_size)
+    end = position + size
+    if ledger is not None:
+        ledger.commit(PadPosition(end, end))
+    return XorResult(position, end, size)
+
+
+def decrypt_file(src_path, dst_path, pad_path, chunk_size=CHUNK_SIZE):
+    """Decrypts encrypt_file output with the pad offset from its header; the ledger is left untouched."""
+    with open(src_path, 'rb') as f:
+        header = f.read(HEADER.size)
+    if len(header) < HEADER.size or header[:len(BYTE_MAGIC)] != BYTE_MAGIC:
+        raise ValueError("Not byte OTP output (missing OTP-XOR1 header).")
+    _, position = HEADER.unpack(header)
+    size = _xor_mapped(src_path, pad_path, dst_path, position, skip=HEADER.size,
+                       chunk_size=chunk_size)
+    return XorResult(position, position + size, size)
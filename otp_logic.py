@@ -0,0 +1,323 @@
+import secrets
+from collections import Counter
+from collections.abc import Sequence
+from functools import lru_cache
+from itertools import repeat
+from operator import getitem
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; the table-driven path covers everything
+    np = None
+
+# Inputs at least this long go through the NumPy backend when it is available.
+VECTOR_THRESHOLD = 1 << 15
+
+
+def _code_point_lut(table, n):
+    # code point -> alphabet index; the last slot (and anything clamped onto
+    # it) is n, meaning "not in alphabet"
+    lut = np.full(max(map(ord, table)) + 2, n, dtype=np.int16)
+    for ch, i in table.items():
+        lut[ord(ch)] = i
+    return lut
+
+
+def _code_points(text):
+    return np.frombuffer(text.encode('utf-32-le', 'surrogatepass'), dtype='<u4')
+
+
+def _index_table(alphabet, normalization=None):
+    # char -> first index, the same answer alphabet.index() gives. Characters
+    # folded by the normalization table share the index of their target.
+    table = {}
+    for i, ch in enumerate(alphabet):
+        table.setdefault(ch, i)
+    for src, dst in (normalization or {}).items():
+        table[chr(src)] = table[dst]
+    return table
+
+
+# ----------------- Step Records -----------------
+class OTPSteps(Sequence):
+    """
+    Columnar step records for the visualizer. The text, key and result are
+    kept as the strings they already are, plus one byte per character for
+    the text and key alphabet indices, where index n flags an ignored
+    character. Row tuples and equation strings are only built when a row is
+    read, i.e. when the visualizer displays it.
+    """
+
+    def __init__(self, text, key, result, text_idx, key_idx, n, op):
+        self.text = text
+        self.key = key
+        self.result = result
+        self.text_idx = text_idx
+        self.key_idx = key_idx
+        self.n = n
+        self.op = op
+
+    def __len__(self):
+        return len(self.text_idx)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        return self.text[i], self.key[i], self.result[i], self.equation(i)
+
+    def is_ignored(self, i):
+        return self.text_idx[i] == self.n or self.key_idx[i] == self.n
+
+    def equation(self, i):
+        t = self.text_idx[i]
+        k = self.key_idx[i]
+        n = self.n
+        if t == n or k == n:
+            return "Ignored"
+        r = (t + k) % n if self.op == '+' else (t - k) % n
+        return f"({t}{self.op}{k})%{n}={r}"
+
+
+# ----------------- Logic Class -----------------
+class OTPLogic:
+    # ----------------- الأبجدية -----------------
+    ENGLISH_ALPHABET = "abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789"
+
+    # تم التعديل هنا: إضافة الأرقام الإنجليزية (0-9) للأبجدية العربية
+    # لضمان عمل المفاتيح التي تحتوي على أرقام إنجليزية مع النصوص العربية
+    ARABIC_ALPHABET = "ابتثجحخدذرزسشصضطظعغفقكلمنهويا٠١٢٣٤٥٦٧٨٩0123456789"
+
+    MIXED_ALPHABET = ENGLISH_ALPHABET + ARABIC_ALPHABET
+
+    ALPHABETS = {'ENGLISH': ENGLISH_ALPHABET, 'ARABIC': ARABIC_ALPHABET, 'MIXED': MIXED_ALPHABET}
+
+    # ----------------- جدول التوحيد -----------------
+    ARABIC_NORMALIZATION = str.maketrans({
+        'أ': 'ا', 'إ': 'ا', 'آ': 'ا', 'ى': 'ي', 'ة': 'ه', 'ؤ': 'و', 'ئ': 'ي',
+    })
+
+    # ----------------- جداول الفهارس -----------------
+    # Built once per alphabet so the hot loops never scan the alphabet string.
+    # Arabic text is only ever matched against the Arabic alphabet, so its
+    # normalization is folded into that table instead of being a separate pass.
+    INDEX_TABLES = {
+        ENGLISH_ALPHABET: _index_table(ENGLISH_ALPHABET),
+        ARABIC_ALPHABET: _index_table(ARABIC_ALPHABET, ARABIC_NORMALIZATION),
+        MIXED_ALPHABET: _index_table(MIXED_ALPHABET),
+    }
+    _IDENTITY = {
+        alphabet: {ch: ch for ch in alphabet}
+        for alphabet in (ENGLISH_ALPHABET, ARABIC_ALPHABET, MIXED_ALPHABET)
+    }
+
+    # ----------------- توحيد النصوص -----------------
+    @staticmethod
+    def _normalize_text(text, lang):
+        if lang == 'ARABIC':
+            text = text.translate(OTPLogic.ARABIC_NORMALIZATION)
+        return text
+
+    # ----------------- كشف اللغة -----------------
+    # Texts up to DETECT_SAMPLE_SIZE chars are counted exactly; longer ones
+    # through DETECT_WINDOWS evenly spaced windows of the same total size.
+    DETECT_SAMPLE_SIZE = 4096
+    DETECT_WINDOWS = 16
+
+    @staticmethod
+    def _detection_windows(text):
+        size = OTPLogic.DETECT_SAMPLE_SIZE
+        count = OTPLogic.DETECT_WINDOWS
+        if len(text) <= size:
+            return [text]
+        width = size // count
+        stride = (len(text) - width) // (count - 1)
+        return [text[i * stride:i * stride + width] for i in range(count)]
+
+    @staticmethod
+    def detect_language(text):
+        windows = OTPLogic._detection_windows(text)
+        remaining = sum(map(len, windows))
+        arabic_count = 0
+        english_count = 0
+
+        # One counting pass; stop once the rest can no longer change the result
+        for window in windows:
+            for c, count in Counter(window).items():
+                if '\u0600' <= c <= '\u06FF':
+                    arabic_count += count
+                elif c.isalpha() and 'a' <= c.lower() <= 'z':
+                    english_count += count
+            remaining -= len(window)
+            if arabic_count > (english_count + remaining) * 0.5:
+                break
+            if arabic_count + remaining <= english_count * 0.5:
+                break
+
+        if arabic_count > english_count * 0.5:
+            return 'ARABIC'
+        elif english_count > arabic_count * 0.5:
+            return 'ENGLISH'
+        else:
+            return 'MIXED'
+
+    # ----------------- اختيار الأبجدية -----------------
+    @staticmethod
+    def _get_alphabet(text, lang=None):
+        # Callers that already know the language pass it and skip detection
+        if lang is None:
+            lang = OTPLogic.detect_language(text)
+        if lang == 'ARABIC':
+            return OTPLogic.ARABIC_ALPHABET, lang
+        elif lang == 'ENGLISH':
+            return OTPLogic.ENGLISH_ALPHABET, lang
+        else:
+            return OTPLogic.MIXED_ALPHABET, lang
+
+    # ----------------- توليد مفتاح عشوائي -----------------
+    @staticmethod
+    def generate_key(length, text, pool=None, lang=None):
+        alphabet, lang = OTPLogic._get_alphabet(text, lang)
+        if pool is not None and pool.alphabet == alphabet:
+            return pool.take(length)
+        return OTPLogic.random_key(length, alphabet)
+
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def _sampling_tables(alphabet):
+        # Bytes at or above `limit` are rejected so that b % n stays uniform
+        n = len(alphabet)
+        limit = 256 - 256 % n
+        to_index = bytes(b % n for b in range(256))
+        rejected = bytes(range(limit, 256))
+        return limit, to_index, rejected, list(alphabet)
+
+    @staticmethod
+    def random_indices(length, alphabet, randbytes=secrets.token_bytes):
+        """
+        `length` uniformly random alphabet indices (one byte each), drawn from
+        the OS CSPRNG in bulk and rejection-sampled with bytes.translate.
+        """
+        limit, to_index, rejected, _ = OTPLogic._sampling_tables(alphabet)
+        parts = []
+        have = 0
+        while have < length:
+            need = length - have
+            raw = randbytes(need * 256 // limit + 64)
+            part = raw.translate(to_index, rejected)[:need]
+            parts.append(part)
+            have += len(part)
+        return b"".join(parts)
+
+    @staticmethod
+    def indices_to_text(indices, alphabet):
+        if np is not None and len(indices) >= VECTOR_THRESHOLD:
+            _, alphabet_cp = OTPLogic._vector_tables(alphabet)
+            cps = alphabet_cp[np.frombuffer(indices, dtype=np.uint8)]
+            return cps.tobytes().decode('utf-32-le')
+        _, _, _, chars = OTPLogic._sampling_tables(alphabet)
+        return indices.decode('latin-1').translate(chars)
+
+    @staticmethod
+    def random_key(length, alphabet):
+        return OTPLogic.indices_to_text(OTPLogic.random_indices(length, alphabet), alphabet)
+
+    # ----------------- جداول النتائج -----------------
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def _result_table(alphabet, op):
+        """
+        Result char for every (text index, key index) pair, as rows[t][k].
+        Index n stands for "not in alphabet"; its entries are None.
+        """
+        n = len(alphabet)
+        sign = 1 if op == '+' else -1
+        rows = []
+        for t in range(n + 1):
+            rows.append([None if t == n or k == n else alphabet[(t + sign * k) % n]
+                         for k in range(n + 1)])
+        return rows
+
+    @staticmethod
+    def _transform(text, key, alphabet, op, trace=True):
+        """
+        Returns (result, steps). With trace=False no step records are kept
+        and steps is None.
+        """
+        if np is not None and len(text) >= VECTOR_THRESHOLD:
+            return OTPLogic._transform_vectorized(text, key, alphabet, op, trace)
+        return OTPLogic._transform_scalar(text, key, alphabet, op, trace)
+
+    @staticmethod
+    def _transform_scalar(text, key, alphabet, op, trace=True):
+        # Every per-character step below is a C-level map over lookup tables;
+        # there is no Python loop body per character.
+        n = len(alphabet)
+        table = OTPLogic.INDEX_TABLES[alphabet]
+        chars = OTPLogic._result_table(alphabet, op)
+        keep = OTPLogic._IDENTITY[alphabet]
+
+        key = key[:len(text)]
+        text_idx = bytes(map(table.get, text, repeat(n)))
+        key_idx = bytes(map(table.get, key, repeat(n)))
+
+        # Ignored positions come back as None and fall through to the original char
+        results = map(getitem, map(chars.__getitem__, text_idx), key_idx)
+        result = "".join(map(keep.get, results, text))
+        if not trace:
+            return result, None
+        return result, OTPSteps(text, key, result, text_idx, key_idx, n, op)
+
+    @staticmethod
+    @lru_cache(maxsize=None)
+    def _vector_tables(alphabet):
+        lut = _code_point_lut(OTPLogic.INDEX_TABLES[alphabet], len(alphabet))
+        return lut, np.array([ord(ch) for ch in alphabet], dtype='<u4')
+
+    @staticmethod
+    def _transform_vectorized(text, key, alphabet, op, trace=True):
+        """
+        NumPy version of _transform_scalar: whole-array index lookup, modular
+        add/subtract and pass-through mask over UTF-32 code points.
+        """
+        n = len(alphabet)
+        lut, alphabet_cp = OTPLogic._vector_tables(alphabet)
+        last = len(lut) - 1
+
+        key = key[:len(text)]
+        text_cp = _code_points(text)
+        text_idx = lut[np.minimum(text_cp, last)]
+        key_idx = lut[np.minimum(_code_points(key), last)]
+
+        if op == '+':
+            res_idx = (text_idx + key_idx) % n
+        else:
+            res_idx = (text_idx - key_idx) % n
+        valid = (text_idx < n) & (key_idx < n)
+        out = np.where(valid, alphabet_cp[res_idx], text_cp)
+
+        result = out.astype('<u4').tobytes().decode('utf-32-le', 'surrogatepass')
+        if not trace:
+            return result, None
+        steps = OTPSteps(text, key, result, text_idx.astype(np.uint8).tobytes(),
+                         key_idx.astype(np.uint8).tobytes(), n, op)
+        return result, steps
+
+    # ----------------- التشفير -----------------
+    @staticmethod
+    def encrypt(text, key, trace=True, lang=None):
+        if len(key) < len(text):
+            return None, "Error: Key length must be >= Text length", None
+
+        alphabet, lang = OTPLogic._get_alphabet(text, lang)
+        cipher_text, steps = OTPLogic._transform(text, key, alphabet, '+', trace)
+        return cipher_text, steps, lang
+
+    # ----------------- فك التشفير -----------------
+    @staticmethod
+    def decrypt(cipher, key, trace=True, lang=None):
+        if len(key) < len(cipher):
+            return None, "Error: Key length must be >= Cipher length", None
+
+        alphabet, lang = OTPLogic._get_alphabet(cipher, lang)
+        plain_text, steps = OTPLogic._transform(cipher, key, alphabet, '-', trace)
+        return plain_text, steps, lang
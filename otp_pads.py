@@ -0,0 +1,173 @@
+"""
+Pre-generated pad pools for OTPLogic.generate_key.
+
+A PadPool is an mmap-backed file of random alphabet indices (one byte per
+key character) for a single alphabet. A background thread keeps it topped
+up from the OS CSPRNG, so a key for a large message is just a slice of the
+file. Handed-out bytes are wiped and never given out again. The header
+stores how far the pool is consumed and filled, so this also holds across
+restarts.
+
+Several processes (two GUI instances, or a GUI and a script) may open the
+same pool file. Every read-and-advance of the header happens under an
+exclusive lock on a companion ".lock" file and re-reads the header from the
+shared mapping first, so a range is handed out to exactly one caller.
+"""
+import mmap
+import os
+import struct
+import threading
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+from otp_logic import OTPLogic
+
+HEADER = struct.Struct("<QQ")  # consumed, filled
+DEFAULT_CAPACITY = 64 << 20
+REFILL_CHUNK = 1 << 20
+
+
+@contextmanager
+def _locked(lock_file):
+    """Exclusive inter-process lock on an open lock file (threads still need their own lock)."""
+    if fcntl is not None:
+        fcntl.flock(lock_file.fileno(), fcntl.LOCK_EX)
+        try:
+            yield
+        finally:
+            fcntl.flock(lock_file.fileno(), fcntl.LOCK_UN)
+        return
+    lock_file.seek(0)
+    while True:
+        try:
+            msvcrt.locking(lock_file.fileno(), msvcrt.LK_LOCK, 1)
+            break
+        except OSError:  # LK_LOCK gives up after ten seconds; keep waiting
+            pass
+    try:
+        yield
+    finally:
+        lock_file.seek(0)
+        msvcrt.locking(lock_file.fileno(), msvcrt.LK_UNLCK, 1)
+
+
+class PadPool:
+    def __init__(self, alphabet, path, capacity=DEFAULT_CAPACITY, refill_chunk=REFILL_CHUNK):
+        self.alphabet = alphabet
+        self.path = path
+        self.capacity = capacity
+        self.refill_chunk = refill_chunk
+
+        size = HEADER.size + capacity
+        self._lock_file = open(path + ".lock", 'a+b')
+        with _locked(self._lock_file):
+            mode = 'r+b' if os.path.exists(path) else 'w+b'
+            self._file = open(path, mode)
+            if os.path.getsize(path) != size:
+                self._file.truncate(size)
+            self._mm = mmap.mmap(self._file.fileno(), size)
+            self._load_header()
+            if not self.consumed <= self.filled <= capacity:
+                self.consumed = self.filled = 0
+                self._save_header()
+
+        self._cond = threading.Condition()
+        self._stopped = False
+        self._thread = None
+
+    # ----------------- Background filling -----------------
+    def start(self):
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._fill_loop, daemon=True)
+            self._thread.start()
+        return self
+
+    def _fill_loop(self):
+        while True:
+            with self._cond:
+                while not self._stopped and self.filled >= self.capacity:
+                    # Other processes can drain the pool without notifying
+                    # this one, so the header is polled as well
+                    self._cond.wait(1.0)
+                    self._load_header()
+                if self._stopped:
+                    return
+                size = min(self.refill_chunk, self.capacity - self.filled)
+
+            # Generation runs outside the locks; the chunk is then written at
+            # whatever the fill mark is by now, since another process may
+            # have filled or drained the pool in the meantime.
+            chunk = OTPLogic.random_indices(size, self.alphabet)
+
+            with self._cond, _locked(self._lock_file):
+                self._load_header()
+                size = min(size, self.capacity - self.filled)
+                start = HEADER.size + self.filled
+                self._mm[start:start + size] = chunk[:size]
+                self.filled += size
+                self._save_header()
+                self._cond.notify_all()
+
+    def _load_header(self):
+        self.consumed, self.filled = HEADER.unpack_from(self._mm, 0)
+
+    def _save_header(self):
+        HEADER.pack_into(self._mm, 0, self.consumed, self.filled)
+
+    # ----------------- Consumption -----------------
+    def available(self):
+        with self._cond, _locked(self._lock_file):
+            self._load_header()
+            return self.filled - self.consumed
+
+    def take(self, length):
+        """
+        Returns a key of `length` characters. Pooled material is used first;
+        anything the pool cannot cover yet is generated on the spot.
+        """
+        with self._cond, _locked(self._lock_file):
+            self._load_header()
+            start = HEADER.size + self.consumed
+            used = min(length, self.filled - self.consumed)
+            indices = self._mm[start:start + used]
+            self._mm[start:start + used] = bytes(used)
+            self.consumed += used
+            if self.consumed >= self.capacity:
+                # Fully drained: start over, the filler refills from the top
+                self.consumed = self.filled = 0
+            self._save_header()
+            self._cond.notify_all()
+
+        if used < length:
+            indices += OTPLogic.random_indices(length - used, self.alphabet)
+        return OTPLogic.indices_to_text(indices, self.alphabet)
+
+    def close(self):
+        with self._cond:
+            self._stopped = True
+            self._cond.notify_all()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+        self._mm.flush()
+        self._mm.close()
+        self._file.close()
+        self._lock_file.close()
+
+
+_POOLS = {}
+
+
+def get_pool(lang, directory, capacity=DEFAULT_CAPACITY):
+    """Returns the started pool for a language ('ENGLISH', 'ARABIC' or 'MIXED'), creating it once."""
+    pool = _POOLS.get((lang, directory))
+    if pool is None:
+        path = os.path.join(directory, f"pad_pool_{lang.lower()}.bin")
+        pool = PadPool(OTPLogic.ALPHABETS[lang], path, capacity).start()
+        _POOLS[(lang, directory)] = pool
+    return pool
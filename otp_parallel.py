@@ -0,0 +1,157 @@
+"""
+Multi-core One-Time Pad for very large inputs.
+
+Every position of the pad is independent, so the input is cut into aligned
+ranges and each range is handled by a worker process. The payload never
+goes through pickling:
+
+- text mode places text, key and output in multiprocessing.shared_memory
+  as UTF-32 (fixed width, so character ranges are plain byte ranges); each
+  worker transforms its range with OTPLogic._transform and writes the
+  result into the preallocated output block;
+- byte mode has every worker mmap the source, pad and preallocated
+  destination file and XOR its own range with otp_bytes.xor_into.
+
+Results are identical to OTPLogic.encrypt/decrypt and otp_bytes.xor_file.
+"""
+import mmap
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import otp_bytes
+from otp_logic import OTPLogic
+from otp_stream import PadPosition
+
+# Below this many characters (or bytes) splitting costs more than it saves
+PARALLEL_THRESHOLD = 1 << 22
+MIN_RANGE = 1 << 20
+
+
+def _ranges(size, workers):
+    step = max(MIN_RANGE, -(-size // workers))
+    return [(start, min(start + step, size)) for start in range(0, size, step)]
+
+
+def _to_shared(data, size):
+    shm = shared_memory.SharedMemory(create=True, size=max(size, 1))
+    shm.buf[:len(data)] = data
+    return shm
+
+
+# ----------------- Text mode -----------------
+def _transform_range(names, start, end, alphabet, op):
+    blocks = [shared_memory.SharedMemory(name=name) for name in names]
+    try:
+        text_buf, key_buf, out_buf = (block.buf for block in blocks)
+        a, b = start * 4, end * 4
+        text = str(text_buf[a:b], 'utf-32-le', 'surrogatepass')
+        key = str(key_buf[a:b], 'utf-32-le', 'surrogatepass')
+        result, _ = OTPLogic._transform(text, key, alphabet, op, trace=False)
+        out_buf[a:b] = result.encode('utf-32-le', 'surrogatepass')
+        del text_buf, key_buf, out_buf
+    finally:
+        for block in blocks:
+            block.close()
+
+
+def _parallel_transform(text, key, alphabet, op, workers):
+    size = len(text) * 4
+    blocks = []
+    try:
+        blocks.append(_to_shared(text.encode('utf-32-le', 'surrogatepass'), size))
+        blocks.append(_to_shared(key[:len(text)].encode('utf-32-le', 'surrogatepass'), size))
+        blocks.append(shared_memory.SharedMemory(create=True, size=max(size, 1)))
+        names = [block.name for block in blocks]
+
+        with ProcessPoolExecutor(workers) as pool:
+            jobs = [pool.submit(_transform_range, names, start, end, alphabet, op)
+                    for start, end in _ranges(len(text), workers)]
+            for job in jobs:
+                job.result()
+        return str(blocks[2].buf[:size], 'utf-32-le', 'surrogatepass')
+    finally:
+        for block in blocks:
+            block.close()
+            block.unlink()
+
+
+def _run(text, key, op, workers, error):
+    if len(key) < len(text):
+        return None, error, None
+
+    alphabet, lang = OTPLogic._get_alphabet(text)
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(text) < PARALLEL_THRESHOLD:
+        result, _ = OTPLogic._transform(text, key, alphabet, op, trace=False)
+    else:
+        result = _parallel_transform(text, key, alphabet, op, workers)
+    return result, None, lang
+
+
+def parallel_encrypt(text, key, workers=None):
+    """Same contract as OTPLogic.encrypt(text, key, trace=False), on `workers` processes."""
+    return _run(text, key, '+', workers, "Error: Key length must be >= Text length")
+
+
+def parallel_decrypt(cipher, key, workers=None):
+    return _run(cipher, key, '-', workers, "Error: Key length must be >= Cipher length")
+
+
+# ----------------- Byte mode -----------------
+def _xor_range(src_path, pad_path, dst_path, position, start, end):
+    with open(src_path, 'rb') as src_file, open(pad_path, 'rb') as pad_file, \
+            open(dst_path, 'r+b') as dst_file:
+        src = mmap.mmap(src_file.fileno(), 0, access=mmap.ACCESS_READ)
+        pad = mmap.mmap(pad_file.fileno(), 0, access=mmap.ACCESS_READ)
+        dst = mmap.mmap(dst_file.fileno(), 0, access=mmap.ACCESS_WRITE)
+        try:
+            src_view, pad_view, dst_view = memoryview(src), memoryview(pad), memoryview(dst)
+            for a in range(start, end, otp_bytes.CHUNK_SIZE):
+                b = min(a + otp_bytes.CHUNK_SIZE, end)
+                otp_bytes.xor_into(dst_view[a:b], src_view[a:b], pad_view[position + a:position + b])
+            src_view.release()
+            pad_view.release()
+            dst_view.release()
+        finally:
+            src.close()
+            pad.close()
+            dst.close()
+
+
+def parallel_xor_file(src_path, pad_path, dst_path, ledger=None, position=None, workers=None):
+    """
+    otp_bytes.xor_file into dst_path, split across `workers` processes
+    that each map the files themselves. The workers write a temporary file
+    that replaces dst_path only on success, so dst_path may be src_path and
+    a failed run leaves dst_path as it was.
+    """
+    workers = workers or os.cpu_count() or 1
+    size = os.path.getsize(src_path)
+    if workers == 1 or size < PARALLEL_THRESHOLD:
+        return otp_bytes.xor_file(src_path, pad_path, dst_path, ledger, position)
+
+    ledger, position = otp_bytes._ledger_position(pad_path, ledger, position)
+    if position + size > os.path.getsize(pad_path):
+        raise ValueError(f"Pad exhausted: {size} bytes needed at offset {position}, "
+                         f"pad has {os.path.getsize(pad_path)}.")
+
+    tmp_path = dst_path + ".tmp"
+    try:
+        with open(tmp_path, 'wb') as f:
+            f.truncate(size)
+        with ProcessPoolExecutor(workers) as pool:
+            jobs = [pool.submit(_xor_range, src_path, pad_path, tmp_path, position, start, end)
+                    for start, end in _ranges(size, workers)]
+            for job in jobs:
+                job.result()
+        os.replace(tmp_path, dst_path)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+    end = position + size
+    if ledger is not None:
+        ledger.commit(PadPosition(end, end))
+    return otp_bytes.XorResult(position, end, size)
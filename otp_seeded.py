@@ -0,0 +1,144 @@
+"""
+Seeded-pad mode: OTP arithmetic with the key expanded from a short seed.
+
+The pad is not shipped; it is regenerated on both sides from the seed and a
+per-message nonce with the keystream DRBG and rejection-sampled into
+alphabet indices the same way OTPLogic.random_indices does. The seed is
+usually a typed passphrase, so it is stretched with scrypt, salted with the
+nonce, before it keys the DRBG. The index stream is continuous, so any
+chunking gives the same pad.
+
+THIS IS A STREAM CIPHER, NOT A ONE-TIME PAD: its security rests on the seed
+and the DRBG, not on a truly random key as long as the message. Output is
+labelled with SEEDED_MAGIC and carries its language and nonce, so it is
+never mistaken for, or decrypted as, plain OTP output.
+"""
+import hashlib
+import secrets
+
+import keystream
+from otp_logic import OTPLogic
+from otp_stream import CHUNK_CHARS, _write_file
+
+SEEDED_MAGIC = "OTP-SEEDED-PAD-2 (stream cipher, not a one-time pad)"
+NONCE_SIZE = 16
+
+# scrypt cost (about 16 MB and tens of milliseconds per message)
+SCRYPT_N = 1 << 14
+SCRYPT_R = 8
+SCRYPT_P = 1
+DERIVED_KEY_SIZE = 32
+
+
+def _seed_bytes(seed):
+    return seed.encode('utf-8') if isinstance(seed, str) else bytes(seed)
+
+
+def derive_key(seed, nonce):
+    """Stretches the seed (passphrase) into the DRBG key, salted with the message nonce."""
+    return hashlib.scrypt(_seed_bytes(seed), salt=nonce, n=SCRYPT_N, r=SCRYPT_R, p=SCRYPT_P,
+                          dklen=DERIVED_KEY_SIZE)
+
+
+class SeededPad:
+    """Endless stream of alphabet indices derived from (seed, nonce)."""
+
+    def __init__(self, seed, nonce, alphabet):
+        self.alphabet = alphabet
+        self._seed = derive_key(seed, nonce)
+        self._offset = 0
+        self._buffer = b""
+        _, self._to_index, self._rejected, _ = OTPLogic._sampling_tables(alphabet)
+
+    def indices(self, length):
+        parts = [self._buffer]
+        have = len(self._buffer)
+        while have < length:
+            raw = keystream.keystream(self._seed, keystream.BLOCK_SIZE, self._offset)
+            self._offset += keystream.BLOCK_SIZE
+            part = raw.translate(self._to_index, self._rejected)
+            parts.append(part)
+            have += len(part)
+        data = b"".join(parts)
+        self._buffer = data[length:]
+        return data[:length]
+
+    def key(self, length):
+        return OTPLogic.indices_to_text(self.indices(length), self.alphabet)
+
+
+def _header(lang, nonce):
+    return f"{SEEDED_MAGIC}\n{lang} {nonce.hex()}\n"
+
+
+def _parse_header(first, second):
+    if first.rstrip('\n') != SEEDED_MAGIC:
+        raise ValueError("Not seeded-pad output (missing OTP-SEEDED-PAD header).")
+    lang, nonce = second.split()
+    if lang not in OTPLogic.ALPHABETS:
+        raise ValueError(f"Unknown language '{lang}' in seeded-pad header.")
+    return lang, bytes.fromhex(nonce)
+
+
+# ----------------- In-memory -----------------
+def seeded_encrypt(text, seed, chunk_chars=CHUNK_CHARS):
+    """Returns the labelled ciphertext (header lines followed by the cipher text)."""
+    alphabet, lang = OTPLogic._get_alphabet(text)
+    nonce = secrets.token_bytes(NONCE_SIZE)
+    pad = SeededPad(seed, nonce, alphabet)
+    parts = [_header(lang, nonce)]
+    for start in range(0, len(text), chunk_chars):
+        chunk = text[start:start + chunk_chars]
+        parts.append(OTPLogic._transform(chunk, pad.key(len(chunk)), alphabet, '+', trace=False)[0])
+    return "".join(parts)
+
+
+def seeded_decrypt(blob, seed, chunk_chars=CHUNK_CHARS):
+    first, second, cipher = (blob.split('\n', 2) + ["", ""])[:3]
+    lang, nonce = _parse_header(first, second)
+    alphabet = OTPLogic.ALPHABETS[lang]
+    pad = SeededPad(seed, nonce, alphabet)
+    parts = []
+    for start in range(0, len(cipher), chunk_chars):
+        chunk = cipher[start:start + chunk_chars]
+        parts.append(OTPLogic._transform(chunk, pad.key(len(chunk)), alphabet, '-', trace=False)[0])
+    return "".join(parts)
+
+
+# ----------------- Files -----------------
+def _stream(src, dst, pad, alphabet, op, chunk_chars):
+    chars = 0
+    while True:
+        chunk = src.read(chunk_chars)
+        if not chunk:
+            return chars
+        dst.write(OTPLogic._transform(chunk, pad.key(len(chunk)), alphabet, op, trace=False)[0])
+        chars += len(chunk)
+
+
+def seeded_encrypt_file(src_path, dst_path, seed, lang=None, chunk_chars=CHUNK_CHARS):
+    """
+    Streams src_path into a labelled seeded-pad file. The language is taken
+    from the first chunk unless given. Returns (characters, lang). dst_path
+    is replaced only on success and may be src_path.
+    """
+    def body(src, dst):
+        nonlocal lang
+        if lang is None:
+            lang = OTPLogic.detect_language(src.read(chunk_chars))
+            src.seek(0)
+        alphabet = OTPLogic.ALPHABETS[lang]
+        nonce = secrets.token_bytes(NONCE_SIZE)
+        dst.write(_header(lang, nonce))
+        return _stream(src, dst, SeededPad(seed, nonce, alphabet), alphabet, '+', chunk_chars), lang
+
+    return _write_file(src_path, dst_path, body)
+
+
+def seeded_decrypt_file(src_path, dst_path, seed, chunk_chars=CHUNK_CHARS):
+    def body(src, dst):
+        lang, nonce = _parse_header(src.readline(), src.readline())
+        alphabet = OTPLogic.ALPHABETS[lang]
+        return _stream(src, dst, SeededPad(seed, nonce, alphabet), alphabet, '-', chunk_chars), lang
+
+    return _write_file(src_path, dst_path, body)
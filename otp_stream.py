@@ -0,0 +1,154 @@
+"""
+File-to-file One-Time Pad that streams the text and the pad in aligned
+chunks, so memory use stays constant whatever the file size.
+
+A PadLedger remembers how much of a pad file has been used, both in
+characters and in UTF-8 bytes, in a small JSON file next to the pad. One
+large pad can then serve many messages without reusing a key character.
+Because the byte offset is stored, starting the next message is a single
+seek, and bookkeeping is O(1) per message.
+
+Encrypted files start with a one-line header holding the language and the
+pad offset the message was encrypted at. Decryption seeks straight to that
+offset and never touches the ledger, so a message can be decrypted any
+number of times, in any order.
+"""
+import io
+import json
+import os
+from collections import namedtuple
+
+from otp_logic import OTPLogic
+
+CHUNK_CHARS = 1 << 16
+STREAM_MAGIC = "OTP-STREAM-1"
+
+PadPosition = namedtuple("PadPosition", "chars bytes")
+StreamResult = namedtuple("StreamResult", "start end chars lang")
+
+
+class PadLedger:
+    def __init__(self, pad_path, ledger_path=None):
+        self.pad_path = pad_path
+        self.path = ledger_path or pad_path + ".ledger.json"
+        self.position = PadPosition(0, 0)
+        self.messages = 0
+        if os.path.exists(self.path):
+            with open(self.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            self.position = PadPosition(data["chars"], data["bytes"])
+            self.messages = data.get("messages", 0)
+
+    def commit(self, position):
+        """Marks everything before `position` as used and saves the ledger atomically."""
+        if position.chars < self.position.chars:
+            raise ValueError("Pad position cannot move backwards.")
+        self.position = position
+        self.messages += 1
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({"chars": position.chars, "bytes": position.bytes,
+                       "messages": self.messages}, f)
+        os.replace(tmp_path, self.path)
+
+
+def _header(lang, position):
+    return f"{STREAM_MAGIC} {lang} chars={position.chars} bytes={position.bytes}\n"
+
+
+def _parse_header(line):
+    parts = line.split()
+    if (len(parts) != 4 or parts[0] != STREAM_MAGIC or not parts[2].startswith("chars=")
+            or not parts[3].startswith("bytes=")):
+        raise ValueError("Not OTP stream output (missing OTP-STREAM header).")
+    lang = parts[1]
+    if lang not in OTPLogic.ALPHABETS:
+        raise ValueError(f"Unknown language '{lang}' in OTP stream header.")
+    return lang, PadPosition(int(parts[2][len("chars="):]), int(parts[3][len("bytes="):]))
+
+
+def _transform_stream(src, dst, pad, first, alphabet, op, position, chunk_chars):
+    """Transforms `first` and the rest of src; returns the end pad position."""
+    chars = 0
+    key_bytes = 0
+    chunk = first
+    while chunk:
+        key = pad.read(len(chunk))
+        if len(key) < len(chunk):
+            raise ValueError(f"Pad exhausted after {position.chars + chars + len(key)} characters.")
+        result, _ = OTPLogic._transform(chunk, key, alphabet, op, trace=False)
+        dst.write(result)
+        chars += len(chunk)
+        key_bytes += len(key.encode('utf-8'))
+        chunk = src.read(chunk_chars)
+    return PadPosition(position.chars + chars, position.bytes + key_bytes)
+
+
+def _write_file(src_path, dst_path, body):
+    """
+    Runs body(src, dst) with dst writing to a temporary file that replaces
+    dst_path only on success, so a failed run leaves dst_path as it was.
+    """
+    tmp_path = dst_path + ".tmp"
+    try:
+        with open(src_path, 'r', encoding='utf-8', newline='') as src, \
+                open(tmp_path, 'w', encoding='utf-8', newline='') as dst:
+            result = body(src, dst)
+        os.replace(tmp_path, dst_path)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return result
+
+
+def stream_encrypt_file(src_path, dst_path, pad_path, ledger=None, position=None,
+                        lang=None, chunk_chars=CHUNK_CHARS):
+    """
+    Encrypts src_path into dst_path with key characters taken from pad_path.
+    By default the pad is consumed from where its ledger left off and the
+    ledger is advanced; pass `position` to use an explicit offset instead.
+    The offset is written to the output header for decryption.
+    """
+    if position is None:
+        if ledger is None:
+            ledger = PadLedger(pad_path)
+        position = ledger.position
+
+    def body(src, dst):
+        nonlocal lang
+        first = src.read(chunk_chars)
+        # Same rule as OTPLogic: the alphabet follows the input, here judged
+        # from the first chunk unless given.
+        if lang is None:
+            alphabet, lang = OTPLogic._get_alphabet(first)
+        else:
+            alphabet = OTPLogic.ALPHABETS[lang]
+        dst.write(_header(lang, position))
+        with open(pad_path, 'rb') as pad_raw:
+            pad_raw.seek(position.bytes)
+            pad = io.TextIOWrapper(pad_raw, encoding='utf-8', newline='')
+            return _transform_stream(src, dst, pad, first, alphabet, '+', position, chunk_chars)
+
+    # The ledger only moves once the output is complete
+    end = _write_file(src_path, dst_path, body)
+    if ledger is not None:
+        ledger.commit(end)
+    return StreamResult(position, end, end.chars - position.chars, lang)
+
+
+def stream_decrypt_file(src_path, dst_path, pad_path, chunk_chars=CHUNK_CHARS):
+    """
+    Decrypts the output of stream_encrypt_file with the pad characters at
+    the offset recorded in its header. The ledger is left untouched.
+    """
+    def body(src, dst):
+        lang, position = _parse_header(src.readline())
+        with open(pad_path, 'rb') as pad_raw:
+            pad_raw.seek(position.bytes)
+            pad = io.TextIOWrapper(pad_raw, encoding='utf-8', newline='')
+            end = _transform_stream(src, dst, pad, src.read(chunk_chars),
+                                    OTPLogic.ALPHABETS[lang], '-', position, chunk_chars)
+        return StreamResult(position, end, end.chars - position.chars, lang)
+
+    return _write_file(src_path, dst_path, body)
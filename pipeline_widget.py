@@ -0,0 +1,87 @@
+from PySide6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel,
+                               QLineEdit, QPushButton, QTextEdit, QComboBox, QFileDialog)
+from PySide6.QtCore import Qt
+from PySide6.QtGui import QFont
+
+import cipher_pipeline
+
+
+class PipelinePanel(QWidget):
+    """
+    Runs a cipher_pipeline spec on the text box or streams a file through
+    it. Byte output is shown as hex and byte input is read as hex.
+    """
+
+    def __init__(self):
+        super().__init__()
+        self.init_ui()
+
+    def init_ui(self):
+        layout = QVBoxLayout()
+        self.setLayout(layout)
+
+        header = QLabel("Cipher Pipeline")
+        header.setFont(QFont("Segoe UI", 30, QFont.Bold))
+        header.setAlignment(Qt.AlignCenter)
+        layout.addWidget(header)
+
+        self.specs = QLineEdit()
+        self.specs.setPlaceholderText("railfence:key=5 | seeded:seed=secret | rsa:n=...,e=... (d=...[,primes=p/q] to decrypt)")
+        layout.addWidget(self.specs)
+        hint = QLabel("Stages in encryption order, separated by '|': " + ", ".join(cipher_pipeline.STAGE_NAMES))
+        hint.setWordWrap(True)
+        layout.addWidget(hint)
+
+        row = QHBoxLayout()
+        self.direction = QComboBox()
+        self.direction.addItems(["Encrypt", "Decrypt"])
+        run_text_btn = QPushButton("Run on Text")
+        run_text_btn.clicked.connect(self.run_text)
+        run_file_btn = QPushButton("Run on File...")
+        run_file_btn.clicked.connect(self.run_file)
+        row.addWidget(self.direction)
+        row.addWidget(run_text_btn)
+        row.addWidget(run_file_btn)
+        layout.addLayout(row)
+
+        self.input_text = QTextEdit()
+        self.input_text.setPlaceholderText("Enter text (or hex, when the pipeline starts from bytes)...")
+        layout.addWidget(self.input_text)
+
+        self.output = QTextEdit()
+        self.output.setReadOnly(True)
+        layout.addWidget(self.output)
+
+    def _decrypting(self):
+        return self.direction.currentText() == "Decrypt"
+
+    def run_text(self):
+        opened = []
+        try:
+            pipeline, opened = cipher_pipeline.from_specs(self.specs.text(), self._decrypting())
+            data = self.input_text.toPlainText()
+            if pipeline.input == cipher_pipeline.BYTES:
+                data = bytes.fromhex("".join(data.split()))
+            result = pipeline.run_all(data)
+            if pipeline.output == cipher_pipeline.BYTES:
+                result = result.hex().upper()
+            self.output.setPlainText(f"{result}\n\n{pipeline.describe()}")
+        except (ValueError, OSError) as err:
+            self.output.setPlainText(f"Error: {err}")
+        finally:
+            for f in opened:
+                f.close()
+
+    def run_file(self):
+        src, _ = QFileDialog.getOpenFileName(self, "Input File")
+        if not src:
+            return
+        dst, _ = QFileDialog.getSaveFileName(self, "Output File")
+        if not dst:
+            return
+        try:
+            pipeline, written = cipher_pipeline.run_specs_file(self.specs.text(), src, dst, self._decrypting())
+            unit = "characters" if pipeline.output == cipher_pipeline.TEXT else "bytes"
+            self.output.setPlainText(f"{written} {unit} written to {dst}\n\n{pipeline.describe()}")
+        except (ValueError, OSError) as err:
+            self.output.setPlainText(f"Error: {err}")
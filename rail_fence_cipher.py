@@ -5,7 +5,42 @@ Rail Fence Cipher implementation (encrypt/decrypt) in pure Python.
   cases because the output still mirrors the original spacing; callers can strip
   spaces themselves if desired.
 - Validates that `key` is an int > 1; otherwise raises ValueError.
+- The zigzag is never walked or drawn as a grid: which text position lands
+  where follows directly from the cycle length 2*(key-1), so both directions
+  are a single O(n) permutation, cached per (length, key) for short
+  messages as compact integer arrays.
+- Long inputs are permuted as whole NumPy arrays of code points (or bytes)
+  when NumPy is installed; results are identical either way.
+- This is the only Rail Fence engine: railfence.py (the GUI API) is a thin
+  wrapper over it. The per-rail view for visualization is RailSteps, which
+  slices the ciphertext only when a rail is read.
 """
+from array import array
+from collections.abc import Sequence
+from functools import lru_cache
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; the index-tuple path covers everything
+    np = None
+
+# Permutations kept for repeated messages of the same length and key. Only
+# lengths up to PERMUTATION_CACHE_MAX_LENGTH are cached, which bounds the
+# cache at PERMUTATION_CACHE_SIZE * PERMUTATION_CACHE_MAX_LENGTH entries
+# (two 4-byte arrays each, 16 MB in total).
+PERMUTATION_CACHE_SIZE = 32
+PERMUTATION_CACHE_MAX_LENGTH = 1 << 16
+
+# Inputs at least this long go through the NumPy path when it is available
+VECTOR_THRESHOLD = 1 << 11
+
+# The bulk path transposes a grid with one slice copy per rail; once there
+# are more than GRID_MAX_KEY rails and over 1/GRID_MIN_RAIL of the length,
+# it gathers by closed-form index instead. GATHER_CHUNK bounds the
+# temporary index arrays.
+GRID_MAX_KEY = 1 << 10
+GRID_MIN_RAIL = 16
+GATHER_CHUNK = 1 << 20
 
 
 def _validate_key(key):
@@ -15,6 +50,202 @@ def _validate_key(key):
         raise ValueError("Key must be greater than 1.")
 
 
+def rail_fence_permutation(length, key):
+    """
+    Returns (order, inverse) for a message of `length` characters, as
+    integer arrays.
+
+    order[k] is the text position of ciphertext character k, i.e. the
+    positions read rail by rail; inverse[i] is the ciphertext index of text
+    position i. With cycle = 2*(key-1), rail r holds the positions
+    r, r+cycle, r+2*cycle, ... and, for the middle rails, also
+    cycle-r, 2*cycle-r, ..., alternating with the first set.
+    """
+    cycle = 2 * (key - 1)
+    order = []
+    inverse = [0] * length
+    for r in range(min(key, length)):
+        start = len(order)
+        down = range(r, length, cycle)
+        if r == 0 or r == key - 1:
+            order.extend(down)
+            inverse[r::cycle] = range(start, start + len(down))
+            continue
+
+        # Middle rails alternate down/up; r < cycle - r, so `down` is never
+        # shorter than `up`
+        up = range(cycle - r, length, cycle)
+        rail = [0] * (len(down) + len(up))
+        rail[::2] = down
+        rail[1::2] = up
+        order.extend(rail)
+        inverse[r::cycle] = range(start, start + len(rail), 2)
+        inverse[cycle - r::cycle] = range(start + 1, start + len(rail), 2)
+    typecode = 'I' if length <= 0xFFFFFFFF else 'Q'
+    return array(typecode, order), array(typecode, inverse)
+
+
+_cached_permutation = lru_cache(maxsize=PERMUTATION_CACHE_SIZE)(rail_fence_permutation)
+
+
+def _permutation(length, key):
+    if length <= PERMUTATION_CACHE_MAX_LENGTH:
+        return _cached_permutation(length, key)
+    return rail_fence_permutation(length, key)
+
+
+def clear_permutation_cache():
+    _cached_permutation.cache_clear()
+
+
+def rail_lengths(length, key):
+    """Number of characters on each of the `key` rails."""
+    cycle = 2 * (key - 1)
+    lengths = []
+    for r in range(key):
+        count = len(range(r, length, cycle))
+        if 0 < r < key - 1:
+            count += len(range(cycle - r, length, cycle))
+        lengths.append(count)
+    return lengths
+
+
+class RailSteps(Sequence):
+    """
+    The rails of a ciphertext, one "Rail i: ..." line per rail. Rails are
+    contiguous runs of the ciphertext, so nothing is copied or formatted
+    until a line is read; str() gives all lines joined by newlines.
+    """
+
+    def __init__(self, ciphertext, key):
+        _validate_key(key)
+        self.ciphertext = ciphertext
+        self.key = key
+        self._offsets = None
+
+    def _bounds(self, r):
+        if self._offsets is None:
+            offsets = [0]
+            for count in rail_lengths(len(self.ciphertext), self.key):
+                offsets.append(offsets[-1] + count)
+            self._offsets = offsets
+        return self._offsets[r], self._offsets[r + 1]
+
+    def __len__(self):
+        return self.key
+
+    def __getitem__(self, r):
+        if isinstance(r, slice):
+            return [self[i] for i in range(*r.indices(len(self)))]
+        if r < 0:
+            r += self.key
+        if not 0 <= r < self.key:
+            raise IndexError("rail index out of range")
+        return self.rail(r)
+
+    def rail(self, r):
+        start, end = self._bounds(r)
+        return f"Rail {r + 1}: {self.ciphertext[start:end]}"
+
+    def __str__(self):
+        return "\n".join(self)
+
+
+def source_positions(length, keys, positions):
+    """
+    Ciphertext index of each text position in `positions`, for every key in
+    `keys`, as a NumPy array of shape (len(keys), len(positions)).
+
+    Closed form: with cycle = 2*(key-1), position i lies on rail
+    min(i % cycle, cycle - i % cycle) at index i // cycle (edge rails) or
+    2*(i // cycle) + going-up (middle rails), and rail r starts after
+    rails 0..r-1, whose lengths follow from length // cycle and
+    length % cycle.
+    """
+    # 32-bit arithmetic whenever 2*length fits, which halves memory traffic
+    dtype = np.int32 if length < 2 ** 30 else np.int64
+    keys = np.asarray(keys, dtype=dtype)[:, None]
+    cycle = 2 * (keys - 1)
+    i = np.asarray(positions, dtype=dtype)[None, :]
+    phase = i % cycle
+    rail = np.minimum(phase, cycle - phase)
+    q = i // cycle
+
+    # Rail 0 holds full + (rem > 0) characters and middle rail j holds
+    # 2*full + (rem > j) + (rem > cycle-j); summed over the rails before r
+    full = length // cycle
+    rem = length % cycle
+    first = full + (rem > 0)
+    before = rail - 1
+    extra_down = np.clip(rem - 1, 0, before)
+    extra_up = np.maximum(0, rail - np.maximum(cycle - rem + 1, 1))
+    start = np.where(rail == 0, 0, first + before * 2 * full + extra_down + extra_up)
+
+    edge = (rail == 0) | (rail == keys - 1)
+    within = np.where(edge, q, 2 * q + (phase != rail))
+    return start + within
+
+
+def _gather_permute(values, key, decrypt):
+    # Large keys: one closed-form source index per position, in chunks
+    out = np.empty_like(values)
+    length = len(values)
+    for start in range(0, length, GATHER_CHUNK):
+        positions = np.arange(start, min(start + GATHER_CHUNK, length))
+        sources = source_positions(length, [key], positions)[0]
+        if decrypt:
+            out[start:start + len(positions)] = values[sources]
+        else:
+            out[sources] = values[start:start + len(positions)]
+    return out
+
+
+def _vector_permute(values, key, decrypt):
+    # Laid out as a (cycles x cycle) grid, column j holds the positions
+    # j, j+cycle, ...; after a transpose rail r is row r, interleaved with
+    # row cycle-r on the middle rails. Padding sits at the grid's tail and
+    # is cut off by the rail lengths. Very large keys mean many short rails,
+    # which the closed-form gather handles without a loop per rail.
+    length = len(values)
+    if key > GRID_MAX_KEY and key * GRID_MIN_RAIL > length:
+        return _gather_permute(values, key, decrypt)
+    cycle = 2 * (key - 1)
+    cycles = -(-length // cycle)
+    lengths = rail_lengths(length, key)
+
+    if not decrypt:
+        grid = np.empty(cycles * cycle, dtype=values.dtype)
+        grid[:length] = values
+        rows = np.ascontiguousarray(grid.reshape(cycles, cycle).T)
+        out = np.empty_like(values)
+        pos = 0
+        for r, count in enumerate(lengths):
+            if r == 0 or r == key - 1:
+                out[pos:pos + count] = rows[r, :count]
+            else:
+                out[pos:pos + count:2] = rows[r, :(count + 1) // 2]
+                out[pos + 1:pos + count:2] = rows[cycle - r, :count // 2]
+            pos += count
+        return out
+
+    rows = np.empty((cycle, cycles), dtype=values.dtype)
+    pos = 0
+    for r, count in enumerate(lengths):
+        rail = values[pos:pos + count]
+        if r == 0 or r == key - 1:
+            rows[r, :count] = rail
+        else:
+            rows[r, :(count + 1) // 2] = rail[::2]
+            rows[cycle - r, :count // 2] = rail[1::2]
+        pos += count
+    return rows.T.ravel()[:length]
+
+
+def _vector_text(text, key, decrypt):
+    cps = np.frombuffer(text.encode('utf-32-le', 'surrogatepass'), dtype='<u4')
+    return _vector_permute(cps, key, decrypt).tobytes().decode('utf-32-le', 'surrogatepass')
+
+
 def rail_fence_encrypt(plaintext, key):
     """
     Encrypts plaintext using the Rail Fence (zigzag) cipher.
@@ -27,74 +258,44 @@ def rail_fence_encrypt(plaintext, key):
     if not plaintext:
         return ""
 
-    # Initialize rails as list of strings (one per rail).
-    rails = [""] * key
-
-    # Direction toggles when we hit the top or bottom rail.
-    row = 0
-    direction = 1  # 1 = moving downwards, -1 = moving upwards
-
-    for ch in plaintext:
-        rails[row] += ch
-        # Flip direction at the boundaries (top or bottom rail).
-        if row == 0:
-            direction = 1
-        elif row == key - 1:
-            direction = -1
-        row += direction
-
-    # Concatenate rows to form the ciphertext.
-    return "".join(rails)
+    if np is not None and len(plaintext) >= VECTOR_THRESHOLD:
+        return _vector_text(plaintext, key, decrypt=False)
+    order, _ = _permutation(len(plaintext), key)
+    return "".join(map(plaintext.__getitem__, order))
 
 
 def rail_fence_decrypt(ciphertext, key):
     """
     Decrypts ciphertext produced by the Rail Fence cipher.
 
-    The algorithm reconstructs the zigzag pattern positions, marks where
-    characters would go, fills them in rail by rail, then reads them off in
-    zigzag order.
+    Each text position takes the ciphertext character at its index in the
+    rail-by-rail reading order (the inverse of the encryption permutation).
     """
     _validate_key(key)
     if not ciphertext:
         return ""
 
-    length = len(ciphertext)
-
-    # Step 1: Mark positions visited during zigzag traversal.
-    # We build a matrix of placeholders to identify the zigzag path.
-    pattern = [["" for _ in range(length)] for _ in range(key)]
-    row = 0
-    direction = 1
-    for col in range(length):
-        pattern[row][col] = "*"  # placeholder mark
-        if row == 0:
-            direction = 1
-        elif row == key - 1:
-            direction = -1
-        row += direction
-
-    # Step 2: Fill the placeholders row by row with ciphertext characters.
-    idx = 0
-    for r in range(key):
-        for c in range(length):
-            if pattern[r][c] == "*":
-                pattern[r][c] = ciphertext[idx]
-                idx += 1
-
-    # Step 3: Read characters following the zigzag to rebuild plaintext.
-    result = []
-    row = 0
-    direction = 1
-    for col in range(length):
-        result.append(pattern[row][col])
-        if row == 0:
-            direction = 1
-        elif row == key - 1:
-            direction = -1
-        row += direction
-
-    return "".join(result)
+    if np is not None and len(ciphertext) >= VECTOR_THRESHOLD:
+        return _vector_text(ciphertext, key, decrypt=True)
+    _, inverse = _permutation(len(ciphertext), key)
+    return "".join(map(ciphertext.__getitem__, inverse))
+
+
+def rail_fence_encrypt_bytes(data, key):
+    """Rail Fence over a bytes-like object, byte by byte. Returns bytes."""
+    _validate_key(key)
+    if np is not None and len(data) >= VECTOR_THRESHOLD:
+        return _vector_permute(np.frombuffer(data, dtype=np.uint8), key, decrypt=False).tobytes()
+    order, _ = _permutation(len(data), key)
+    return bytes(map(memoryview(data).cast('B').__getitem__, order))
+
+
+def rail_fence_decrypt_bytes(data, key):
+    _validate_key(key)
+    if np is not None and len(data) >= VECTOR_THRESHOLD:
+        return _vector_permute(np.frombuffer(data, dtype=np.uint8), key, decrypt=True).tobytes()
+    _, inverse = _permutation(len(data), key)
+    return bytes(map(memoryview(data).cast('B').__getitem__, inverse))
 
 
 if __name__ == "__main__":
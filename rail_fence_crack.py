@@ -0,0 +1,158 @@
+"""
+Ciphertext-only Rail Fence cracker.
+
+Every key from 2 to len-1 is tried, but no candidate is fully decrypted
+until the end. Where each text position comes from follows in closed form
+from the key (rail_fence_cipher.source_positions), so a few dozen
+plaintext characters of thousands of keys are gathered at once with NumPy
+and scored with a bigram log-probability table. Keys are then pruned in
+stages: a few short windows for all keys, longer windows for the
+survivors, most of the text for the finalists, and a full decrypt for the
+winners only. Key ranges are fanned out over a process pool.
+
+The bigram table is counted once from the English and Arabic samples in
+sample_texts (or any corpus passed to BigramModel), so it scores both
+languages and mixed text. Keys above roughly a quarter of the length
+leave only a few characters per rail; neighbouring keys then decrypt to
+locally plausible text and can outrank the true key.
+"""
+import os
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+
+import numpy as np
+
+from rail_fence_cipher import rail_fence_decrypt, source_positions
+from sample_texts import ARABIC_SAMPLE, ENGLISH_SAMPLE
+
+CrackResult = namedtuple("CrackResult", "key score plaintext")
+
+# Stage sizes: short windows scored for every key and how many keys survive
+# them, then longer windows for the survivors and the finalists. Windows
+# are spread over the text: for large keys many neighbouring keys decrypt
+# the start of the text identically and only differ further in.
+SHORT_WINDOW = 16
+SHORT_WINDOWS = 4
+SURVIVORS = 1024
+WINDOW = 16
+WINDOWS = 512
+FINALISTS = 32
+FINAL_WINDOW = 64
+FINAL_WINDOWS = 2048
+KEY_BATCH = 16384
+
+# Character classes: a-z (case folded), space, the Arabic letter block,
+# digits, and everything else
+SPACE = 26
+ARABIC_FIRST, ARABIC_LAST = 0x0621, 0x064A
+ARABIC_BASE = 27
+DIGIT = ARABIC_BASE + ARABIC_LAST - ARABIC_FIRST + 1
+OTHER = DIGIT + 1
+CLASSES = OTHER + 1
+
+
+@lru_cache(maxsize=None)
+def _class_lut():
+    lut = np.full(ARABIC_LAST + 2, OTHER, dtype=np.uint8)
+    for i in range(26):
+        lut[ord('a') + i] = lut[ord('A') + i] = i
+    lut[ord(' ')] = SPACE
+    lut[ARABIC_FIRST:ARABIC_LAST + 1] = np.arange(ARABIC_BASE, DIGIT)
+    lut[ord('0'):ord('9') + 1] = DIGIT
+    lut[0x0660:0x066A] = DIGIT
+    return lut
+
+
+def char_classes(text):
+    cps = np.frombuffer(text.encode('utf-32-le', 'surrogatepass'), dtype='<u4')
+    lut = _class_lut()
+    return lut[np.minimum(cps, len(lut) - 1)]
+
+
+class BigramModel:
+    """log P(next class | class), add-k smoothed, as a CLASSES x CLASSES table."""
+
+    def __init__(self, corpus, smoothing=0.5):
+        classes = char_classes(corpus).astype(np.intp)
+        counts = np.full((CLASSES, CLASSES), smoothing)
+        np.add.at(counts, (classes[:-1], classes[1:]), 1)
+        self.table = np.log(counts / counts.sum(axis=1, keepdims=True)).astype(np.float32)
+
+    def score(self, classes):
+        """Mean bigram log-probability along the last axis of a class array."""
+        return self.table[classes[..., :-1], classes[..., 1:]].mean(axis=-1)
+
+
+@lru_cache(maxsize=None)
+def default_model():
+    return BigramModel(ENGLISH_SAMPLE + " " + ARABIC_SAMPLE)
+
+
+def _windows(length, count, windows=1):
+    # `windows` runs of `count` text positions spread evenly over the text
+    count = min(count, length)
+    starts = np.linspace(0, length - count, windows).astype(np.int64)
+    return (starts[:, None] + np.arange(count)).ravel(), count
+
+
+def _score_keys(classes, keys, positions, width, model):
+    sampled = classes[source_positions(len(classes), keys, positions)]
+    return model.score(sampled.reshape(len(keys), -1, width)).mean(axis=1)
+
+
+def _top(keys, scores, count):
+    if len(keys) > count:
+        best = np.argpartition(scores, -count)[-count:]
+        keys, scores = keys[best], scores[best]
+    order = np.argsort(-scores, kind='stable')
+    return keys[order], scores[order]
+
+
+def _prune(classes, first, last, model, keep):
+    """Scores keys first..last-1 on the short windows; returns the best `keep`."""
+    positions, width = _windows(len(classes), SHORT_WINDOW, SHORT_WINDOWS)
+    best_keys = np.empty(0, dtype=np.int64)
+    best_scores = np.empty(0, dtype=np.float32)
+    for start in range(first, last, KEY_BATCH):
+        keys = np.arange(start, min(start + KEY_BATCH, last), dtype=np.int64)
+        scores = _score_keys(classes, keys, positions, width, model)
+        best_keys, best_scores = _top(np.concatenate([best_keys, keys]),
+                                      np.concatenate([best_scores, scores]), keep)
+    return best_keys, best_scores
+
+
+def crack(ciphertext, top=5, max_key=None, model=None, workers=None):
+    """
+    Returns the `top` most likely (key, score, plaintext) candidates, best
+    first. Scores are mean bigram log-probabilities (higher is better).
+    """
+    length = len(ciphertext)
+    last = min(length, max_key + 1) if max_key is not None else length
+    if last <= 2:
+        return []
+    model = model or default_model()
+    classes = char_classes(ciphertext)
+
+    # Stage 1: short windows for every key, spread over the pool
+    workers = workers or os.cpu_count() or 1
+    if workers > 1 and last - 2 > KEY_BATCH:
+        step = -(-(last - 2) // workers)
+        ranges = [(s, min(s + step, last)) for s in range(2, last, step)]
+        with ProcessPoolExecutor(workers) as pool:
+            parts = list(pool.map(_prune, *zip(*[(classes, a, b, model, SURVIVORS) for a, b in ranges])))
+        keys = np.concatenate([k for k, _ in parts])
+        scores = np.concatenate([s for _, s in parts])
+    else:
+        keys, scores = _prune(classes, 2, last, model, SURVIVORS)
+
+    # Stage 2: windows spread over the whole text for the survivors
+    positions, width = _windows(length, WINDOW, WINDOWS)
+    scores = _score_keys(classes, keys, positions, width, model)
+    keys, _ = _top(keys, scores, max(top, FINALISTS))
+
+    # Stage 3: most of the text for the finalists; only the winners are decrypted
+    positions, width = _windows(length, FINAL_WINDOW, FINAL_WINDOWS)
+    keys, scores = _top(keys, _score_keys(classes, keys, positions, width, model), top)
+    return [CrackResult(int(k), float(s), rail_fence_decrypt(ciphertext, int(k)))
+            for k, s in zip(keys, scores)]
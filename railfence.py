@@ -1,54 +1,17 @@
-def encrypt_railfence(text, key):
-    rail = [""] * key
-    row = 0
-    direction = 1  
+"""
+GUI-facing Rail Fence API. Both functions run on the rail_fence_cipher
+engine and return (result, steps); pass steps=False to skip the steps
+text, or use rail_fence_cipher.RailSteps to read rails one at a time.
+"""
+from rail_fence_cipher import RailSteps, rail_fence_encrypt, rail_fence_decrypt
 
-    for char in text:
-        rail[row] += char
-        row += direction
+DECRYPT_STEPS = "Decryption visualization coming soon"
 
-        if row == key - 1:
-            direction = -1
-        elif row == 0:
-            direction = 1
 
-    steps = "\n".join([f"Rail {i+1}: {rail[i]}" for i in range(key)])
-    return "".join(rail), steps
+def encrypt_railfence(text, key, steps=True):
+    cipher = rail_fence_encrypt(text, key)
+    return cipher, str(RailSteps(cipher, key)) if steps else None
 
 
-def decrypt_railfence(cipher, key):
-    rail_len = [0] * key
-    row = 0
-    direction = 1
-
-    for _ in cipher:
-        rail_len[row] += 1
-        row += direction
-
-        if row == key - 1:
-            direction = -1
-        elif row == 0:
-            direction = 1
-
-    rails = []
-    index = 0
-    for l in rail_len:
-        rails.append(cipher[index:index + l])
-        index += l
-
-    result = ""
-    pointers = [0] * key
-    row = 0
-    direction = 1
-
-    for _ in cipher:
-        result += rails[row][pointers[row]]
-        pointers[row] += 1
-        row += direction
-
-        if row == key - 1:
-            direction = -1
-        elif row == 0:
-            direction = 1
-
-    return result, "Decryption visualization coming soon"
+def decrypt_railfence(cipher, key, steps=True):
+    return rail_fence_decrypt(cipher, key), DECRYPT_STEPS if steps else None
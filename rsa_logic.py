@@ -1,6 +1,16 @@
 # rsa_logic.py (updated)
-import random
+import hashlib
+import hmac
+import io
+import os
 import re
+import secrets
+from collections import namedtuple
+from functools import lru_cache
+from itertools import accumulate, islice, repeat
+from operator import add
+
+import keystream
 
 
 def gcd(a, b):
@@ -18,10 +28,50 @@ def extended_gcd(a, b):
 
 
 def mod_inverse(a, m):
-    g, x, y = extended_gcd(a, m)
-    if g != 1:
+    # pow(a, -1, m) runs in C and avoids the recursion limit that
+    # extended_gcd hits on multi-thousand-bit moduli.
+    try:
+        return pow(a, -1, m)
+    except ValueError:
         return None
-    return (x % m + m) % m
+
+
+_SMALL_PRIMES = (
+    3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41, 43, 47, 53, 59, 61, 67, 71,
+    73, 79, 83, 89, 97, 101, 103, 107, 109, 113, 127, 131, 137, 139, 149, 151,
+    157, 163, 167, 173, 179, 181, 191, 193, 197, 199, 211, 223, 227, 229, 233,
+    239, 241, 251,
+)
+
+# Miller-Rabin with these bases is deterministic for every n below the limit.
+_MR_BASES = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41)
+_MR_DETERMINISTIC_LIMIT = 3317044064679887385961981
+_MR_EXTRA_ROUNDS = 16
+
+RSAKey = namedtuple("RSAKey", "e n d primes phi lam")
+
+
+def _miller_rabin(num):
+    r, s = 0, num - 1
+    while s % 2 == 0:
+        r += 1
+        s //= 2
+
+    bases = list(_MR_BASES)
+    if num >= _MR_DETERMINISTIC_LIMIT:
+        bases += [secrets.randbelow(num - 3) + 2 for _ in range(_MR_EXTRA_ROUNDS)]
+
+    for a in bases:
+        x = pow(a, s, num)
+        if x == 1 or x == num - 1:
+            continue
+        for _ in range(r - 1):
+            x = pow(x, 2, num)
+            if x == num - 1:
+                break
+        else:
+            return False
+    return True
 
 
 def is_prime(num):
@@ -30,23 +80,26 @@ def is_prime(num):
     if num < 2: return False
     if num == 2: return True
     if num % 2 == 0: return False
-    for i in range(3, int(num**0.5) + 1, 2):
-        if num % i == 0: return False
-    return True
+    for p in _SMALL_PRIMES:
+        if num % p == 0: return num == p
+    if num < _SMALL_PRIMES[-1] ** 2: return True
+    return _miller_rabin(num)
 
 
-def complete_keys(p, q, e_input=None, d_input=None):
-    if not is_prime(p) or not is_prime(q):
-        raise ValueError("P and Q must be prime numbers.")
-    if p == q:
-        raise ValueError("P and Q must be distinct.")
-
-    n = p * q
-    phi = (p - 1) * (q - 1)
+def generate_prime(bits):
+    """
+    Returns a random prime of exactly `bits` bits. The two top bits are set so
+    that the product of k such primes has exactly k * bits bits.
+    """
+    if bits < 3:
+        raise ValueError("Prime size must be at least 3 bits.")
+    while True:
+        candidate = secrets.randbits(bits) | (3 << (bits - 2)) | 1
+        if is_prime(candidate):
+            return candidate
 
-    e = e_input
-    d = d_input
 
+def _resolve_exponents(phi, e, d):
     # Case 1: Both exist
     if e is not None and d is not None:
         if (e * d) % phi != 1:
@@ -75,7 +128,95 @@ def complete_keys(p, q, e_input=None, d_input=None):
                 e += 2
         d = mod_inverse(e, phi)
 
-    return e, n, d
+    return e, d
+
+
+def _build_key(primes, e_input, d_input):
+    n = 1
+    phi = 1
+    lam = 1
+    for r in primes:
+        n *= r
+        phi *= r - 1
+        lam = lam * (r - 1) // gcd(lam, r - 1)
+
+    e, d = _resolve_exponents(phi, e_input, d_input)
+    return RSAKey(e, n, d, tuple(primes), phi, lam)
+
+
+def complete_keys(p, q, e_input=None, d_input=None):
+    if not is_prime(p) or not is_prime(q):
+        raise ValueError("P and Q must be prime numbers.")
+    if p == q:
+        raise ValueError("P and Q must be distinct.")
+
+    key = _build_key((p, q), e_input, d_input)
+    return key.e, key.n, key.d
+
+
+def generate_keys(bits=1024):
+    """
+    A random two-prime RSAKey whose n has exactly `bits` bits; the default
+    is large enough for hybrid mode.
+    """
+    p = generate_prime(bits // 2)
+    q = generate_prime(bits - bits // 2)
+    while q == p:
+        q = generate_prime(bits - bits // 2)
+    return _build_key((p, q), None, None)
+
+
+def complete_multi_prime_keys(primes, e_input=None, d_input=None):
+    """
+    Multi-prime variant of complete_keys. Accepts two or more distinct primes
+    and returns an RSAKey with phi and lambda filled in. The CRT exponents and
+    recombination coefficients are precomputed (and cached) by crt_components.
+    """
+    primes = tuple(primes)
+    if len(primes) < 2:
+        raise ValueError("At least two primes are required.")
+    if not all(is_prime(r) for r in primes):
+        raise ValueError("All factors must be prime numbers.")
+    if len(set(primes)) != len(primes):
+        raise ValueError("Primes must be distinct.")
+
+    key = _build_key(primes, e_input, d_input)
+    crt_components(key.primes, key.d)
+    return key
+
+
+@lru_cache(maxsize=32)
+def crt_components(primes, d):
+    """
+    Per-prime exponents d mod (r_i - 1) and Garner coefficients
+    (r_1 * ... * r_(i-1))^-1 mod r_i for the factors of n.
+
+    An exponent that reduces to 0 (always the case for r = 2) is kept as
+    r - 1 instead: c^0 would give 1 for c = 0 mod r, where c^d gives 0.
+    """
+    exponents = tuple(d % (r - 1) or r - 1 for r in primes)
+    coefficients = []
+    prefix = primes[0]
+    for r in primes[1:]:
+        inv = mod_inverse(prefix % r, r)
+        if inv is None:
+            raise ValueError("Primes must be pairwise coprime.")
+        coefficients.append(inv)
+        prefix *= r
+    return exponents, tuple(coefficients)
+
+
+def crt_pow(c, d, primes):
+    """Computes c^d mod prod(primes) with one small exponentiation per prime."""
+    exponents, coefficients = crt_components(primes, d)
+    first = primes[0]
+    m = pow(c % first, exponents[0], first)
+    prefix = first
+    for r, d_r, coeff in zip(primes[1:], exponents[1:], coefficients):
+        m_r = pow(c % r, d_r, r)
+        m += prefix * (((m_r - m) * coeff) % r)
+        prefix *= r
+    return m
 
 
 def parse_cipher_string(s):
@@ -120,21 +261,37 @@ def rsa_encrypt_with_steps(text, e, n):
     return ", ".join(cipher_ints), "\n".join(steps_log)
 
 
-def rsa_decrypt_with_steps(cipher_str, d, n):
+def rsa_decrypt_with_steps(cipher_str, d, n, primes=None):
     """
     فك التشفير مع إظهار الخطوات. الآن يدعم صيغ مختلفة للـ cipher بفضل parse_cipher_string.
+
+    If the prime factors of n are given (two or more), each block is decrypted
+    through the CRT path instead of a single full-size exponentiation.
     """
     try:
+        if primes is not None:
+            primes = tuple(primes)
+            product = 1
+            for r in primes:
+                product *= r
+            if len(primes) < 2 or product != n:
+                raise ValueError("The given primes do not multiply to n.")
+
         parts = parse_cipher_string(cipher_str)
         plain_chars = []
         steps_log = []
 
         steps_log.append(f"Decryption Formula: M = (C ^ {d}) mod {n}")
+        if primes is not None:
+            steps_log.append(f"Using CRT over {len(primes)} primes: {', '.join(str(r) for r in primes)}")
         steps_log.append("-" * 30)
 
         for c in parts:
             # المعادلة الرياضية
-            m = pow(c, d, n)
+            if primes is not None:
+                m = crt_pow(c, d, primes)
+            else:
+                m = pow(c, d, n)
             try:
                 char_res = chr(m)
             except ValueError:
@@ -153,6 +310,365 @@ def rsa_decrypt_with_steps(cipher_str, d, n):
         raise ValueError(f"Invalid Cipher Format or Key: {str(e)}")
 
 
+# ASN.1 DigestInfo prefix for SHA-256 (RFC 8017, EMSA-PKCS1-v1_5)
+_SHA256_DIGEST_INFO = bytes.fromhex("3031300d060960864801650304020105000420")
+
+
+def encode_digest(message, n):
+    """
+    Hashes `message` (str or bytes) with SHA-256 and encodes it as an integer
+    below n. Moduli large enough for EMSA-PKCS1-v1_5 get the standard padding;
+    the small classroom moduli fall back to the digest reduced mod n.
+    """
+    if isinstance(message, str):
+        message = message.encode('utf-8')
+    digest = hashlib.sha256(message).digest()
+    t = _SHA256_DIGEST_INFO + digest
+    k = (n.bit_length() + 7) // 8
+    if k >= len(t) + 11:
+        em = b"\x00\x01" + b"\xff" * (k - len(t) - 3) + b"\x00" + t
+        return int.from_bytes(em, "big")
+    return int.from_bytes(digest, "big") % n
+
+
+def rsa_sign(message, d, n, primes=None):
+    """Signs the SHA-256 digest of message; uses the CRT path when primes are given."""
+    h = encode_digest(message, n)
+    if primes is not None:
+        return crt_pow(h, d, tuple(primes))
+    return pow(h, d, n)
+
+
+def rsa_verify(message, signature, e, n):
+    if not 0 <= signature < n:
+        return False
+    return pow(signature, e, n) == encode_digest(message, n)
+
+
+def rsa_batch_screen(messages, signatures, e, n):
+    """
+    Screens a batch under the same (e, n) with a single exponentiation:
+    (s_1 * ... * s_k)^e == h_1 * ... * h_k (mod n), two modular
+    multiplications per signature. True proves every message was signed
+    with d at some point, NOT that each stored signature is valid: errors
+    that cancel in the product (s_1 * u, s_2 / u, or the pair -s_1, -s_2)
+    pass. Use rsa_batch_verify for per-signature answers.
+    """
+    if len(messages) != len(signatures):
+        raise ValueError("Each message needs exactly one signature.")
+    s_prod = 1
+    h_prod = 1
+    for m, s in zip(messages, signatures):
+        if not 0 <= s < n:
+            return False
+        s_prod = (s_prod * s) % n
+        h_prod = (h_prod * encode_digest(m, n)) % n
+    return pow(s_prod, e, n) == h_prod
+
+
+def rsa_batch_verify(messages, signatures, e, n):
+    """
+    Verifies many signatures under the same (e, n) and returns one bool per
+    signature, each exactly what rsa_verify would return.
+
+    Digests are computed once per distinct message and each distinct
+    (digest, signature) pair is exponentiated once, so repeated entries
+    cost nothing extra. There is no product shortcut here: a product test
+    cannot tell a valid signature from one whose error cancels against
+    another's (see rsa_batch_screen).
+    """
+    if len(messages) != len(signatures):
+        raise ValueError("Each message needs exactly one signature.")
+
+    digests = {}
+    checked = {}
+    results = []
+    for m, s in zip(messages, signatures):
+        key = m.encode('utf-8') if isinstance(m, str) else bytes(m)
+        h = digests.get(key)
+        if h is None:
+            h = digests[key] = encode_digest(key, n)
+        ok = checked.get((h, s))
+        if ok is None:
+            ok = checked[(h, s)] = 0 <= s < n and pow(s, e, n) == h
+        results.append(ok)
+    return results
+
+
+def diff_range(old, new):
+    """
+    Locates the single edited span between two versions of a text and
+    returns (start, old_end, new_end): old[start:old_end] was replaced by
+    new[start:new_end]. Prefix and suffix are found by binary search over
+    slice comparisons, so the scan runs at memcmp speed.
+    """
+    limit = min(len(old), len(new))
+    lo, hi = 0, limit
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if old[:mid] == new[:mid]:
+            lo = mid
+        else:
+            hi = mid - 1
+    start = lo
+
+    lo, hi = 0, limit - start
+    while lo < hi:
+        mid = (lo + hi + 1) // 2
+        if old[len(old) - mid:] == new[len(new) - mid:]:
+            lo = mid
+        else:
+            hi = mid - 1
+    return start, len(old) - lo, len(new) - lo
+
+
+class IncrementalEncryptor:
+    """
+    Keeps the cipher tokens of the last text seen so that an edit only
+    re-encrypts the changed characters. update() returns a patch
+    (position, removed, inserted) against the ", "-joined cipher string, so a
+    view can be edited in place instead of being re-rendered.
+
+    Token positions come from a cache of running offsets that is valid up to
+    the last edit and extended on demand, so typing at one spot costs
+    O(edit) rather than a sum over every token in front of it.
+    """
+    SEPARATOR = ", "
+
+    def __init__(self, e, n):
+        self.e = e
+        self.n = n
+        self.text = ""
+        self.tokens = []
+        self._cache = {}
+        # _offsets[i]: position of token i in the cipher string (plus one
+        # separator past the end for i == len(tokens)); valid as far as it goes
+        self._offsets = [0]
+
+    def _encrypt_char(self, char):
+        token = self._cache.get(char)
+        if token is None:
+            m = ord(char)
+            if m >= self.n:
+                raise ValueError(f"Char '{char}' (code {m}) >= n ({self.n}). Use larger primes or chunking.")
+            token = str(pow(m, self.e, self.n))
+            self._cache[char] = token
+        return token
+
+    def cipher(self):
+        return self.SEPARATOR.join(self.tokens)
+
+    def _offset(self, i):
+        offsets = self._offsets
+        if i >= len(offsets):
+            lengths = map(len, self.tokens[len(offsets) - 1:i])
+            steps = map(add, lengths, repeat(len(self.SEPARATOR)))
+            offsets.extend(islice(accumulate(steps, initial=offsets[-1]), 1, None))
+        return offsets[i]
+
+    def update(self, text):
+        start, old_end, new_end = diff_range(self.text, text)
+        new_tokens = [self._encrypt_char(c) for c in text[start:new_end]]
+
+        sep = self.SEPARATOR
+        tokens = self.tokens
+        count = len(tokens)
+        pos = self._offset(start)
+        removed = self._offset(old_end) - pos - len(sep) if old_end > start else 0
+        inserted = sep.join(new_tokens)
+
+        if old_end == start and new_tokens and count:
+            # Pure insertion: glue to the following token, or after the last one.
+            if start < count:
+                inserted += sep
+            else:
+                pos -= len(sep)
+                inserted = sep + inserted
+        elif old_end > start and not new_tokens and old_end - start < count:
+            # Pure deletion: also drop one separator next to the removed run.
+            if old_end < count:
+                removed += len(sep)
+            else:
+                pos -= len(sep)
+                removed += len(sep)
+
+        tokens[start:old_end] = new_tokens
+        del self._offsets[start + 1:]
+        self.text = text
+        return pos, removed, inserted
+
+
+# ----------------- Hybrid mode (RSA-wrapped session key) -----------------
+# Layout: MAGIC, the OAEP-wrapped session key as a decimal line, the body
+# XORed with the keystream, then an HMAC-SHA256 tag over everything before it.
+HYBRID_MAGIC = b"RSA-HYBRID-2\n"
+SESSION_KEY_SIZE = 32
+TAG_SIZE = 32
+HYBRID_CHUNK_SIZE = 1 << 20
+_HASH_SIZE = hashlib.sha256().digest_size
+_EMPTY_LABEL_HASH = hashlib.sha256(b"").digest()
+# Smallest n whose byte length fits the OAEP-wrapped session key (777 bits)
+HYBRID_MIN_BITS = (SESSION_KEY_SIZE + 2 * _HASH_SIZE + 2) * 8 - 7
+
+
+def _mgf1(seed, length):
+    out = bytearray()
+    counter = 0
+    while len(out) < length:
+        out += hashlib.sha256(seed + counter.to_bytes(4, 'big')).digest()
+        counter += 1
+    return bytes(out[:length])
+
+
+def _oaep_size(n):
+    if n.bit_length() < HYBRID_MIN_BITS:
+        raise ValueError(f"n is too small for hybrid mode: it needs at least {HYBRID_MIN_BITS} bits. "
+                         f"Use larger primes.")
+    return (n.bit_length() + 7) // 8
+
+
+def wrap_session_key(session_key, e, n):
+    """Encrypts the session key with RSA-OAEP (SHA-256, MGF1-SHA-256, empty label)."""
+    k = _oaep_size(n)
+    padding = bytes(k - len(session_key) - 2 * _HASH_SIZE - 2)
+    db = _EMPTY_LABEL_HASH + padding + b"\x01" + session_key
+    seed = secrets.token_bytes(_HASH_SIZE)
+    masked_db = keystream.xor_bytes(db, _mgf1(seed, len(db)))
+    masked_seed = keystream.xor_bytes(seed, _mgf1(masked_db, _HASH_SIZE))
+    return pow(int.from_bytes(b"\x00" + masked_seed + masked_db, 'big'), e, n)
+
+
+def unwrap_session_key(wrapped, d, n, primes=None):
+    k = _oaep_size(n)
+    error = ValueError("Session key does not decrypt with this d/n.")
+    if not 0 <= wrapped < n:
+        raise error
+    m = crt_pow(wrapped, d, tuple(primes)) if primes is not None else pow(wrapped, d, n)
+    em = m.to_bytes(k, 'big')
+    masked_seed, masked_db = em[1:1 + _HASH_SIZE], em[1 + _HASH_SIZE:]
+    seed = keystream.xor_bytes(masked_seed, _mgf1(masked_db, _HASH_SIZE))
+    db = keystream.xor_bytes(masked_db, _mgf1(seed, len(masked_db)))
+    rest = db[_HASH_SIZE:].lstrip(b"\x00")
+    if (em[0] != 0 or not hmac.compare_digest(db[:_HASH_SIZE], _EMPTY_LABEL_HASH)
+            or rest[:1] != b"\x01" or len(rest) != SESSION_KEY_SIZE + 1):
+        raise error
+    return rest[1:]
+
+
+def _session_keys(session_key):
+    """Derives separate keystream and MAC keys from the session key."""
+    return (hmac.new(session_key, b"keystream", hashlib.sha256).digest(),
+            hmac.new(session_key, b"authenticate", hashlib.sha256).digest())
+
+
+def _hybrid_header(session_key, e, n):
+    return HYBRID_MAGIC + str(wrap_session_key(session_key, e, n)).encode('ascii') + b"\n"
+
+
+def _parse_wrapped(line):
+    try:
+        return int(line.strip())
+    except ValueError:
+        raise ValueError("Hybrid header does not hold a wrapped session key.")
+
+
+def _read_hybrid_header(stream):
+    """Returns the raw header bytes (they are covered by the tag) and the wrapped key."""
+    magic = stream.readline()
+    if magic != HYBRID_MAGIC:
+        raise ValueError("Not a hybrid RSA file.")
+    line = stream.readline()
+    return magic + line, _parse_wrapped(line.decode('ascii'))
+
+
+def _check_tag(mac, tag):
+    if not hmac.compare_digest(mac.digest(), tag):
+        raise ValueError("Authentication failed: the data was modified or the key is wrong.")
+
+
+def hybrid_encrypt_bytes(data, e, n):
+    """
+    Encrypts `data` with a fresh random session key expanded by the keystream
+    DRBG; only the 32-byte session key goes through RSA.
+    """
+    session_key = secrets.token_bytes(SESSION_KEY_SIZE)
+    enc_key, mac_key = _session_keys(session_key)
+    header = _hybrid_header(session_key, e, n)
+    body = keystream.xor_bytes(data, keystream.keystream(enc_key, len(data)))
+    return header + body + hmac.new(mac_key, header + body, hashlib.sha256).digest()
+
+
+def hybrid_decrypt_bytes(blob, d, n, primes=None):
+    stream = io.BytesIO(blob)
+    header, wrapped = _read_hybrid_header(stream)
+    rest = stream.read()
+    if len(rest) < TAG_SIZE:
+        raise ValueError("Hybrid data is truncated: the authentication tag is missing.")
+    body, tag = rest[:-TAG_SIZE], rest[-TAG_SIZE:]
+    enc_key, mac_key = _session_keys(unwrap_session_key(wrapped, d, n, primes))
+    _check_tag(hmac.new(mac_key, header + body, hashlib.sha256), tag)
+    return keystream.xor_bytes(body, keystream.keystream(enc_key, len(body)))
+
+
+def _xor_stream(src, dst, enc_key, mac, decrypt, chunk_size, length=None):
+    """XORs src into dst; the MAC absorbs the ciphertext side. Returns the byte count."""
+    offset = 0
+    while length is None or offset < length:
+        chunk = src.read(chunk_size if length is None else min(chunk_size, length - offset))
+        if not chunk:
+            break
+        out = keystream.xor_bytes(chunk, keystream.keystream(enc_key, len(chunk), offset))
+        mac.update(chunk if decrypt else out)
+        dst.write(out)
+        offset += len(chunk)
+    return offset
+
+
+def hybrid_encrypt_file(src_path, dst_path, e, n, chunk_size=HYBRID_CHUNK_SIZE):
+    """Streams src_path into dst_path chunk by chunk; returns the payload size."""
+    session_key = secrets.token_bytes(SESSION_KEY_SIZE)
+    enc_key, mac_key = _session_keys(session_key)
+    header = _hybrid_header(session_key, e, n)
+    mac = hmac.new(mac_key, header, hashlib.sha256)
+    tmp_path = dst_path + ".tmp"
+    try:
+        with open(src_path, 'rb') as src, open(tmp_path, 'wb') as dst:
+            dst.write(header)
+            size = _xor_stream(src, dst, enc_key, mac, False, chunk_size)
+            dst.write(mac.digest())
+        os.replace(tmp_path, dst_path)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return size
+
+
+def hybrid_decrypt_file(src_path, dst_path, d, n, primes=None, chunk_size=HYBRID_CHUNK_SIZE):
+    """
+    Decrypts into a temporary file and only moves it over dst_path once the
+    tag checks out, so tampered input never reaches the destination.
+    """
+    tmp_path = dst_path + ".tmp"
+    try:
+        with open(src_path, 'rb') as src:
+            header, wrapped = _read_hybrid_header(src)
+            length = os.fstat(src.fileno()).st_size - len(header) - TAG_SIZE
+            if length < 0:
+                raise ValueError("Hybrid file is truncated: the authentication tag is missing.")
+            enc_key, mac_key = _session_keys(unwrap_session_key(wrapped, d, n, primes))
+            mac = hmac.new(mac_key, header, hashlib.sha256)
+            with open(tmp_path, 'wb') as dst:
+                size = _xor_stream(src, dst, enc_key, mac, True, chunk_size, length)
+            _check_tag(mac, src.read(TAG_SIZE))
+        os.replace(tmp_path, dst_path)
+    except Exception:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return size
+
+
 # Simple helpers for file IO to be used by the GUI
 def load_text_file(path):
     with open(path, 'r', encoding='utf-8') as f:
@@ -1,12 +1,16 @@
 import re
+import time
 from PySide6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QLabel,
                                QLineEdit, QPushButton, QTextEdit, QFrame,
-                               QFileDialog)
+                               QFileDialog, QCheckBox)
 from PySide6.QtCore import Qt
-from PySide6.QtGui import QFont
+from PySide6.QtGui import QFont, QTextCursor
 
 import rsa_logic
 
+# Size of the keys made by "Generate Random Keys"; large enough for hybrid mode
+RANDOM_KEY_BITS = 1024
+
 
 class RSAPanel(QWidget):
     def __init__(self):
@@ -64,6 +68,10 @@ class RSAPanel(QWidget):
         self.gen_btn.clicked.connect(self.handle_keys)
         keys_layout.addWidget(self.gen_btn)
 
+        self.random_btn = QPushButton(f"Generate Random {RANDOM_KEY_BITS}-bit Keys")
+        self.random_btn.clicked.connect(self.generate_random_keys)
+        keys_layout.addWidget(self.random_btn)
+
         layout.addWidget(keys_frame)
 
         # Message Input + Import buttons
@@ -78,12 +86,35 @@ class RSAPanel(QWidget):
         self.import_text_btn.clicked.connect(self.import_text_file)
         self.import_cipher_btn = QPushButton("Import Cipher File")
         self.import_cipher_btn.clicked.connect(self.import_cipher_file)
+        self.hybrid_enc_btn = QPushButton("Encrypt file (hybrid)")
+        self.hybrid_enc_btn.clicked.connect(self.hybrid_encrypt_file)
+        self.hybrid_dec_btn = QPushButton("Decrypt file (hybrid)")
+        self.hybrid_dec_btn.clicked.connect(self.hybrid_decrypt_file)
         import_col.addWidget(self.import_text_btn)
         import_col.addWidget(self.import_cipher_btn)
+        import_col.addWidget(self.hybrid_enc_btn)
+        import_col.addWidget(self.hybrid_dec_btn)
         text_row.addLayout(import_col)
 
         layout.addLayout(text_row)
 
+        # Live preview (encrypt-as-you-type)
+        self.live_check = QCheckBox("Live encryption preview")
+        self.live_check.toggled.connect(self.toggle_live_preview)
+        layout.addWidget(self.live_check)
+
+        self.cipher_preview = QTextEdit()
+        self.cipher_preview.setReadOnly(True)
+        self.cipher_preview.setPlaceholderText("Cipher preview updates while you type...")
+        self.cipher_preview.setMaximumHeight(80)
+        self.cipher_preview.setVisible(False)
+        layout.addWidget(self.cipher_preview)
+
+        self.live_encryptor = None
+        self.msg_input.textChanged.connect(self.update_live_preview)
+        self.e_input.widget_ref.textChanged.connect(self.update_live_preview)
+        self.n_input.widget_ref.textChanged.connect(self.update_live_preview)
+
         # Action Buttons
         btn_row = QHBoxLayout()
         self.enc_btn = QPushButton("Encrypt & Show Steps")
@@ -140,6 +171,15 @@ class RSAPanel(QWidget):
         except ValueError:
             return "Error"
 
+    def known_primes(self, n):
+        """(p, q) for CRT decryption when both boxes hold primes that match n, else None."""
+        p = self.get_val(self.p_input)
+        q = self.get_val(self.q_input)
+        if (isinstance(p, int) and isinstance(q, int) and p != q and p * q == n
+                and rsa_logic.is_prime(p) and rsa_logic.is_prime(q)):
+            return (p, q)
+        return None
+
     # ---------------------- Live validation ----------------------
     def set_field_ok(self, layout_obj, ok):
         if ok:
@@ -173,6 +213,18 @@ class RSAPanel(QWidget):
 
         self.enc_btn.setEnabled(bool(can_encrypt))
         self.dec_btn.setEnabled(bool(can_decrypt))
+
+        # Hybrid mode wraps a session key with OAEP, which needs a large n
+        hybrid_ok = isinstance(n_val, int) and n_val.bit_length() >= rsa_logic.HYBRID_MIN_BITS
+        if hybrid_ok:
+            hybrid_tip = ""
+        else:
+            hybrid_tip = (f"Hybrid mode needs n of at least {rsa_logic.HYBRID_MIN_BITS} bits. "
+                          f"Use \"Generate Random {RANDOM_KEY_BITS}-bit Keys\" or enter larger primes.")
+        self.hybrid_enc_btn.setEnabled(bool(can_encrypt and hybrid_ok))
+        self.hybrid_dec_btn.setEnabled(bool(can_decrypt and hybrid_ok))
+        self.hybrid_enc_btn.setToolTip(hybrid_tip)
+        self.hybrid_dec_btn.setToolTip(hybrid_tip)
         self.export_cipher_btn.setEnabled(False)  # becomes True after result exists
 
         # short status in output_area (non-intrusive)
@@ -227,6 +279,25 @@ class RSAPanel(QWidget):
         except Exception as err:
             self.output_area.setText(f"❌ Key Generation Error:\n{str(err)}")
 
+    def generate_random_keys(self):
+        try:
+            key = rsa_logic.generate_keys(RANDOM_KEY_BITS)
+            p, q = key.primes
+            self.p_input.widget_ref.setText(str(p))
+            self.q_input.widget_ref.setText(str(q))
+            self.n_input.widget_ref.setText(str(key.n))
+            self.e_input.widget_ref.setText(str(key.e))
+            self.d_input.widget_ref.setText(str(key.d))
+            self.e_is_system = True
+            self.d_is_system = True
+
+            self.output_area.setHtml(f"✅ Random {RANDOM_KEY_BITS}-bit Keys Ready! (hybrid mode available)"
+                                     f"<br><br>Using:<br>n = {key.n}<br>e = {key.e}<br>d = {key.d}")
+            self.validate_inputs()
+
+        except Exception as err:
+            self.output_area.setText(f"❌ Key Generation Error:\n{str(err)}")
+
     # ---------------------- Import / Export ----------------------
     def import_text_file(self):
         path, _ = QFileDialog.getOpenFileName(self, "Open Text File", "", "Text Files (*.txt);;All Files (*)")
@@ -359,6 +430,96 @@ class RSAPanel(QWidget):
         except Exception as e:
             self.output_area.setPlainText(f"Failed to save result: {e}")
 
+    # ---------------------- Live preview ----------------------
+    def toggle_live_preview(self, enabled):
+        self.cipher_preview.setVisible(enabled)
+        self.live_encryptor = None
+        self.cipher_preview.clear()
+        if enabled:
+            self.update_live_preview()
+
+    def update_live_preview(self):
+        if not self.live_check.isChecked():
+            return
+        n = self.get_val(self.n_input)
+        e = self.get_val(self.e_input)
+        if not isinstance(n, int) or not isinstance(e, int):
+            self.live_encryptor = None
+            self.cipher_preview.setPlainText("Live preview needs valid 'n' and 'e'.")
+            return
+
+        if self.live_encryptor is None or (self.live_encryptor.e, self.live_encryptor.n) != (e, n):
+            # Keys changed: start over from an empty preview
+            self.live_encryptor = rsa_logic.IncrementalEncryptor(e, n)
+            self.cipher_preview.clear()
+
+        try:
+            pos, removed, inserted = self.live_encryptor.update(self.msg_input.toPlainText())
+        except ValueError as err:
+            self.live_encryptor = None
+            self.cipher_preview.setPlainText(f"Live preview paused: {err}")
+            return
+
+        # Patch only the changed tokens in the preview document
+        cursor = QTextCursor(self.cipher_preview.document())
+        cursor.setPosition(pos)
+        cursor.setPosition(pos + removed, QTextCursor.KeepAnchor)
+        cursor.insertText(inserted)
+
+    # ---------------------- Hybrid file mode ----------------------
+    def hybrid_encrypt_file(self):
+        try:
+            n = self.get_val(self.n_input)
+            e = self.get_val(self.e_input)
+            if n is None or e is None or n == "Error" or e == "Error":
+                raise ValueError("For Encryption, you need 'n' and 'e'. Please generate keys or fill them.")
+
+            src, _ = QFileDialog.getOpenFileName(self, "File to Encrypt", "", "All Files (*)")
+            if not src:
+                return
+            dst, _ = QFileDialog.getSaveFileName(self, "Save Encrypted File", src + ".hyb", "Hybrid Files (*.hyb);;All Files (*)")
+            if not dst:
+                return
+
+            start = time.perf_counter()
+            size = rsa_logic.hybrid_encrypt_file(src, dst, e, n)
+            elapsed = max(time.perf_counter() - start, 1e-9)
+
+            self.output_area.setHtml(
+                f"🔒 <b>Hybrid Encryption Done:</b><br>{src} → {dst}<br>"
+                f"{size} bytes in {elapsed:.3f} s ({size / elapsed / 1e6:.1f} MB/s)<br><br>"
+                f"🔑 <b>Save these for Decryption:</b><br>"
+                f"d = {self.d_input.widget_ref.text()}<br>n = {n}"
+            )
+        except Exception as err:
+            self.output_area.setText(f"Hybrid Encryption Error: {str(err)}")
+
+    def hybrid_decrypt_file(self):
+        try:
+            n = self.get_val(self.n_input)
+            d = self.get_val(self.d_input)
+            if n is None or d is None or n == "Error" or d == "Error":
+                raise ValueError("For Decryption, you MUST enter 'n' and 'd' in the boxes above.")
+
+            src, _ = QFileDialog.getOpenFileName(self, "File to Decrypt", "", "Hybrid Files (*.hyb);;All Files (*)")
+            if not src:
+                return
+            default_dst = src[:-4] if src.endswith(".hyb") else src + ".dec"
+            dst, _ = QFileDialog.getSaveFileName(self, "Save Decrypted File", default_dst, "All Files (*)")
+            if not dst:
+                return
+
+            start = time.perf_counter()
+            size = rsa_logic.hybrid_decrypt_file(src, dst, d, n, self.known_primes(n))
+            elapsed = max(time.perf_counter() - start, 1e-9)
+
+            self.output_area.setHtml(
+                f"🔓 <b>Hybrid Decryption Done:</b><br>{src} → {dst}<br>"
+                f"{size} bytes in {elapsed:.3f} s ({size / elapsed / 1e6:.1f} MB/s)"
+            )
+        except Exception as err:
+            self.output_area.setText(f"Hybrid Decryption Error: {str(err)}")
+
     # ---------------------- Encrypt / Decrypt ----------------------
     def run_encrypt(self):
         try:
@@ -403,7 +564,7 @@ class RSAPanel(QWidget):
                 return
 
             # Use the robust parser inside rsa_decrypt_with_steps
-            plain, steps = rsa_logic.rsa_decrypt_with_steps(cipher, d, n)
+            plain, steps = rsa_logic.rsa_decrypt_with_steps(cipher, d, n, self.known_primes(n))
 
             self.output_area.setHtml(
                 f"🔓 <b>Decrypted Message:</b><br>"
@@ -0,0 +1,31 @@
+"""
+Small built-in English and Arabic sample texts.
+
+They feed the rail fence cracker's bigram table, the multiplicative
+cipher's letter frequencies and the benchmark corpora. Kept in a module of
+their own so that none of those has to import the NumPy-based cracker just
+to read them.
+"""
+
+ENGLISH_SAMPLE = (
+    "the rail fence cipher writes the message in a zigzag over a number of rails and "
+    "then reads the rails one after another. it is one of the oldest transposition "
+    "ciphers and it is easy to break, because the letters of the message are not changed "
+    "at all, only their order. a reader who knows the method only has to try every "
+    "possible number of rails and look at which result reads like real text. this is "
+    "what the program does for you: it tries each key, looks at how often pairs of "
+    "letters appear in normal writing, and keeps the keys whose output looks most like "
+    "a language. there are many other classical ciphers in this project, such as the "
+    "one time pad, the multiplicative cipher and the rsa system, and each of them has "
+    "its own strengths and weaknesses that students should learn about when they study "
+    "the history of secret writing and the ideas behind modern security."
+)
+ARABIC_SAMPLE = (
+    "تعتبر شفرة السياج من اقدم طرق التشفير التي تعتمد على تبديل مواضع الحروف دون تغييرها "
+    "حيث تكتب الرسالة بشكل متعرج على عدد من القضبان ثم تقرا القضبان واحدا بعد الاخر. "
+    "ومن السهل كسر هذه الشفرة لان الحروف نفسها لا تتغير وانما يتغير ترتيبها فقط، فيكفي ان "
+    "نجرب كل عدد ممكن من القضبان وننظر الى النص الناتج لنرى ايهما يشبه الكلام الحقيقي. "
+    "وهذا ما يقوم به البرنامج اذ يحسب مدى تكرار ازواج الحروف في اللغة العادية ويحتفظ "
+    "بالمفاتيح التي يبدو ناتجها اقرب الى لغة مفهومة، وفي هذا المشروع طرق تشفير اخرى "
+    "مثل لوحة المرة الواحدة والشفرة الضربية ونظام ار اس اي."
+)
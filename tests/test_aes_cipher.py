@@ -0,0 +1,77 @@
+import pytest
+
+import aes_cipher
+
+# (key, plaintext, ciphertext) in hex: FIPS-197 Appendix C.1-C.3 and the
+# Appendix B example
+BLOCK_VECTORS = (
+    ("000102030405060708090a0b0c0d0e0f",
+     "00112233445566778899aabbccddeeff", "69c4e0d86a7b0430d8cdb78070b4c55a"),
+    ("000102030405060708090a0b0c0d0e0f1011121314151617",
+     "00112233445566778899aabbccddeeff", "dda97ca4864cdfe06eaf70a0ec0d7191"),
+    ("000102030405060708090a0b0c0d0e0f101112131415161718191a1b1c1d1e1f",
+     "00112233445566778899aabbccddeeff", "8ea2b7ca516745bfeafc49904b496089"),
+    ("2b7e151628aed2a6abf7158809cf4f3c",
+     "3243f6a8885a308d313198a2e0370734", "3925841d02dc09fbdc118597196a0b32"),
+)
+
+# NIST SP 800-38A F.2.1 (CBC-AES128) and F.5.1 (CTR-AES128), first two blocks
+SP800_KEY = bytes.fromhex("2b7e151628aed2a6abf7158809cf4f3c")
+SP800_PLAIN = bytes.fromhex("6bc1bee22e409f96e93d7e117393172aae2d8a571e03ac9c9eb76fac45af8e51")
+CBC_IV = bytes.fromhex("000102030405060708090a0b0c0d0e0f")
+CBC_CIPHER = bytes.fromhex("7649abac8119b246cee98e9b12e9197d5086cb9b507219ee95db113a917678b2")
+CTR_NONCE = bytes.fromhex("f0f1f2f3f4f5f6f7f8f9fafbfcfdfeff")
+CTR_CIPHER = bytes.fromhex("874d6191b620e3261bef6864990db6ce9806f66b7970fdff8617187bb9fffdff")
+
+KEYS = (bytes(range(16)), bytes(range(24)), bytes(range(32)))
+
+
+@pytest.mark.parametrize("key, plain, cipher", BLOCK_VECTORS)
+def test_block_known_answers(key, plain, cipher):
+    key, plain, cipher = bytes.fromhex(key), bytes.fromhex(plain), bytes.fromhex(cipher)
+    assert aes_cipher.encrypt_block(plain, key) == cipher
+    assert aes_cipher.decrypt_block(cipher, key) == plain
+    assert aes_cipher.encrypt_steps(plain, key)[0] == cipher
+
+
+@pytest.mark.parametrize("key, plain, cipher", BLOCK_VECTORS)
+def test_batched_known_answers(key, plain, cipher):
+    # Enough blocks for the NumPy path when it is installed
+    key, plain, cipher = bytes.fromhex(key), bytes.fromhex(plain), bytes.fromhex(cipher)
+    count = aes_cipher.VECTOR_BLOCKS
+    assert aes_cipher.ecb_encrypt(plain * count, key, padding=False) == cipher * count
+    assert aes_cipher.ecb_decrypt(cipher * count, key, padding=False) == plain * count
+
+
+def test_cbc_known_answer():
+    assert aes_cipher.cbc_encrypt(SP800_PLAIN, SP800_KEY, CBC_IV, padding=False) == CBC_CIPHER
+    assert aes_cipher.cbc_decrypt(CBC_CIPHER, SP800_KEY, CBC_IV, padding=False) == SP800_PLAIN
+
+
+def test_ctr_known_answer():
+    assert aes_cipher.ctr_crypt(SP800_PLAIN, SP800_KEY, CTR_NONCE) == CTR_CIPHER
+
+
+def test_ctr_counter_carry_matches_serial_path():
+    key = KEYS[0]
+    nonce = bytes.fromhex("0000000000000000ffffffffffffffff")
+    length = aes_cipher.VECTOR_BLOCKS * aes_cipher.BLOCK_SIZE * 2
+    start = int.from_bytes(nonce, 'big')
+    expected = b"".join(aes_cipher.encrypt_block(((start + i) % (1 << 128)).to_bytes(16, 'big'), key)
+                        for i in range(length // aes_cipher.BLOCK_SIZE))
+    assert aes_cipher.ctr_keystream(key, nonce, length) == expected
+
+
+@pytest.mark.parametrize("mode", aes_cipher.MODES)
+@pytest.mark.parametrize("key", KEYS)
+@pytest.mark.parametrize("size", [0, 1, 15, 16, 17, 2000])
+def test_round_trip(mode, key, size):
+    data = bytes(i % 251 for i in range(size))
+    assert aes_cipher.decrypt(aes_cipher.encrypt(data, key, mode), key, mode) == data
+
+
+@pytest.mark.parametrize("mode", ["ECB", "CBC"])
+def test_empty_body_is_a_value_error(mode):
+    blob = bytes(aes_cipher.BLOCK_SIZE) if mode == "CBC" else b""
+    with pytest.raises(ValueError, match="too short"):
+        aes_cipher.decrypt(blob, KEYS[0], mode)
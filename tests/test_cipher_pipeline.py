@@ -0,0 +1,136 @@
+import random
+
+import pytest
+
+import cipher_pipeline
+import otp_stream
+import rsa_logic
+from otp_logic import OTPLogic
+
+ARABIC = "مرحبا بكم في عالم التشفير حيث نحمي الرسائل من أعين المتطفلين " * 20
+ENGLISH = "The quick brown fox jumps over the lazy dog while the cipher hums along " * 20
+
+
+def _pad_file(tmp_path, lang, length=1 << 16):
+    # Deterministic pad, so the assertions below never depend on luck
+    rng = random.Random(0)
+    path = tmp_path / "pad.txt"
+    path.write_text("".join(rng.choices(OTPLogic.ALPHABETS[lang], k=length)), encoding="utf-8")
+    return str(path)
+
+
+def _run(specs, text, decrypt=False):
+    pipeline, opened = cipher_pipeline.from_specs(specs, decrypt)
+    try:
+        result = pipeline.run_all(text)
+    finally:
+        for f in opened:
+            f.close()
+    langs = [stage.lang for stage in pipeline.stages if hasattr(stage, "lang")]
+    return result, langs
+
+
+def _round_trip(specs, text):
+    cipher, enc_langs = _run(specs, text)
+    plain, dec_langs = _run(specs, cipher, decrypt=True)
+    return plain, enc_langs, dec_langs[::-1]
+
+
+@pytest.mark.parametrize("specs", [
+    "railfence:key=3,block=100 | multiplicative:key=5",
+    "seeded:seed=s | multiplicative:key=5",
+    "railfence:key=3,block=100 | otp:pad={pad}",
+    "railfence:key=4 | otp:pad={pad} | multiplicative:key=7",
+    "multiplicative:key=5 | railfence:key=3,block=64 | seeded:seed=s",
+])
+def test_round_trip_english(tmp_path, specs):
+    specs = specs.format(pad=_pad_file(tmp_path, "ENGLISH"))
+    plain, enc_langs, dec_langs = _round_trip(specs, ENGLISH)
+    assert plain == ENGLISH
+    assert enc_langs == dec_langs == ["ENGLISH"] * len(enc_langs)
+
+
+def test_otp_stage_never_reuses_the_pad(tmp_path):
+    pad = _pad_file(tmp_path, "ENGLISH")
+    specs = f"otp:pad={pad}"
+    first, _ = _run(specs, ENGLISH)
+    second, _ = _run(specs, ENGLISH)
+    # Same text twice: fresh pad gives different ciphertext and offsets
+    assert first.split("\n", 1)[0].endswith("chars=0 bytes=0")
+    assert second.split("\n", 1)[0].endswith(f"chars={len(ENGLISH)} bytes={len(ENGLISH)}")
+    assert first.split("\n", 1)[1] != second.split("\n", 1)[1]
+    ledger = otp_stream.PadLedger(pad)
+    assert ledger.position == (2 * len(ENGLISH), 2 * len(ENGLISH)) and ledger.messages == 2
+    # Decryption reads the offset from the header, in any order
+    assert _run(specs, second, decrypt=True)[0] == ENGLISH
+    assert _run(specs, first, decrypt=True)[0] == ENGLISH
+    assert otp_stream.PadLedger(pad).position == ledger.position
+
+
+@pytest.mark.parametrize("specs", [
+    "railfence:key=3,block=100 | multiplicative:key=5",
+    "multiplicative:key=5 | railfence:key=3,block=100 | multiplicative:key=7",
+])
+def test_round_trip_arabic(specs):
+    plain, enc_langs, dec_langs = _round_trip(specs, ARABIC)
+    # Letter variants are folded on encryption, as everywhere else
+    assert plain == OTPLogic._normalize_text(ARABIC, "ARABIC")
+    assert enc_langs == dec_langs == ["ARABIC"] * len(enc_langs)
+
+
+@pytest.mark.parametrize("specs", [
+    "railfence:key=3,block=100 | otp:pad={pad}",
+    "seeded:seed=s | multiplicative:key=5",
+])
+def test_language_behind_upstream_header_arabic(tmp_path, specs):
+    # The stage after a header-writing stage must still see Arabic, and the
+    # decrypt side must agree with it instead of guessing from ciphertext.
+    # OTPLogic's Arabic alphabet lists alef twice, so OTP arithmetic on
+    # Arabic is not exactly invertible; only lengths are compared here.
+    specs = specs.format(pad=_pad_file(tmp_path, "ARABIC"))
+    plain, enc_langs, dec_langs = _round_trip(specs, ARABIC)
+    assert len(plain) == len(ARABIC)
+    assert enc_langs == dec_langs == ["ARABIC"] * len(enc_langs)
+
+
+def test_explicit_language_is_recorded():
+    cipher, langs = _run("multiplicative:key=7,lang=MIXED", ENGLISH)
+    assert langs == ["MIXED"]
+    plain, _ = _run("multiplicative:key=7", cipher, decrypt=True)
+    assert plain == ENGLISH
+
+
+@pytest.fixture(scope="module")
+def rsa_key():
+    p, q = rsa_logic.generate_prime(512), rsa_logic.generate_prime(512)
+    return rsa_logic.complete_multi_prime_keys((p, q), e_input=65537)
+
+
+def test_hybrid_rsa_with_primes(rsa_key):
+    p, q = rsa_key.primes
+    cipher, _ = _run(f"railfence:key=3 | rsa:n={rsa_key.n},e={rsa_key.e}", ENGLISH)
+    specs = f"railfence:key=3 | rsa:n={rsa_key.n},d={rsa_key.d},primes={p}/{q}"
+    plain, _ = _run(specs, cipher, decrypt=True)
+    assert plain == ENGLISH
+
+
+def test_hybrid_rsa_rejects_tampered_stream(rsa_key):
+    cipher, _ = _run(f"rsa:n={rsa_key.n},e={rsa_key.e}", ENGLISH.encode("utf-8"))
+    tampered = bytearray(cipher)
+    tampered[-rsa_logic.TAG_SIZE - 5] ^= 1
+    with pytest.raises(ValueError, match="Authentication failed"):
+        _run(f"rsa:n={rsa_key.n},d={rsa_key.d}", bytes(tampered), decrypt=True)
+    header_end = cipher.index(b"\n", len(rsa_logic.HYBRID_MAGIC)) + 1
+    with pytest.raises(ValueError, match="truncated"):
+        _run(f"rsa:n={rsa_key.n},d={rsa_key.d}", cipher[:header_end + 10], decrypt=True)
+
+
+def test_run_file_keeps_existing_destination_on_failure(tmp_path):
+    src = tmp_path / "src.txt"
+    src.write_text("not a seeded-pad file", encoding="utf-8")
+    dst = tmp_path / "dst.txt"
+    dst.write_text("keep me", encoding="utf-8")
+    with pytest.raises(ValueError):
+        cipher_pipeline.run_specs_file("seeded:seed=s", str(src), str(dst), decrypt=True)
+    assert dst.read_text(encoding="utf-8") == "keep me"
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["dst.txt", "src.txt"]
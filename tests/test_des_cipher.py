@@ -0,0 +1,60 @@
+import pytest
+
+import des_cipher
+
+# (key, plaintext, ciphertext) in hex: the worked example from Stinson /
+# Grabbe, weak-key and zero vectors from NBS SP 500-20, and the SP 800-67
+# three-key TDEA example (ECB)
+ECB_VECTORS = (
+    ("133457799BBCDFF1", "0123456789ABCDEF", "85E813540F0AB405"),
+    ("0E329232EA6D0D73", "8787878787878787", "0000000000000000"),
+    ("0101010101010101", "95F8A5E5DD31D900", "8000000000000000"),
+    ("0101010101010101", "0000000000000000", "8CA64DE9C1B123A7"),
+    ("7CA110454A1A6E57", "01A1D6D039776742", "690F5B0D9A26939B"),
+    ("0123456789ABCDEF23456789ABCDEF01456789ABCDEF0123",
+     "5468652071756663" "6B2062726F776E20" "666F78206A756D70",
+     "A826FD8CE53B855F" "CCE21C8112256FE6" "68D5C05DD9B6B900"),
+)
+
+# FIPS 81 Appendix C: "Now is the time for all " in CBC mode
+CBC_KEY = bytes.fromhex("0123456789ABCDEF")
+CBC_IV = bytes.fromhex("1234567890ABCDEF")
+CBC_PLAIN = b"Now is the time for all "
+CBC_CIPHER = bytes.fromhex("E5C7CDDE872BF27C43E934008C389C0F683788499A7C05F6")
+
+KEYS = (bytes(range(8)), bytes(range(16)), bytes(range(24)))
+
+
+@pytest.mark.parametrize("key, plain, cipher", ECB_VECTORS)
+def test_ecb_known_answers(key, plain, cipher):
+    key, plain, cipher = bytes.fromhex(key), bytes.fromhex(plain), bytes.fromhex(cipher)
+    assert des_cipher.ecb_encrypt(plain, key, padding=False) == cipher
+    assert des_cipher.ecb_decrypt(cipher, key, padding=False) == plain
+
+
+def test_cbc_known_answer():
+    assert des_cipher.cbc_encrypt(CBC_PLAIN, CBC_KEY, CBC_IV, padding=False) == CBC_CIPHER
+    assert des_cipher.cbc_decrypt(CBC_CIPHER, CBC_KEY, CBC_IV, padding=False) == CBC_PLAIN
+
+
+def test_ctr_keystream_is_encrypted_counter():
+    key = KEYS[2]
+    nonce = bytes.fromhex("FFFFFFFFFFFFFFFE")
+    blocks = [bytes.fromhex("FFFFFFFFFFFFFFFE"), bytes.fromhex("FFFFFFFFFFFFFFFF"), bytes(8)]
+    expected = b"".join(des_cipher.encrypt_block(b, key) for b in blocks)
+    assert des_cipher.ctr_keystream(key, nonce, 20) == expected[:20]
+
+
+@pytest.mark.parametrize("mode", des_cipher.MODES)
+@pytest.mark.parametrize("key", KEYS)
+@pytest.mark.parametrize("size", [0, 1, 7, 8, 9, 100])
+def test_round_trip(mode, key, size):
+    data = bytes(range(size))
+    assert des_cipher.decrypt(des_cipher.encrypt(data, key, mode), key, mode) == data
+
+
+@pytest.mark.parametrize("mode", ["ECB", "CBC"])
+def test_empty_body_is_a_value_error(mode):
+    blob = bytes(des_cipher.BLOCK_SIZE) if mode == "CBC" else b""
+    with pytest.raises(ValueError, match="too short"):
+        des_cipher.decrypt(blob, KEYS[0], mode)
@@ -0,0 +1,62 @@
+import random
+
+import pytest
+
+import multiplicative_cipher
+from otp_logic import OTPLogic
+
+
+MIXED_TEXT = "Hello there friends, مرحبا"
+
+
+@pytest.mark.parametrize("lang", ["ENGLISH", "ARABIC", "MIXED"])
+def test_round_trip_with_every_valid_key(lang):
+    rng = random.Random(lang)
+    alphabet = multiplicative_cipher.cipher_alphabet(lang)
+    text = "".join(rng.choices(alphabet + " .,!\n", k=300))
+    for key in multiplicative_cipher.valid_keys(lang):
+        cipher, used = multiplicative_cipher.encrypt(text, key, lang)
+        assert used == lang
+        assert multiplicative_cipher.decrypt(cipher, key, lang) == (text, lang)
+
+
+def test_mixed_text_decrypts_with_the_alphabet_encrypt_reported():
+    # The ciphertext of this text is detected as Arabic; decrypting with the
+    # detected alphabet used to garble it
+    cipher, lang = multiplicative_cipher.encrypt(MIXED_TEXT, 61)
+    assert lang == "ENGLISH"
+    assert OTPLogic.detect_language(cipher) != lang
+    assert multiplicative_cipher.decrypt(cipher, 61, lang)[0] == MIXED_TEXT
+
+
+def test_decrypt_requires_a_language():
+    cipher, _ = multiplicative_cipher.encrypt(MIXED_TEXT, 61)
+    with pytest.raises(ValueError):
+        multiplicative_cipher.decrypt(cipher, 61, None)
+    with pytest.raises(ValueError):
+        multiplicative_cipher.decrypt(cipher, 61, "KLINGON")
+
+
+def test_encrypt_matches_index_multiplication():
+    alphabet = multiplicative_cipher.cipher_alphabet("ENGLISH")
+    n = len(alphabet)
+    cipher, _ = multiplicative_cipher.encrypt(alphabet, 7, "ENGLISH")
+    assert cipher == "".join(alphabet[(i * 7) % n] for i in range(n))
+    assert multiplicative_cipher.inverse_key(7, "ENGLISH") * 7 % n == 1
+
+
+def test_keys_without_an_inverse_are_rejected():
+    n = len(multiplicative_cipher.cipher_alphabet("ENGLISH"))
+    bad = next(k for k in range(2, n) if k not in multiplicative_cipher.valid_keys("ENGLISH"))
+    with pytest.raises(ValueError):
+        multiplicative_cipher.encrypt("abc", bad, "ENGLISH")
+    with pytest.raises(ValueError):
+        multiplicative_cipher.encrypt("abc", "7", "ENGLISH")
+
+
+def test_brute_force_finds_the_key():
+    text = "the quick brown fox jumps over the lazy dog and then runs into the forest"
+    key = multiplicative_cipher.valid_keys("ENGLISH")[5]
+    cipher, lang = multiplicative_cipher.encrypt(text, key, "ENGLISH")
+    best = multiplicative_cipher.brute_force(cipher, lang, top=1)[0]
+    assert best.key == key and best.plaintext == text
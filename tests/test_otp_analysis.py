@@ -0,0 +1,62 @@
+import random
+
+import pytest
+
+from otp_analysis import UNKNOWN, ManyTimePad
+from otp_logic import OTPLogic
+
+# Eight messages sent under one key
+CORPUS = [
+    "meet me at the north gate when the bells ring at midnight",
+    "the shipment leaves the harbour on tuesday with the morning tide",
+    "bring the documents and the keys to the usual place tomorrow",
+    "our friend in the capital says the plan is going well so far",
+    "do not trust the courier who brought the last two letters",
+    "send more money for the guards and the boat before friday",
+    "the weather has delayed everything so wait for my next signal",
+    "burn this letter after reading and tell nobody about the meeting",
+]
+KEY = "".join(random.Random(7).choices(OTPLogic.ENGLISH_ALPHABET, k=80))
+
+
+@pytest.fixture
+def pad():
+    ciphers = [OTPLogic.encrypt(m, KEY, trace=False, lang="ENGLISH")[0] for m in CORPUS]
+    return ManyTimePad(ciphers)
+
+
+def test_crib_drag_finds_the_true_placements(pad):
+    assert pad.lang == "ENGLISH"
+    hits = pad.crib_drag(" the ", top=5)
+    assert len(hits) == 5
+    for hit in hits:
+        assert CORPUS[hit.message][hit.offset:hit.offset + 5] == " the "
+
+
+@pytest.mark.parametrize("i, j, crib, offset", [(1, 6, "harbour", 24), (6, 1, "weather", 4)])
+def test_drag_pair_reveals_the_other_message(pad, i, j, crib, offset):
+    best = pad.drag_pair(i, j, crib, top=3)[0]
+    assert best.offset == offset
+    assert best.fragment == CORPUS[j][offset:offset + len(crib)]
+
+
+def test_differences_do_not_depend_on_the_key(pad):
+    other_key = "".join(random.Random(8).choices(OTPLogic.ENGLISH_ALPHABET, k=80))
+    other = ManyTimePad([OTPLogic.encrypt(m, other_key, trace=False, lang="ENGLISH")[0]
+                         for m in CORPUS])
+    assert (pad.differences(0, 3) == other.differences(0, 3)).all()
+
+
+def test_recovery_from_frequencies_and_cribs(pad):
+    assert pad.key_text() == UNKNOWN * pad.length
+    assert pad.solve_key() == pad.length
+    for plain, message in zip(pad.plaintexts(), CORPUS):
+        assert sum(a == b for a, b in zip(plain, message)) > 0.7 * len(message)
+
+    # Confirmed cribs pin the key down exactly where they sit
+    for hit in pad.crib_drag(" the ", top=5):
+        pad.apply_crib(hit.message, hit.offset, " the ")
+        for k in range(hit.offset + 1, hit.offset + 4):
+            assert pad.key_text()[k] == KEY[k]
+            for plain, message in zip(pad.plaintexts(), CORPUS):
+                assert k >= len(message) or plain[k] == message[k]
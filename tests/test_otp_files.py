@@ -0,0 +1,231 @@
+"""
+Round trips of the file-based OTP modes: text streams with a pad ledger
+(otp_stream), binary XOR (otp_bytes, otp_parallel) and the seeded-pad
+stream cipher (otp_seeded). Every mode must work with dst == src, leave an
+existing dst untouched when it fails, and never hand out a pad range twice.
+"""
+import os
+import random
+
+import pytest
+
+import otp_bytes
+import otp_parallel
+import otp_seeded
+import otp_stream
+from otp_logic import OTPLogic
+
+ENGLISH = "The quick brown fox jumps over the lazy dog.\r\nPack my box with five dozen liquor jugs!\n"
+
+
+def _text_pad(tmp_path, length=20000):
+    # Mixed-alphabet pad: Arabic key characters are two UTF-8 bytes, so
+    # character and byte offsets drift apart
+    rng = random.Random(0)
+    path = tmp_path / "pad.txt"
+    path.write_text("".join(rng.choices(OTPLogic.MIXED_ALPHABET, k=length)),
+                    encoding="utf-8", newline="")
+    return str(path)
+
+
+def _byte_pad(tmp_path, size=1 << 16):
+    path = str(tmp_path / "pad.bin")
+    otp_bytes.generate_pad_file(path, size)
+    return path
+
+
+def _write(path, data):
+    if isinstance(data, str):
+        path.write_text(data, encoding="utf-8", newline="")
+    else:
+        path.write_bytes(data)
+    return str(path)
+
+
+def _read(path):
+    with open(path, "r", encoding="utf-8", newline="") as f:
+        return f.read()
+
+
+def _assert_disjoint(ranges):
+    # Each message starts where the previous one stopped
+    for (_, end), (start, _) in zip(ranges, ranges[1:]):
+        assert start == end
+
+
+# ----------------- Text stream -----------------
+@pytest.mark.parametrize("chunk_chars", [7, otp_stream.CHUNK_CHARS])
+def test_stream_round_trip_and_ledger(tmp_path, chunk_chars):
+    pad = _text_pad(tmp_path)
+    texts = [ENGLISH * k for k in (1, 5, 20)]
+    results = []
+    for i, text in enumerate(texts):
+        src = _write(tmp_path / f"plain{i}.txt", text)
+        results.append(otp_stream.stream_encrypt_file(src, str(tmp_path / f"enc{i}.txt"), pad,
+                                                      chunk_chars=chunk_chars))
+
+    _assert_disjoint([(r.start.chars, r.end.chars) for r in results])
+    _assert_disjoint([(r.start.bytes, r.end.bytes) for r in results])
+    pad_text = _read(pad)
+    for r, text in zip(results, texts):
+        assert r.chars == len(text) and r.lang == "ENGLISH"
+        assert r.end.bytes - r.start.bytes == len(pad_text[r.start.chars:r.end.chars].encode("utf-8"))
+
+    ledger = otp_stream.PadLedger(pad)
+    assert ledger.position == results[-1].end and ledger.messages == len(texts)
+
+    # Decryption reads the offset from the header, in any order
+    for i in reversed(range(len(texts))):
+        dst = str(tmp_path / f"dec{i}.txt")
+        otp_stream.stream_decrypt_file(str(tmp_path / f"enc{i}.txt"), dst, pad, chunk_chars=chunk_chars)
+        assert _read(dst) == texts[i]
+    assert otp_stream.PadLedger(pad).position == results[-1].end
+
+
+def test_stream_in_place_and_failures(tmp_path):
+    pad = _text_pad(tmp_path, length=500)
+    path = _write(tmp_path / "message.txt", ENGLISH)
+    first = otp_stream.stream_encrypt_file(path, path, pad)
+    assert _read(path).startswith(otp_stream.STREAM_MAGIC)
+    otp_stream.stream_decrypt_file(path, path, pad)
+    assert _read(path) == ENGLISH
+
+    # Pad exhausted: the existing destination and the ledger stay as they were
+    dst = _write(tmp_path / "dst.txt", "keep me")
+    with pytest.raises(ValueError, match="exhausted"):
+        otp_stream.stream_encrypt_file(_write(tmp_path / "big.txt", ENGLISH * 20), dst, pad)
+    assert _read(dst) == "keep me"
+    assert not os.path.exists(dst + ".tmp")
+    assert otp_stream.PadLedger(pad).position == first.end
+
+    with pytest.raises(ValueError, match="header"):
+        otp_stream.stream_decrypt_file(path, dst, pad)
+    assert _read(dst) == "keep me"
+
+
+# ----------------- Bytes -----------------
+def test_bytes_round_trip_and_ledger(tmp_path):
+    pad = _byte_pad(tmp_path)
+    blobs = [os.urandom(size) for size in (0, 1, 1000, 12345)]
+    results = []
+    for i, blob in enumerate(blobs):
+        src = _write(tmp_path / f"plain{i}.bin", blob)
+        results.append(otp_bytes.encrypt_file(src, str(tmp_path / f"enc{i}.bin"), pad, chunk_size=4096))
+
+    _assert_disjoint([(r.start, r.end) for r in results])
+    assert otp_bytes.PadLedger(pad).position.bytes == results[-1].end
+    for i, blob in reversed(list(enumerate(blobs))):
+        dst = str(tmp_path / f"dec{i}.bin")
+        otp_bytes.decrypt_file(str(tmp_path / f"enc{i}.bin"), dst, pad, chunk_size=4096)
+        assert open(dst, "rb").read() == blob
+
+
+def test_bytes_in_place_and_failures(tmp_path):
+    pad = _byte_pad(tmp_path, size=2000)
+    blob = os.urandom(1500)
+    path = _write(tmp_path / "data.bin", blob)
+
+    # Raw XOR in place, undone at the same position
+    first = otp_bytes.xor_file(path, pad)
+    assert open(path, "rb").read() != blob
+    otp_bytes.xor_file(path, pad, position=first.start)
+    assert open(path, "rb").read() == blob
+
+    # Header mode with dst == src
+    dst = _write(tmp_path / "copy.bin", blob)
+    with pytest.raises(ValueError, match="exhausted"):
+        otp_bytes.encrypt_file(dst, dst, pad)
+    assert open(dst, "rb").read() == blob
+    assert not os.path.exists(dst + ".tmp")
+    assert otp_bytes.PadLedger(pad).position.bytes == first.end
+
+    otp_bytes.encrypt_file(_write(tmp_path / "small.bin", blob[:400]), dst, pad)
+    otp_bytes.decrypt_file(dst, dst, pad)
+    assert open(dst, "rb").read() == blob[:400]
+
+    with pytest.raises(ValueError, match="header"):
+        otp_bytes.decrypt_file(path, dst, pad)
+    assert open(dst, "rb").read() == blob[:400]
+
+
+# ----------------- Parallel -----------------
+@pytest.fixture
+def small_ranges(monkeypatch):
+    monkeypatch.setattr(otp_parallel, "PARALLEL_THRESHOLD", 1)
+    monkeypatch.setattr(otp_parallel, "MIN_RANGE", 1000)
+
+
+def test_parallel_xor_matches_xor_file(tmp_path, small_ranges):
+    pad = _byte_pad(tmp_path)
+    blob = os.urandom(12345)
+    src = _write(tmp_path / "data.bin", blob)
+
+    result = otp_parallel.parallel_xor_file(src, pad, str(tmp_path / "par.bin"), workers=3)
+    otp_bytes.xor_file(src, pad, str(tmp_path / "seq.bin"), position=result.start)
+    assert open(tmp_path / "par.bin", "rb").read() == open(tmp_path / "seq.bin", "rb").read()
+
+    second = otp_parallel.parallel_xor_file(src, pad, str(tmp_path / "next.bin"), workers=3)
+    assert second.start == result.end
+    assert otp_bytes.PadLedger(pad).position.bytes == second.end
+
+    # In place and back
+    otp_parallel.parallel_xor_file(src, pad, src, position=result.start, workers=3)
+    assert open(src, "rb").read() == open(tmp_path / "par.bin", "rb").read()
+    otp_parallel.parallel_xor_file(src, pad, src, position=result.start, workers=3)
+    assert open(src, "rb").read() == blob
+
+
+def test_parallel_xor_failure_keeps_destination(tmp_path, small_ranges):
+    pad = _byte_pad(tmp_path, size=7000)
+    src = _write(tmp_path / "data.bin", os.urandom(6000))
+    otp_parallel.parallel_xor_file(src, pad, str(tmp_path / "first.bin"), workers=3)
+    dst = _write(tmp_path / "dst.bin", b"keep me")
+    with pytest.raises(ValueError, match="exhausted"):
+        otp_parallel.parallel_xor_file(src, pad, dst, workers=3)
+    assert open(dst, "rb").read() == b"keep me"
+
+    # Failing after the workers ran (a directory cannot be replaced by a file)
+    folder = tmp_path / "folder"
+    folder.mkdir()
+    with pytest.raises(OSError):
+        otp_parallel.parallel_xor_file(src, pad, str(folder), position=0, workers=3)
+    assert folder.is_dir()
+    assert not os.path.exists(str(folder) + ".tmp")
+    assert otp_bytes.PadLedger(pad).position.bytes == 6000
+
+
+# ----------------- Seeded -----------------
+# English only: the Arabic alphabet repeats alef, so Arabic text does not invert exactly
+@pytest.mark.parametrize("text", [ENGLISH * 3, "Order 66 at 10:45, gate B7 " * 3, ""],
+                         ids=["prose", "digits", "empty"])
+def test_seeded_round_trip(text):
+    blob = otp_seeded.seeded_encrypt(text, "correct horse", chunk_chars=5)
+    assert blob.startswith(otp_seeded.SEEDED_MAGIC)
+    assert otp_seeded.seeded_decrypt(blob, "correct horse") == text
+    if text:
+        # Fresh nonce per message, and the seed matters
+        assert otp_seeded.seeded_encrypt(text, "correct horse") != blob
+        assert otp_seeded.seeded_decrypt(blob, "wrong horse") != text
+
+
+def test_seeded_pad_is_independent_of_chunking():
+    alphabet = OTPLogic.MIXED_ALPHABET
+    whole = otp_seeded.SeededPad("seed", b"n" * otp_seeded.NONCE_SIZE, alphabet).key(5000)
+    pad = otp_seeded.SeededPad("seed", b"n" * otp_seeded.NONCE_SIZE, alphabet)
+    assert "".join(pad.key(size) for size in (1, 999, 0, 4000)) == whole
+    assert set(whole) <= set(alphabet)
+
+
+def test_seeded_files_in_place_and_failures(tmp_path):
+    path = _write(tmp_path / "message.txt", ENGLISH * 10)
+    chars, lang = otp_seeded.seeded_encrypt_file(path, path, "seed", chunk_chars=11)
+    assert (chars, lang) == (len(ENGLISH) * 10, "ENGLISH")
+    assert _read(path).startswith(otp_seeded.SEEDED_MAGIC)
+    otp_seeded.seeded_decrypt_file(path, path, "seed", chunk_chars=13)
+    assert _read(path) == ENGLISH * 10
+
+    dst = _write(tmp_path / "dst.txt", "keep me")
+    with pytest.raises(ValueError, match="OTP-SEEDED-PAD"):
+        otp_seeded.seeded_decrypt_file(path, dst, "seed")
+    assert _read(dst) == "keep me"
+    assert not os.path.exists(dst + ".tmp")
@@ -0,0 +1,222 @@
+"""
+Differential fuzzing of the OTP engine against the OTPLogic class the
+repository shipped first. The baseline below is copied verbatim from the
+first commit's OneTimePad.py (only renamed), so any behaviour change in the
+table-driven, vectorized or multi-process paths shows up here.
+"""
+import random
+
+import pytest
+
+import otp_logic
+import otp_parallel
+from otp_logic import OTPLogic
+
+
+# ----------------- Baseline OneTimePad.py OTPLogic (verbatim) -----------------
+class BaselineOTPLogic:
+    # ----------------- الأبجدية -----------------
+    ENGLISH_ALPHABET = "abcdefghijklmnopqrstuvwxyzABCDEFGHIJKLMNOPQRSTUVWXYZ0123456789"
+    
+    # تم التعديل هنا: إضافة الأرقام الإنجليزية (0-9) للأبجدية العربية
+    # لضمان عمل المفاتيح التي تحتوي على أرقام إنجليزية مع النصوص العربية
+    ARABIC_ALPHABET = "ابتثجحخدذرزسشصضطظعغفقكلمنهويا٠١٢٣٤٥٦٧٨٩0123456789"
+    
+    MIXED_ALPHABET = ENGLISH_ALPHABET + ARABIC_ALPHABET
+
+    # ----------------- توحيد النصوص -----------------
+    @staticmethod
+    def _normalize_text(text, lang):
+        if lang == 'ARABIC':
+            text = text.replace('أ', 'ا')
+            text = text.replace('إ', 'ا')
+            text = text.replace('آ', 'ا')
+            text = text.replace('ى', 'ي')
+            text = text.replace('ة', 'ه')
+            text = text.replace('ؤ', 'و')
+            text = text.replace('ئ', 'ي')
+        return text
+
+    # ----------------- كشف اللغة -----------------
+    @staticmethod
+    def detect_language(text):
+        arabic_count = sum(1 for c in text if '\u0600' <= c <= '\u06FF')
+        english_count = sum(1 for c in text if c.isalpha() and 'a' <= c.lower() <= 'z')
+        
+        if arabic_count > english_count * 0.5:
+            return 'ARABIC'
+        elif english_count > arabic_count * 0.5:
+            return 'ENGLISH'
+        else:
+            return 'MIXED'
+
+    # ----------------- اختيار الأبجدية -----------------
+    @staticmethod
+    def _get_alphabet(text):
+        lang = BaselineOTPLogic.detect_language(text)
+        if lang == 'ARABIC':
+            return BaselineOTPLogic.ARABIC_ALPHABET, lang
+        elif lang == 'ENGLISH':
+            return BaselineOTPLogic.ENGLISH_ALPHABET, lang
+        else:
+            return BaselineOTPLogic.MIXED_ALPHABET, lang
+
+    # ----------------- توليد مفتاح عشوائي -----------------
+    @staticmethod
+    def generate_key(length, text):
+        alphabet, lang = BaselineOTPLogic._get_alphabet(text)
+        return "".join(random.choice(alphabet) for _ in range(length))
+
+    # ----------------- التشفير -----------------
+    @staticmethod
+    def encrypt(text, key):
+        if len(key) < len(text):
+            return None, "Error: Key length must be >= Text length", None
+        
+        alphabet, lang = BaselineOTPLogic._get_alphabet(text)
+        n = len(alphabet)
+        cipher_text = ""
+        steps = []
+
+        normalized_text = BaselineOTPLogic._normalize_text(text, lang)
+        normalized_key = BaselineOTPLogic._normalize_text(key, lang)
+
+        for t_norm, k_norm, t_orig, k_orig in zip(normalized_text, normalized_key, text, key):
+            if t_norm in alphabet and k_norm in alphabet:
+                t_idx = alphabet.index(t_norm)
+                k_idx = alphabet.index(k_norm)
+                c_idx = (t_idx + k_idx) % n
+                c_char = alphabet[c_idx]
+                cipher_text += c_char
+                steps.append((t_orig, k_orig, c_char, f"({t_idx}+{k_idx})%{n}={c_idx}"))
+            else:
+                cipher_text += t_orig
+                steps.append((t_orig, k_orig, t_orig, "Ignored"))
+
+        return cipher_text, steps, lang
+
+    # ----------------- فك التشفير -----------------
+    @staticmethod
+    def decrypt(cipher, key):
+        if len(key) < len(cipher):
+            return None, "Error: Key length must be >= Cipher length", None
+        
+        alphabet, lang = BaselineOTPLogic._get_alphabet(cipher)
+        n = len(alphabet)
+        plain_text = ""
+        steps = []
+
+        normalized_cipher = BaselineOTPLogic._normalize_text(cipher, lang)
+        normalized_key = BaselineOTPLogic._normalize_text(key, lang)
+
+        for c_norm, k_norm, c_orig, k_orig in zip(normalized_cipher, normalized_key, cipher, key):
+            if c_norm in alphabet and k_norm in alphabet:
+                c_idx = alphabet.index(c_norm)
+                k_idx = alphabet.index(k_norm)
+                p_idx = (c_idx - k_idx) % n
+                p_char = alphabet[p_idx]
+                plain_text += p_char
+                steps.append((c_orig, k_orig, p_char, f"({c_idx}-{k_idx})%{n}={p_idx}"))
+            else:
+                plain_text += c_orig
+                steps.append((c_orig, k_orig, c_orig, "Ignored"))
+
+        return plain_text, steps, lang
+
+
+# ----------------- Fuzzing -----------------
+SOURCES = [
+    OTPLogic.ENGLISH_ALPHABET + " .,!?\n",
+    OTPLogic.ARABIC_ALPHABET + "أإآىةؤئ ،.\n",
+    OTPLogic.MIXED_ALPHABET + "أإآىةؤئ .,!?\n\té€😀",
+]
+
+
+def _random_text(rng, length, source=None):
+    return "".join(rng.choices(source or rng.choice(SOURCES), k=length))
+
+
+def _random_case(rng, length):
+    text = _random_text(rng, length)
+    key = _random_text(rng, length + rng.choice([0, 0, 3]))
+    return text, key
+
+
+def test_encrypt_and_decrypt_match_baseline():
+    rng = random.Random(0)
+    for _ in range(400):
+        text, key = _random_case(rng, rng.randint(0, 300))
+        for ours, theirs in ((OTPLogic.encrypt, BaselineOTPLogic.encrypt),
+                             (OTPLogic.decrypt, BaselineOTPLogic.decrypt)):
+            result, steps, lang = ours(text, key)
+            expected, expected_steps, expected_lang = theirs(text, key)
+            assert (result, lang) == (expected, expected_lang)
+            assert list(steps) == expected_steps
+
+
+def test_short_key_is_rejected_like_baseline():
+    assert OTPLogic.encrypt("hello", "abc") == BaselineOTPLogic.encrypt("hello", "abc")
+    assert OTPLogic.decrypt("hello", "abc") == BaselineOTPLogic.decrypt("hello", "abc")
+
+
+@pytest.mark.skipif(otp_logic.np is None, reason="NumPy is not installed")
+@pytest.mark.parametrize("op", ["+", "-"])
+def test_vectorized_matches_scalar(op):
+    rng = random.Random(op)
+    for alphabet in OTPLogic.ALPHABETS.values():
+        for length in (0, 1, 17, 5000):
+            text, key = _random_case(rng, length)
+            scalar, scalar_steps = OTPLogic._transform_scalar(text, key, alphabet, op)
+            vector, vector_steps = OTPLogic._transform_vectorized(text, key, alphabet, op)
+            assert vector == scalar
+            assert list(vector_steps) == list(scalar_steps)
+
+
+@pytest.mark.skipif(otp_logic.np is None, reason="NumPy is not installed")
+@pytest.mark.parametrize("source", SOURCES, ids=["english", "arabic", "mixed"])
+def test_long_inputs_match_baseline(source):
+    # Long enough for the vectorized path and the sampled language detection
+    rng = random.Random(source)
+    text = _random_text(rng, otp_logic.VECTOR_THRESHOLD + 1000, source)
+    key = _random_text(rng, len(text), source)
+    cipher, steps, lang = OTPLogic.encrypt(text, key)
+    expected, expected_steps, expected_lang = BaselineOTPLogic.encrypt(text, key)
+    assert (cipher, lang) == (expected, expected_lang)
+    assert steps[::997] == expected_steps[::997]
+    assert OTPLogic.decrypt(cipher, key, trace=False)[0] == BaselineOTPLogic.decrypt(cipher, key)[0]
+
+
+def test_parallel_matches_single_process(monkeypatch):
+    monkeypatch.setattr(otp_parallel, "PARALLEL_THRESHOLD", 1)
+    monkeypatch.setattr(otp_parallel, "MIN_RANGE", 1000)
+    rng = random.Random(1)
+    for source in SOURCES:
+        text = _random_text(rng, 4321, source)
+        key = _random_text(rng, len(text), source)
+        cipher = otp_parallel.parallel_encrypt(text, key, workers=3)
+        assert cipher == OTPLogic.encrypt(text, key, trace=False)
+        assert otp_parallel.parallel_decrypt(cipher[0], key, workers=3) == \
+            OTPLogic.decrypt(cipher[0], key, trace=False)
+    assert otp_parallel.parallel_encrypt("hello", "abc", workers=3) == \
+        BaselineOTPLogic.encrypt("hello", "abc")
+
+
+def test_round_trip_english():
+    # The Arabic and mixed alphabets repeat characters (alef, the digits), as
+    # the baseline did, so only English inverts exactly
+    rng = random.Random(2)
+    for _ in range(100):
+        text = _random_text(rng, rng.randint(1, 300), SOURCES[0])
+        key = OTPLogic.generate_key(len(text), text, lang="ENGLISH")
+        cipher, _, _ = OTPLogic.encrypt(text, key, lang="ENGLISH")
+        assert OTPLogic.decrypt(cipher, key, lang="ENGLISH")[0] == text
+
+
+@pytest.mark.parametrize("lang", ["ENGLISH", "ARABIC", "MIXED"])
+def test_random_keys_are_uniform_over_the_alphabet(lang):
+    alphabet = OTPLogic.ALPHABETS[lang]
+    indices = OTPLogic.random_indices(200 * len(alphabet), alphabet)
+    counts = [indices.count(i) for i in range(len(alphabet))]
+    assert max(indices) < len(alphabet)
+    assert min(counts) > 100 and max(counts) < 300
+    assert set(OTPLogic.random_key(1000, alphabet)) <= set(alphabet)
@@ -0,0 +1,83 @@
+import os
+import subprocess
+import sys
+import time
+
+import otp_pads
+from otp_logic import OTPLogic
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ALPHABET = OTPLogic.ENGLISH_ALPHABET
+
+# Takes keys from a shared pool in a separate interpreter, one per line
+TAKER = """
+import sys
+import otp_pads
+from otp_logic import OTPLogic
+
+pool = otp_pads.PadPool(OTPLogic.ENGLISH_ALPHABET, sys.argv[1], capacity=int(sys.argv[2]))
+keys = [pool.take(16) for _ in range(int(sys.argv[3]))]
+pool.close()
+print("\\n".join(keys))
+"""
+
+
+def _filled_pool(path, capacity):
+    pool = otp_pads.PadPool(ALPHABET, path, capacity=capacity, refill_chunk=4096).start()
+    deadline = time.monotonic() + 30
+    while pool.available() < capacity and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert pool.available() == capacity
+    return pool
+
+
+def test_keys_come_from_disjoint_ranges(tmp_path):
+    path = str(tmp_path / "pool.bin")
+    pool = _filled_pool(path, 1 << 14)
+    pool.close()
+
+    # A range handed out twice would show up as a repeated key
+    pool = otp_pads.PadPool(ALPHABET, path, capacity=1 << 14)
+    keys = [pool.take(64) for _ in range(200)]
+    assert len(set(keys)) == len(keys)
+    assert all(len(key) == 64 and set(key) <= set(ALPHABET) for key in keys)
+    assert pool.consumed == 200 * 64
+
+    # Handed-out bytes are wiped, and the header survives a reopen
+    assert not any(pool._mm[otp_pads.HEADER.size:otp_pads.HEADER.size + pool.consumed])
+    pool.close()
+    pool = otp_pads.PadPool(ALPHABET, path, capacity=1 << 14)
+    assert (pool.consumed, pool.filled) == (200 * 64, 1 << 14)
+    assert pool.take(64) not in keys
+    pool.close()
+
+
+def test_take_beyond_the_pool_and_generate_key(tmp_path):
+    pool = otp_pads.PadPool(ALPHABET, str(tmp_path / "pool.bin"), capacity=1000)
+    key = pool.take(5000)  # nothing filled yet: generated on the spot
+    assert len(key) == 5000 and set(key) <= set(ALPHABET)
+    assert OTPLogic.generate_key(10, "hello", pool=pool) != OTPLogic.generate_key(10, "hello", pool=pool)
+    pool.close()
+
+
+def test_processes_never_share_a_range(tmp_path):
+    path = str(tmp_path / "pool.bin")
+    capacity = 1 << 17
+    _filled_pool(path, capacity).close()
+
+    count = 2000
+    env = dict(os.environ, PYTHONPATH=ROOT)
+    takers = [subprocess.Popen([sys.executable, "-c", TAKER, path, str(capacity), str(count)],
+                               stdout=subprocess.PIPE, env=env, text=True)
+              for _ in range(4)]
+    keys = []
+    for taker in takers:
+        out, _ = taker.communicate(timeout=120)
+        assert taker.returncode == 0
+        keys += out.split()
+
+    assert len(keys) == 4 * count
+    assert len(set(keys)) == len(keys)
+    pool = otp_pads.PadPool(ALPHABET, path, capacity=capacity)
+    assert pool.consumed == 4 * count * 16
+    pool.close()
@@ -0,0 +1,249 @@
+"""
+Differential fuzzing of both Rail Fence APIs against the implementations
+the repository shipped before they shared one engine. The baseline
+functions below are copied verbatim from the first commit (only renamed),
+so any behaviour change in the engine shows up here.
+"""
+import random
+import string
+
+import pytest
+
+import rail_fence_cipher
+import rail_fence_stream
+import railfence
+
+
+# ----------------- Baseline rail_fence_cipher.py (verbatim) -----------------
+def _baseline_validate_key(key):
+    if not isinstance(key, int):
+        raise ValueError("Key must be an integer.")
+    if key <= 1:
+        raise ValueError("Key must be greater than 1.")
+
+
+def baseline_rail_fence_encrypt(plaintext, key):
+    """
+    Encrypts plaintext using the Rail Fence (zigzag) cipher.
+
+    The text is written diagonally on `key` rails, top to bottom then bottom to
+    top repeatedly. Reading the rails row by row produces the ciphertext.
+    Spaces and punctuation are preserved exactly as given.
+    """
+    _baseline_validate_key(key)
+    if not plaintext:
+        return ""
+
+    # Initialize rails as list of strings (one per rail).
+    rails = [""] * key
+
+    # Direction toggles when we hit the top or bottom rail.
+    row = 0
+    direction = 1  # 1 = moving downwards, -1 = moving upwards
+
+    for ch in plaintext:
+        rails[row] += ch
+        # Flip direction at the boundaries (top or bottom rail).
+        if row == 0:
+            direction = 1
+        elif row == key - 1:
+            direction = -1
+        row += direction
+
+    # Concatenate rows to form the ciphertext.
+    return "".join(rails)
+
+
+def baseline_rail_fence_decrypt(ciphertext, key):
+    """
+    Decrypts ciphertext produced by the Rail Fence cipher.
+
+    The algorithm reconstructs the zigzag pattern positions, marks where
+    characters would go, fills them in rail by rail, then reads them off in
+    zigzag order.
+    """
+    _baseline_validate_key(key)
+    if not ciphertext:
+        return ""
+
+    length = len(ciphertext)
+
+    # Step 1: Mark positions visited during zigzag traversal.
+    # We build a matrix of placeholders to identify the zigzag path.
+    pattern = [["" for _ in range(length)] for _ in range(key)]
+    row = 0
+    direction = 1
+    for col in range(length):
+        pattern[row][col] = "*"  # placeholder mark
+        if row == 0:
+            direction = 1
+        elif row == key - 1:
+            direction = -1
+        row += direction
+
+    # Step 2: Fill the placeholders row by row with ciphertext characters.
+    idx = 0
+    for r in range(key):
+        for c in range(length):
+            if pattern[r][c] == "*":
+                pattern[r][c] = ciphertext[idx]
+                idx += 1
+
+    # Step 3: Read characters following the zigzag to rebuild plaintext.
+    result = []
+    row = 0
+    direction = 1
+    for col in range(length):
+        result.append(pattern[row][col])
+        if row == 0:
+            direction = 1
+        elif row == key - 1:
+            direction = -1
+        row += direction
+
+    return "".join(result)
+
+
+# ----------------- Baseline railfence.py (verbatim) -----------------
+def baseline_encrypt_railfence(text, key):
+    rail = [""] * key
+    row = 0
+    direction = 1  
+
+    for char in text:
+        rail[row] += char
+        row += direction
+
+        if row == key - 1:
+            direction = -1
+        elif row == 0:
+            direction = 1
+
+    steps = "\n".join([f"Rail {i+1}: {rail[i]}" for i in range(key)])
+    return "".join(rail), steps
+
+
+def baseline_decrypt_railfence(cipher, key):
+    rail_len = [0] * key
+    row = 0
+    direction = 1
+
+    for _ in cipher:
+        rail_len[row] += 1
+        row += direction
+
+        if row == key - 1:
+            direction = -1
+        elif row == 0:
+            direction = 1
+
+    rails = []
+    index = 0
+    for l in rail_len:
+        rails.append(cipher[index:index + l])
+        index += l
+
+    result = ""
+    pointers = [0] * key
+    row = 0
+    direction = 1
+
+    for _ in cipher:
+        result += rails[row][pointers[row]]
+        pointers[row] += 1
+        row += direction
+
+        if row == key - 1:
+            direction = -1
+        elif row == 0:
+            direction = 1
+
+    return result, "Decryption visualization coming soon"
+
+
+# ----------------- Fuzzing -----------------
+POOL = string.ascii_letters + string.digits + string.punctuation + " \n\t" + "ابتثجحخ٠١٢" + "\U0001F600\u00e9"
+SIZES = [0, 1, 2, 3, 7, 64, 1000, rail_fence_cipher.VECTOR_THRESHOLD - 1,
+         rail_fence_cipher.VECTOR_THRESHOLD, 5000]
+
+
+def _cases(count, seed):
+    rng = random.Random(seed)
+    for case in range(count):
+        length = rng.choice(SIZES) if case % 2 else rng.randint(0, 300)
+        key = rng.choice([2, 3, 4, rng.randint(2, 40), rng.randint(2, length + 3)])
+        yield "".join(rng.choices(POOL, k=length)), key
+
+
+@pytest.fixture(params=["numpy", "pure"])
+def engine(request, monkeypatch):
+    if request.param == "pure":
+        monkeypatch.setattr(rail_fence_cipher, "np", None)
+    elif rail_fence_cipher.np is None:
+        pytest.skip("NumPy is not installed")
+    return request.param
+
+
+def test_railfence_matches_baseline(engine):
+    for text, key in _cases(600, seed=1):
+        expected, expected_steps = baseline_encrypt_railfence(text, key)
+        assert railfence.encrypt_railfence(text, key) == (expected, expected_steps), (key, text)
+        assert railfence.decrypt_railfence(expected, key) == baseline_decrypt_railfence(expected, key), (key, text)
+
+
+def test_rail_fence_cipher_matches_baseline(engine):
+    for text, key in _cases(600, seed=2):
+        expected = baseline_rail_fence_encrypt(text, key)
+        assert rail_fence_cipher.rail_fence_encrypt(text, key) == expected, (key, text)
+        if len(text) <= 1000:  # the baseline decrypt builds a key x length matrix
+            assert rail_fence_cipher.rail_fence_decrypt(expected, key) == \
+                baseline_rail_fence_decrypt(expected, key), (key, text)
+
+
+def test_bytes_match_text(engine):
+    for text, key in _cases(200, seed=3):
+        data = text.encode('latin-1', 'replace')
+        cipher = rail_fence_cipher.rail_fence_encrypt_bytes(data, key)
+        assert cipher == baseline_rail_fence_encrypt(data.decode('latin-1'), key).encode('latin-1')
+        assert rail_fence_cipher.rail_fence_decrypt_bytes(cipher, key) == data
+
+
+@pytest.mark.parametrize("key", [0, 1, -3, 2.0, "3"])
+def test_invalid_keys_match_baseline(key):
+    with pytest.raises(ValueError):
+        baseline_rail_fence_encrypt("abc", key)
+    with pytest.raises(ValueError):
+        rail_fence_cipher.rail_fence_encrypt("abc", key)
+    with pytest.raises(ValueError):
+        rail_fence_cipher.rail_fence_decrypt("abc", key)
+
+
+def test_permutation_cache_is_bounded(monkeypatch):
+    monkeypatch.setattr(rail_fence_cipher, "np", None)
+    rail_fence_cipher.clear_permutation_cache()
+    short = "x" * 100
+    long = "y" * (rail_fence_cipher.PERMUTATION_CACHE_MAX_LENGTH + 1)
+    assert rail_fence_cipher.rail_fence_encrypt(short, 3) == baseline_rail_fence_encrypt(short, 3)
+    assert rail_fence_cipher.rail_fence_encrypt(long, 3) == long
+    assert rail_fence_cipher._cached_permutation.cache_info().currsize == 1
+    order, inverse = rail_fence_cipher.rail_fence_permutation(10, 3)
+    assert list(order) == [0, 4, 8, 1, 3, 5, 7, 9, 2, 6]
+    assert [order[i] for i in inverse] == list(range(10))
+    assert order.itemsize == 4
+
+
+def test_block_files_in_place_and_failures(tmp_path):
+    path = tmp_path / "text.txt"
+    text = "The rail fence runs block by block, مرحبا بكم\n" * 200
+    path.write_text(text, encoding="utf-8")
+    assert rail_fence_stream.block_encrypt_file(str(path), str(path), 5, block_size=1000) == len(text)
+    assert path.read_text(encoding="utf-8") != text
+    assert rail_fence_stream.block_decrypt_file(str(path), str(path), 5) == len(text)
+    assert path.read_text(encoding="utf-8") == text
+
+    dst = tmp_path / "dst.txt"
+    dst.write_text("keep me", encoding="utf-8")
+    with pytest.raises(ValueError):
+        rail_fence_stream.block_decrypt_file(str(path), str(dst), 5)
+    assert dst.read_text(encoding="utf-8") == "keep me"
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["dst.txt", "text.txt"]
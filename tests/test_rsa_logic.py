@@ -0,0 +1,150 @@
+import random
+
+import pytest
+
+import rsa_logic
+
+
+@pytest.fixture(scope="module")
+def key():
+    p, q = rsa_logic.generate_prime(512), rsa_logic.generate_prime(512)
+    return rsa_logic.complete_multi_prime_keys((p, q), e_input=65537)
+
+
+@pytest.mark.parametrize("primes", [(2, 3), (2, 61), (61, 53), (2, 11, 13), (3, 5, 7, 11)])
+def test_crt_pow_matches_pow_for_every_residue(primes):
+    key = rsa_logic.complete_multi_prime_keys(primes)
+    for c in range(key.n):
+        assert rsa_logic.crt_pow(c, key.d, key.primes) == pow(c, key.d, key.n), c
+
+
+def test_crt_pow_matches_pow_on_large_multi_prime_keys():
+    rng = random.Random(0)
+    primes = tuple(rsa_logic.generate_prime(256) for _ in range(3))
+    key = rsa_logic.complete_multi_prime_keys(primes, e_input=65537)
+    for _ in range(50):
+        c = rng.randrange(key.n)
+        assert rsa_logic.crt_pow(c, key.d, key.primes) == pow(c, key.d, key.n)
+
+
+def test_decrypt_with_primes_matches_plain_decrypt():
+    e, n, d = rsa_logic.complete_keys(2, 1009)
+    cipher, _ = rsa_logic.rsa_encrypt_with_steps("Even codes: bdfh 2468", e, n)
+    plain, _ = rsa_logic.rsa_decrypt_with_steps(cipher, d, n)
+    assert rsa_logic.rsa_decrypt_with_steps(cipher, d, n, (2, 1009))[0] == plain == "Even codes: bdfh 2468"
+
+
+def _signed(key, count):
+    messages = [f"message {i}" for i in range(count)]
+    return messages, [rsa_logic.rsa_sign(m, key.d, key.n, key.primes) for m in messages]
+
+
+def test_batch_verify_matches_single_verify(key):
+    messages, signatures = _signed(key, 8)
+    signatures[3] = (signatures[3] + 1) % key.n
+    signatures[5] = key.n
+    expected = [rsa_logic.rsa_verify(m, s, key.e, key.n) for m, s in zip(messages, signatures)]
+    assert rsa_logic.rsa_batch_verify(messages, signatures, key.e, key.n) == expected
+    assert expected == [True, True, True, False, True, False, True, True]
+
+
+@pytest.mark.parametrize("tamper", ["negate", "trade"])
+def test_cancelling_errors_are_rejected(key, tamper):
+    messages, signatures = _signed(key, 4)
+    s1, s2 = signatures[1], signatures[2]
+    if tamper == "negate":
+        signatures[1], signatures[2] = key.n - s1, key.n - s2
+    else:
+        signatures[1], signatures[2] = (s1 * 2) % key.n, (s2 * pow(2, -1, key.n)) % key.n
+    # The product screen cannot see these; per-signature verification must
+    assert rsa_logic.rsa_batch_screen(messages, signatures, key.e, key.n)
+    assert rsa_logic.rsa_batch_verify(messages, signatures, key.e, key.n) == [True, False, False, True]
+
+
+def test_repeated_entries(key):
+    messages, signatures = _signed(key, 2)
+    messages, signatures = messages * 3, signatures * 3
+    assert rsa_logic.rsa_batch_verify(messages, signatures, key.e, key.n) == [True] * 6
+
+
+def test_hybrid_bytes_round_trip(key):
+    data = bytes(range(256)) * 50
+    blob = rsa_logic.hybrid_encrypt_bytes(data, key.e, key.n)
+    assert rsa_logic.hybrid_decrypt_bytes(blob, key.d, key.n) == data
+    assert rsa_logic.hybrid_decrypt_bytes(blob, key.d, key.n, key.primes) == data
+    # OAEP is randomized: the same input never wraps to the same header
+    assert rsa_logic.hybrid_encrypt_bytes(data, key.e, key.n)[:200] != blob[:200]
+
+
+@pytest.mark.parametrize("where", ["body", "tag"])
+def test_hybrid_bytes_detects_tampering(key, where):
+    blob = bytearray(rsa_logic.hybrid_encrypt_bytes(b"attack at dawn" * 10, key.e, key.n))
+    blob[-rsa_logic.TAG_SIZE - 3 if where == "body" else -1] ^= 1
+    with pytest.raises(ValueError, match="Authentication failed"):
+        rsa_logic.hybrid_decrypt_bytes(bytes(blob), key.d, key.n)
+
+
+def test_unwrap_rejects_bad_padding(key):
+    session_key = bytes(range(rsa_logic.SESSION_KEY_SIZE))
+    wrapped = rsa_logic.wrap_session_key(session_key, key.e, key.n)
+    assert rsa_logic.unwrap_session_key(wrapped, key.d, key.n, key.primes) == session_key
+    # Textbook RSA of the bare key is not a valid OAEP block
+    bare = pow(int.from_bytes(session_key, 'big'), key.e, key.n)
+    with pytest.raises(ValueError):
+        rsa_logic.unwrap_session_key(bare, key.d, key.n)
+
+
+def test_hybrid_needs_an_oaep_sized_modulus():
+    e, n, _ = rsa_logic.complete_keys(1000003, 1000033)
+    with pytest.raises(ValueError, match="too small"):
+        rsa_logic.hybrid_encrypt_bytes(b"data", e, n)
+
+
+@pytest.mark.parametrize("bits", [rsa_logic.HYBRID_MIN_BITS, 1024])
+def test_generated_keys_work_in_hybrid_mode(bits):
+    key = rsa_logic.generate_keys(bits)
+    assert key.n.bit_length() == bits
+    assert key.e * key.d % key.phi == 1
+    data = b"generated key" * 50
+    blob = rsa_logic.hybrid_encrypt_bytes(data, key.e, key.n)
+    assert rsa_logic.hybrid_decrypt_bytes(blob, key.d, key.n, key.primes) == data
+
+
+def test_hybrid_rejects_one_bit_below_the_minimum():
+    key = rsa_logic.generate_keys(rsa_logic.HYBRID_MIN_BITS - 1)
+    with pytest.raises(ValueError, match="too small"):
+        rsa_logic.hybrid_encrypt_bytes(b"data", key.e, key.n)
+
+
+def test_hybrid_file_keeps_destination_on_tampering(key, tmp_path):
+    src, enc, dst = tmp_path / "src.bin", tmp_path / "enc.hyb", tmp_path / "dst.bin"
+    data = bytes(range(256)) * 400
+    src.write_bytes(data)
+    rsa_logic.hybrid_encrypt_file(str(src), str(enc), key.e, key.n, chunk_size=4096)
+    assert rsa_logic.hybrid_decrypt_file(str(enc), str(dst), key.d, key.n, key.primes, chunk_size=4096) == len(data)
+    assert dst.read_bytes() == data
+
+    dst.write_bytes(b"keep me")
+    tampered = bytearray(enc.read_bytes())
+    tampered[-rsa_logic.TAG_SIZE - 1] ^= 1
+    enc.write_bytes(bytes(tampered))
+    with pytest.raises(ValueError, match="Authentication failed"):
+        rsa_logic.hybrid_decrypt_file(str(enc), str(dst), key.d, key.n)
+    assert dst.read_bytes() == b"keep me"
+    assert sorted(p.name for p in tmp_path.iterdir()) == ["dst.bin", "enc.hyb", "src.bin"]
+
+
+def test_incremental_encryptor_replays_random_edits():
+    e, n, _ = rsa_logic.complete_keys(1009, 1013)
+    encryptor = rsa_logic.IncrementalEncryptor(e, n)
+    rng = random.Random(0)
+    text = view = ""
+    for _ in range(2000):
+        start = rng.randint(0, len(text))
+        end = min(len(text), start + rng.choice([0, 0, 1, 3, 20]))
+        text = text[:start] + "".join(rng.choices("abc xyzمرح", k=rng.choice([0, 1, 1, 2, 10]))) + text[end:]
+        pos, removed, inserted = encryptor.update(text)
+        view = view[:pos] + inserted + view[pos + removed:]
+        expected = rsa_logic.rsa_encrypt_with_steps(text, e, n)[0] if text else ""
+        assert view == encryptor.cipher() == expected
+